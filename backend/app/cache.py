@@ -0,0 +1,236 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from fastapi import Request, Response
+
+# Caché de las respuestas de lectura (`GET /registros/` y `GET /registros/{id}/historial`), ya
+# serializadas a JSON. La clave es el recurso más sus parámetros normalizados, la versión de la
+# tabla y el período de CACHE_TTL segundos en curso: cada escritura (`crear_registro` o una carga
+# masiva con cambios) incrementa la versión, así que las entradas anteriores dejan de usarse y se
+# desalojan solas (LRU o TTL). La clave también forma el ETag, de modo que un `If-None-Match`
+# vigente se responde con 304 sin consultar la base de datos ni serializar nada.
+#
+# Como el período forma parte de la clave, ninguna respuesta ni ETag se reutiliza por más de
+# CACHE_TTL segundos, aunque la versión no cambie: así se ven, a lo sumo tras ese tiempo, las
+# escrituras hechas fuera de la API (p. ej. `init_db.py` o SQL directo) y las atendidas por otro worker.
+#
+# Backends (CACHE_LECTURAS): "memoria" (LRU + TTL en el proceso, por defecto), "redis" (compartido
+# entre los workers de uvicorn, requiere el paquete `redis`) o "no" (sin caché ni ETag). Con varios
+# workers y el backend "memoria" cada proceso lleva su propia versión: una escritura atendida por
+# un worker no invalida la caché de los demás hasta que termina el período del TTL; en ese caso conviene "redis".
+CACHE_LECTURAS = os.getenv("CACHE_LECTURAS", "memoria").lower()
+CACHE_TTL = float(os.getenv("CACHE_TTL", "60"))                       # Segundos que una respuesta se reutiliza como máximo
+CACHE_MAX_ENTRADAS = int(os.getenv("CACHE_MAX_ENTRADAS", "512"))      # Respuestas guardadas en memoria (se desalojan las menos usadas)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+PREFIJO_REDIS = "registros_ml:"
+
+
+class CacheMemoria:
+    """Caché LRU con vencimiento (TTL) en la memoria del proceso, segura para los hilos del threadpool de FastAPI."""
+
+    def __init__(self, ttl=CACHE_TTL, max_entradas=CACHE_MAX_ENTRADAS):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()  # {clave: (vence, cuerpo)}
+        self._bloqueo = threading.Lock()
+        # La versión incluye un identificador del proceso para que dos workers nunca generen el mismo ETag
+        self._proceso = uuid.uuid4().hex[:8]
+        self._version = 0
+
+    def version(self) -> str:
+        """Devuelve la versión actual de la tabla de registros."""
+        return f"{self._proceso}.{self._version}"
+
+    def invalidar(self):
+        """Incrementa la versión de la tabla: las respuestas guardadas dejan de usarse."""
+        with self._bloqueo:
+            self._version += 1
+
+    def obtener(self, clave: str):
+        """Devuelve el cuerpo guardado para la clave, o None si no está o ya venció."""
+        with self._bloqueo:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            if entrada[0] < time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada[1]
+
+    def guardar(self, clave: str, cuerpo: bytes):
+        """Guarda un cuerpo serializado y desaloja la entrada usada hace más tiempo si se supera el máximo."""
+        with self._bloqueo:
+            self._entradas[clave] = (time.monotonic() + self.ttl, cuerpo)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+
+class CacheRedis:
+    """Caché en un servidor Redis (o compatible), compartida por todos los workers de la API.
+
+    La versión es un contador de Redis (INCR) que arranca en un valor aleatorio: si Redis se vacía
+    o se reinicia, el contador se vuelve a sembrar con otro valor y no repite versiones anteriores
+    (cuyos ETags podrían seguir en manos de los clientes). Si el servidor no responde, la lectura se
+    trata como un fallo de caché y la API consulta la base de datos, en lugar de fallar la petición.
+    """
+
+    def __init__(self, url=REDIS_URL, ttl=CACHE_TTL):
+        import redis
+
+        self.ttl = ttl
+        self._errores = (redis.RedisError,)
+        self._cliente = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def _sembrar_version(self):
+        """Crea el contador de versión con un valor aleatorio de 48 bits si no existe (SET NX)."""
+        self._cliente.set(PREFIJO_REDIS + "version", uuid.uuid4().int >> 80, nx=True)
+
+    def version(self):
+        """Devuelve la versión actual de la tabla de registros, o None si Redis no está disponible."""
+        try:
+            version = self._cliente.get(PREFIJO_REDIS + "version")
+            if version is None:
+                self._sembrar_version()
+                version = self._cliente.get(PREFIJO_REDIS + "version")
+            return version.decode()
+        except self._errores:
+            return None
+
+    def invalidar(self):
+        """Incrementa la versión de la tabla: las respuestas guardadas dejan de usarse."""
+        try:
+            self._sembrar_version()  # INCR sobre una clave inexistente empezaría en 1
+            self._cliente.incr(PREFIJO_REDIS + "version")
+        except self._errores:
+            pass
+
+    def obtener(self, clave: str):
+        """Devuelve el cuerpo guardado para la clave, o None si no está, ya venció o Redis no está disponible."""
+        try:
+            return self._cliente.get(PREFIJO_REDIS + clave)
+        except self._errores:
+            return None
+
+    def guardar(self, clave: str, cuerpo: bytes):
+        """Guarda un cuerpo serializado, que Redis elimina al vencer el TTL."""
+        try:
+            self._cliente.set(PREFIJO_REDIS + clave, cuerpo, ex=max(1, int(self.ttl)))
+        except self._errores:
+            pass
+
+
+def crear_cache(tipo: str = CACHE_LECTURAS):
+    """Crea la caché de lecturas configurada.
+
+    Args:
+        tipo (str): "memoria", "redis" o "no".
+
+    Returns:
+        CacheMemoria or CacheRedis or None: Caché a usar, o None si está desactivada.
+
+    Raises:
+        ValueError: Si el tipo de caché no existe.
+    """
+    if tipo == "memoria":
+        return CacheMemoria()
+    if tipo == "redis":
+        return CacheRedis()
+    if tipo in ("no", "ninguna", "0"):
+        return None
+    raise ValueError(f"Tipo de caché de lecturas no válido: {tipo}")
+
+
+# Caché de lecturas del proceso (None si está desactivada)
+cache_lecturas = crear_cache()
+
+
+def invalidar_lecturas():
+    """Incrementa la versión de la tabla de registros tras una escritura (ver `routers.registros_ml`)."""
+    if cache_lecturas is not None:
+        cache_lecturas.invalidar()
+
+
+def clave_lectura(recurso: str, parametros: dict):
+    """Arma la clave de caché de una lectura: recurso, versión de la tabla, período del TTL y parámetros normalizados.
+
+    Los parámetros se ordenan por nombre y se omiten los vacíos, de modo que `?limit=10&skip=0` y
+    `?skip=0&limit=10` comparten la entrada. El período (`time.time() // ttl`) cambia cada CACHE_TTL
+    segundos, con lo que la entrada y su ETag vencen aunque no haya escrituras en esta API.
+
+    Args:
+        recurso (str): Nombre de la lectura, p. ej. "registros" o "historial".
+        parametros (dict): Parámetros de la consulta, ya validados.
+
+    Returns:
+        str or None: Clave de caché, o None si la caché está desactivada o no disponible.
+    """
+    if cache_lecturas is None:
+        return None
+    version = cache_lecturas.version()
+    if version is None:
+        return None
+    periodo = int(time.time() // cache_lecturas.ttl) if cache_lecturas.ttl > 0 else time.time_ns()
+    normalizados = "&".join(f"{nombre}={valor}" for nombre, valor in sorted(parametros.items()) if valor is not None)
+    return f"{recurso}@{version}.{periodo}?{normalizados}"
+
+
+def etag(clave: str) -> str:
+    """Devuelve el ETag de una lectura: un hash de su clave (que incluye la versión de la tabla y el período del TTL)."""
+    return '"' + hashlib.blake2b(clave.encode(), digest_size=12).hexdigest() + '"'
+
+
+def no_modificado(request: Request, etiqueta: str) -> bool:
+    """Indica si el encabezado If-None-Match de la petición incluye el ETag vigente (o es "*")."""
+    encabezado = request.headers.get("if-none-match")
+    if not encabezado:
+        return False
+    candidatos = {valor.strip().removeprefix("W/") for valor in encabezado.split(",")}
+    return "*" in candidatos or etiqueta in candidatos
+
+
+def _encabezados(clave: str) -> dict:
+    """Encabezados de una lectura cacheable: su ETag y `no-cache`, para que el cliente revalide con If-None-Match."""
+    return {"ETag": etag(clave), "Cache-Control": "no-cache"}
+
+
+def respuesta_cacheada(request: Request, clave):
+    """Busca la respuesta de una lectura antes de consultar la base de datos.
+
+    Args:
+        request (Request): Petición HTTP.
+        clave (str or None): Clave de la lectura (ver `clave_lectura`).
+
+    Returns:
+        Response or None: 304 si el cliente ya tiene la versión vigente (If-None-Match), el cuerpo
+            guardado si está en la caché, o None si hay que consultar la base de datos.
+    """
+    if clave is None:
+        return None
+    encabezados = _encabezados(clave)
+    if no_modificado(request, encabezados["ETag"]):
+        return Response(status_code=304, headers=encabezados)
+    cuerpo = cache_lecturas.obtener(clave)
+    if cuerpo is None:
+        return None
+    return Response(cuerpo, media_type="application/json", headers=encabezados)
+
+
+def respuesta_nueva(clave, cuerpo: bytes) -> Response:
+    """Guarda en la caché el cuerpo recién serializado de una lectura y lo responde con su ETag.
+
+    Args:
+        clave (str or None): Clave de la lectura; si es None (caché desactivada) no se guarda ni se agrega ETag.
+        cuerpo (bytes): Cuerpo JSON de la respuesta (ver `app.serializacion`).
+
+    Returns:
+        Response: Respuesta JSON.
+    """
+    if clave is None:
+        return Response(cuerpo, media_type="application/json")
+    cache_lecturas.guardar(clave, cuerpo)
+    return Response(cuerpo, media_type="application/json", headers=_encabezados(clave))
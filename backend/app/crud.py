@@ -1,8 +1,54 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import Integer, String, any_, bindparam, func, insert, literal_column, or_, select, text, update
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
 from . import models, schemas
 
+# Las consultas se construyen con funciones compartidas (`_consulta_*`, `_sentencia_*`) que usan tanto
+# las funciones sincrónicas (Session) como sus versiones asincrónicas `*_async` (AsyncSession,
+# ver `db.connection.DB_ASYNC`), de modo que ambas rutas ejecutan exactamente el mismo SQL.
+
+
+def _datos_registro(registro: schemas.RegistroCreate) -> dict:
+    """Convierte un esquema de entrada en un diccionario de columnas listo para la base de datos.
+
+    El enlace se convierte a str porque el tipo HttpUrl de pydantic no es adaptable por el driver.
+    """
+    datos = registro.dict()
+    datos["enlace_articulo"] = str(datos["enlace_articulo"])
+    return datos
+
+
+# Columnas cuyo cambio se guarda en el historial (`models.SnapshotML`)
+CAMPOS_HISTORIAL = ("precio", "calificacion_promedio", "cantidad_calificaciones")
+
+
+def _dialecto(db) -> str:
+    """Devuelve el nombre del dialecto de la sesión (Session o AsyncSession): "postgresql", "sqlite", ..."""
+    return db.get_bind().dialect.name
+
+
+def _insert(dialecto: str):
+    """Devuelve la construcción INSERT del dialecto (soporta ON CONFLICT en PostgreSQL y SQLite)."""
+    if dialecto == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+def _valores_historial(datos) -> dict:
+    """Extrae de un registro (diccionario o fila de columnas) los valores que se guardan en el historial."""
+    return {campo: datos[campo] for campo in CAMPOS_HISTORIAL}
+
+
+def _filas_snapshot(filas: List[dict]) -> List[dict]:
+    """Agrega la hora actual a las capturas ({'registro_id', *CAMPOS_HISTORIAL}) que se van a guardar."""
+    capturado_en = datetime.now(timezone.utc)
+    return [{**fila, "capturado_en": capturado_en} for fila in filas]
+
+
 def crear_registro(db: Session, registro: schemas.RegistroCreate):
-    """Crea un nuevo registro en la base de datos.
+    """Crea un nuevo registro en la base de datos, junto con la primera captura de su historial.
 
     Args:
         db (Session): Sesión de SQLAlchemy para interactuar con la base de datos.
@@ -11,21 +57,345 @@ def crear_registro(db: Session, registro: schemas.RegistroCreate):
     Returns:
         models.RegistroML: El registro creado con sus datos completos, incluyendo ID generado.
     """
-    db_registro = models.RegistroML(**registro.dict())
+    datos = _datos_registro(registro)
+    db_registro = models.RegistroML(**datos)
     db.add(db_registro)
+    db.flush()
+    db.execute(insert(models.SnapshotML), _filas_snapshot([{"registro_id": db_registro.id, **_valores_historial(datos)}]))
     db.commit()
     db.refresh(db_registro)
     return db_registro
 
-def obtener_registros(db: Session, skip: int = 0, limit: int = 1000):
-    """Obtiene una lista de registros desde la base de datos con paginación.
+async def crear_registro_async(db, registro: schemas.RegistroCreate):
+    """Versión asincrónica de `crear_registro` (db es una `AsyncSession`)."""
+    datos = _datos_registro(registro)
+    db_registro = models.RegistroML(**datos)
+    db.add(db_registro)
+    await db.flush()
+    await db.execute(insert(models.SnapshotML), _filas_snapshot([{"registro_id": db_registro.id, **_valores_historial(datos)}]))
+    await db.commit()
+    await db.refresh(db_registro)
+    return db_registro
+
+
+def _filas_lote(registros: List[schemas.RegistroCreate]) -> dict:
+    """Agrupa un lote por item_id ({item_id: columnas}); de los item_id repetidos se conserva el primero."""
+    filas = {}
+    for registro in registros:
+        filas.setdefault(registro.item_id, _datos_registro(registro))
+    return filas
+
+def _consulta_vigentes(dialecto: str, item_ids: List[str]):
+    """Construye el SELECT del id y los valores vigentes del historial de los item_id indicados."""
+    columnas = [models.RegistroML.id, models.RegistroML.item_id] + [getattr(models.RegistroML, c) for c in CAMPOS_HISTORIAL]
+    return select(*columnas).where(_condicion_item_ids(dialecto, item_ids))
+
+def _sentencia_insertar_nuevos(dialecto: str, nuevos: List[dict]):
+    """Construye el `INSERT ... ON CONFLICT (item_id) DO NOTHING RETURNING id, item_id` de los registros nuevos."""
+    return (
+        _insert(dialecto)(models.RegistroML)
+        .values(nuevos)
+        .on_conflict_do_nothing(index_elements=["item_id"])
+        .returning(models.RegistroML.id, models.RegistroML.item_id)
+    )
+
+def _cambios_lote(filas: dict, vigentes: dict, insertados, estados: dict):
+    """Determina qué escribir para un lote ya consultado e insertado, y completa el estado de cada item_id.
+
+    Args:
+        filas (dict): Columnas de cada item_id del lote (ver `_filas_lote`).
+        vigentes (dict): Fila vigente de cada item_id que ya existía (ver `_consulta_vigentes`).
+        insertados (iterable): Pares (id, item_id) devueltos por el INSERT de los nuevos.
+        estados (dict): Se completa con "insertado" o "actualizado" por item_id.
+
+    Returns:
+        tuple: (filas a actualizar en `registros_ml` con su 'id', capturas a agregar a `snapshots_ml`).
+    """
+    snapshots = []
+    for registro_id, item_id in insertados:
+        estados[item_id] = "insertado"
+        snapshots.append({"registro_id": registro_id, **_valores_historial(filas[item_id])})
+
+    cambios = []
+    for item_id, vigente in vigentes.items():
+        valores = _valores_historial(filas[item_id])
+        if valores != _valores_historial(vigente._mapping):
+            estados[item_id] = "actualizado"
+            cambios.append({"id": vigente.id, **valores})
+            snapshots.append({"registro_id": vigente.id, **valores})
+    return cambios, _filas_snapshot(snapshots)
+
+def _resultados_bulk(registros: List[schemas.RegistroCreate], estados: dict) -> List[dict]:
+    """Arma el estado de cada registro del lote, en el orden recibido."""
+    resultados = []
+    for registro in registros:
+        item_id = registro.item_id
+        # Las repeticiones dentro del lote cuentan como duplicadas
+        resultados.append({"item_id": item_id, "estado": estados.pop(item_id, "duplicado")})
+    return resultados
+
+def crear_registros_bulk(db: Session, registros: List[schemas.RegistroCreate]):
+    """Inserta o actualiza un lote de registros y guarda en el historial solo los cambios.
+
+    1. Lee con una consulta indexada el estado actual de los item_id del lote que ya existen.
+    2. Inserta los nuevos con una única sentencia `INSERT ... ON CONFLICT (item_id) DO NOTHING RETURNING`.
+    3. Compara el precio, la calificación promedio y la cantidad de calificaciones de los existentes
+       con los vigentes: si alguno cambió, actualiza la fila y agrega una captura al historial; si no,
+       no escribe nada.
+
+    El estado vigente de `registros_ml` es siempre el de la última captura, por lo que la comparación
+    no necesita leer el historial. Los item_id repetidos dentro del mismo lote se procesan una sola vez.
+
+    Args:
+        db (Session): Sesión de SQLAlchemy para interactuar con la base de datos.
+        registros (List[schemas.RegistroCreate]): Registros a cargar, ya validados.
+
+    Returns:
+        List[dict]: Un elemento por registro recibido, en el mismo orden, con las claves
+            'item_id' y 'estado' ("insertado", "actualizado" o "duplicado" si no cambió nada).
+    """
+    filas = _filas_lote(registros)
+    estados = {}
+    if filas:
+        dialecto = _dialecto(db)
+        vigentes = {fila.item_id: fila for fila in db.execute(_consulta_vigentes(dialecto, list(filas)))}
+        nuevos = [datos for item_id, datos in filas.items() if item_id not in vigentes]
+        insertados = db.execute(_sentencia_insertar_nuevos(dialecto, nuevos)).all() if nuevos else []
+        cambios, snapshots = _cambios_lote(filas, vigentes, insertados, estados)
+        if cambios:
+            db.execute(update(models.RegistroML), cambios)
+        if snapshots:
+            db.execute(insert(models.SnapshotML), snapshots)
+        db.commit()
+    return _resultados_bulk(registros, estados)
+
+async def crear_registros_bulk_async(db, registros: List[schemas.RegistroCreate]):
+    """Versión asincrónica de `crear_registros_bulk` (db es una `AsyncSession`), con las mismas sentencias."""
+    filas = _filas_lote(registros)
+    estados = {}
+    if filas:
+        dialecto = _dialecto(db)
+        vigentes = {fila.item_id: fila for fila in await db.execute(_consulta_vigentes(dialecto, list(filas)))}
+        nuevos = [datos for item_id, datos in filas.items() if item_id not in vigentes]
+        insertados = (await db.execute(_sentencia_insertar_nuevos(dialecto, nuevos))).all() if nuevos else []
+        cambios, snapshots = _cambios_lote(filas, vigentes, insertados, estados)
+        if cambios:
+            await db.execute(update(models.RegistroML), cambios)
+        if snapshots:
+            await db.execute(insert(models.SnapshotML), snapshots)
+        await db.commit()
+    return _resultados_bulk(registros, estados)
+
+def _condicion_item_ids(dialecto: str, item_ids: List[str]):
+    """Construye la condición `item_id` pertenece a la lista, con un único parámetro de tipo arreglo en PostgreSQL."""
+    columna = models.RegistroML.item_id
+    if dialecto == "postgresql":
+        return columna == any_(bindparam("item_ids", item_ids, type_=postgresql.ARRAY(String)))
+    return columna.in_(item_ids)
+
+def _consulta_existentes(dialecto: str, item_ids: List[str]):
+    """Construye el SELECT de los item_id indicados que ya están en la tabla."""
+    return select(models.RegistroML.item_id).where(_condicion_item_ids(dialecto, list(item_ids)))
+
+def obtener_items_existentes(db: Session, item_ids: List[str]):
+    """Devuelve cuáles de los item_id recibidos ya están almacenados en la base de datos.
+
+    En PostgreSQL la consulta es `item_id = ANY(:item_ids)` con un único parámetro de tipo arreglo,
+    resuelta con el índice único `idx_item_id` (claves de ~10 bytes en lugar de URLs de hasta 2 KB);
+    en otros motores se usa `IN (...)`. El costo depende del tamaño del lote consultado y no del
+    tamaño de la tabla.
+
+    Args:
+        db (Session): Sesión de SQLAlchemy para realizar la consulta.
+        item_ids (List[str]): IDs de Mercado Libre a verificar.
+
+    Returns:
+        List[str]: Subconjunto de `item_ids` que ya existe en la tabla.
+    """
+    if not item_ids:
+        return []
+    return db.execute(_consulta_existentes(_dialecto(db), item_ids)).scalars().all()
+
+async def obtener_items_existentes_async(db, item_ids: List[str]):
+    """Versión asincrónica de `obtener_items_existentes` (db es una `AsyncSession`)."""
+    if not item_ids:
+        return []
+    return (await db.execute(_consulta_existentes(_dialecto(db), item_ids))).scalars().all()
+
+def _consulta_registros(after_id: Optional[int] = None):
+    """Construye el SELECT de registros ordenado por id, opcionalmente a partir de un cursor.
+
+    `WHERE id > :after_id ORDER BY id` se resuelve recorriendo la clave primaria desde el cursor,
+    por lo que cada página cuesta lo mismo sin importar qué tan profunda sea.
+    """
+    consulta = select(models.RegistroML).order_by(models.RegistroML.id)
+    if after_id is not None:
+        consulta = consulta.where(models.RegistroML.id > after_id)
+    return consulta
+
+# Columnas por las que se pueden ordenar los registros (ver `schemas.FiltrosRegistros.orden`)
+COLUMNAS_ORDEN = ("id", "precio", "calificacion_promedio", "cantidad_calificaciones")
+
+def _condicion_texto(dialecto: str, q: str):
+    """Construye la condición de búsqueda de texto en el nombre y la descripción según el motor.
+
+    - PostgreSQL: `tsvector @@ websearch_to_tsquery('spanish', q)`, resuelta con el índice GIN
+      `idx_registros_busqueda` (la expresión es la misma del índice, `models.VECTOR_BUSQUEDA`).
+    - SQLite: `MATCH` sobre la tabla FTS5 `registros_ml_fts`; cada palabra se busca como término literal.
+    - Otros motores: `ILIKE` sobre ambas columnas (sin índice).
+    """
+    if dialecto == "postgresql":
+        consulta_texto = func.websearch_to_tsquery(literal_column("'spanish'::regconfig"), q)
+        return literal_column(models.VECTOR_BUSQUEDA).op("@@", is_comparison=True)(consulta_texto)
+    if dialecto == "sqlite":
+        terminos = " ".join('"' + palabra.replace('"', '""') + '"' for palabra in q.split())
+        coincidencias = text(
+            f"SELECT rowid FROM {models.TABLA_FTS} WHERE {models.TABLA_FTS} MATCH :terminos_fts"
+        ).bindparams(terminos_fts=terminos).columns(rowid=Integer)
+        return models.RegistroML.id.in_(coincidencias)
+    patron = f"%{q}%"
+    return or_(models.RegistroML.nombre_articulo.ilike(patron), models.RegistroML.descripcion.ilike(patron))
+
+def _aplicar_filtros(consulta, dialecto: str, filtros: schemas.FiltrosRegistros):
+    """Agrega a un SELECT de registros las condiciones y el orden de `filtros`.
+
+    Los filtros de rango y el orden por precio o calificaciones usan los índices (columna, id) de
+    `registros_ml`; el id desempata para que el orden sea estable entre páginas.
+    """
+    columnas = models.RegistroML
+    if filtros.precio_min is not None:
+        consulta = consulta.where(columnas.precio >= filtros.precio_min)
+    if filtros.precio_max is not None:
+        consulta = consulta.where(columnas.precio <= filtros.precio_max)
+    if filtros.calificacion_min is not None:
+        consulta = consulta.where(columnas.calificacion_promedio >= filtros.calificacion_min)
+    if filtros.calificaciones_min is not None:
+        consulta = consulta.where(columnas.cantidad_calificaciones >= filtros.calificaciones_min)
+    if filtros.q and filtros.q.strip():
+        consulta = consulta.where(_condicion_texto(dialecto, filtros.q.strip()))
+
+    descendente = filtros.orden.startswith("-")
+    columna = getattr(columnas, filtros.orden.lstrip("-"))
+    if descendente:
+        return consulta.order_by(None).order_by(columna.desc(), columnas.id.desc())
+    return consulta.order_by(None).order_by(columna, columnas.id)
+
+def _consulta_pagina(dialecto: str, skip: int = 0, limit: int = 1000, after_id: Optional[int] = None,
+                     filtros: Optional[schemas.FiltrosRegistros] = None):
+    """Construye el SELECT de una página de registros, con filtros opcionales (ver `obtener_registros`)."""
+    consulta = _consulta_registros(after_id)
+    if filtros is not None:
+        consulta = _aplicar_filtros(consulta, dialecto, filtros)
+    consulta = consulta.limit(limit)
+    if skip:
+        consulta = consulta.offset(skip)
+    return consulta
+
+def obtener_registros(db: Session, skip: int = 0, limit: int = 1000, after_id: Optional[int] = None,
+                      filtros: Optional[schemas.FiltrosRegistros] = None):
+    """Obtiene una lista de registros desde la base de datos con paginación, filtrados y ordenados (por id si no se indica).
+
+    Se recomienda paginar con `after_id` (el id del último registro de la página anterior): a diferencia
+    de `skip`, no obliga a la base de datos a recorrer y descartar las filas anteriores y el resultado
+    es estable aunque se inserten registros entre una llamada y otra.
 
     Args:
         db (Session): Sesión de SQLAlchemy para realizar la consulta.
         skip (int, optional): Número de registros a omitir desde el inicio. Por defecto es 0.
         limit (int, optional): Número máximo de registros a retornar. Por defecto es 1000.
+        after_id (int, optional): Cursor; si se indica, solo se devuelven registros con id mayor.
+        filtros (schemas.FiltrosRegistros, optional): Rangos de precio y calificaciones, texto a buscar y orden.
 
     Returns:
         List[models.RegistroML]: Lista de objetos con los registros obtenidos.
     """
-    return db.query(models.RegistroML).offset(skip).limit(limit).all()
+    return db.execute(_consulta_pagina(_dialecto(db), skip, limit, after_id, filtros)).scalars().all()
+
+async def obtener_registros_async(db, skip: int = 0, limit: int = 1000, after_id: Optional[int] = None,
+                                  filtros: Optional[schemas.FiltrosRegistros] = None):
+    """Versión asincrónica de `obtener_registros` (db es una `AsyncSession`)."""
+    return (await db.execute(_consulta_pagina(_dialecto(db), skip, limit, after_id, filtros))).scalars().all()
+
+def _consulta_filas(dialecto: str, campos: List[str], skip: int = 0, limit: int = 1000, after_id: Optional[int] = None,
+                    filtros: Optional[schemas.FiltrosRegistros] = None):
+    """Construye el SELECT de una página que trae solo las columnas `campos`, en ese orden (ver `obtener_filas_registros`)."""
+    columnas = models.RegistroML.__table__.c
+    return _consulta_pagina(dialecto, skip, limit, after_id, filtros).with_only_columns(*(columnas[campo] for campo in campos))
+
+def obtener_filas_registros(db: Session, campos: List[str], skip: int = 0, limit: int = 1000, after_id: Optional[int] = None,
+                            filtros: Optional[schemas.FiltrosRegistros] = None):
+    """Obtiene la misma página que `obtener_registros`, pero como tuplas con solo las columnas pedidas.
+
+    No construye objetos del ORM ni los registra en la sesión: es la consulta de la ruta rápida de
+    serialización (ver `app.serializacion.serializar_filas`).
+
+    Args:
+        db (Session): Sesión de SQLAlchemy para realizar la consulta.
+        campos (List[str]): Columnas a traer, en el orden en que se serializan.
+        skip, limit, after_id, filtros: Igual que en `obtener_registros`.
+
+    Returns:
+        List[Row]: Una tupla por registro, con los valores de `campos`.
+    """
+    return db.execute(_consulta_filas(_dialecto(db), campos, skip, limit, after_id, filtros)).all()
+
+async def obtener_filas_registros_async(db, campos: List[str], skip: int = 0, limit: int = 1000, after_id: Optional[int] = None,
+                                        filtros: Optional[schemas.FiltrosRegistros] = None):
+    """Versión asincrónica de `obtener_filas_registros` (db es una `AsyncSession`)."""
+    return (await db.execute(_consulta_filas(_dialecto(db), campos, skip, limit, after_id, filtros))).all()
+
+def iterar_registros(db: Session, after_id: Optional[int] = None, tam_bloque: int = 1000):
+    """Recorre todos los registros ordenados por id sin cargarlos en memoria a la vez.
+
+    Usa `yield_per`, que en PostgreSQL abre un cursor del lado del servidor: las filas se reciben
+    de a `tam_bloque` y la memoria usada es constante sin importar el tamaño de la tabla.
+
+    Args:
+        db (Session): Sesión de SQLAlchemy exclusiva para el recorrido (queda ocupada hasta terminar).
+        after_id (int, optional): Cursor; si se indica, el recorrido empieza después de ese id.
+        tam_bloque (int, optional): Filas que se traen de la base de datos en cada viaje.
+
+    Yields:
+        models.RegistroML: Cada registro, en orden de id.
+    """
+    consulta = _consulta_registros(after_id).execution_options(yield_per=tam_bloque)
+    yield from db.execute(consulta).scalars()
+
+async def iterar_registros_async(db, after_id: Optional[int] = None, tam_bloque: int = 1000):
+    """Versión asincrónica de `iterar_registros` (db es una `AsyncSession`), con un cursor del servidor vía `stream`."""
+    consulta = _consulta_registros(after_id).execution_options(yield_per=tam_bloque)
+    async for registro in await db.stream_scalars(consulta):
+        yield registro
+
+def _consulta_historial(registro_id: int, limit: int = 1000):
+    """Construye el SELECT del historial de un registro, en orden cronológico (ver `obtener_historial`)."""
+    return (
+        select(models.SnapshotML)
+        .where(models.SnapshotML.registro_id == registro_id)
+        .order_by(models.SnapshotML.capturado_en, models.SnapshotML.id)
+        .limit(limit)
+    )
+
+def obtener_historial(db: Session, registro_id: int, limit: int = 1000):
+    """Obtiene el historial de precio y calificaciones de un registro, en orden cronológico.
+
+    La consulta recorre el índice (registro_id, capturado_en) de `snapshots_ml`, por lo que su costo
+    depende de las capturas del artículo y no del tamaño de la tabla.
+
+    Args:
+        db (Session): Sesión de SQLAlchemy para realizar la consulta.
+        registro_id (int): ID del registro.
+        limit (int, optional): Número máximo de capturas a retornar (las más antiguas primero).
+
+    Returns:
+        List[models.SnapshotML] or None: Capturas del registro, o None si el registro no existe.
+    """
+    if db.get(models.RegistroML, registro_id) is None:
+        return None
+    return db.execute(_consulta_historial(registro_id, limit)).scalars().all()
+
+async def obtener_historial_async(db, registro_id: int, limit: int = 1000):
+    """Versión asincrónica de `obtener_historial` (db es una `AsyncSession`)."""
+    if await db.get(models.RegistroML, registro_id) is None:
+        return None
+    return (await db.execute(_consulta_historial(registro_id, limit))).scalars().all()
@@ -13,14 +13,69 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME")
 
-# Cadena de conexión
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Pool de conexiones (el mismo para el motor sincrónico y el asincrónico)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))                 # Conexiones que el pool mantiene abiertas
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))           # Conexiones extra permitidas en picos de carga
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))         # Segundos de espera por una conexión libre antes de fallar
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))         # Segundos tras los que una conexión se reemplaza (evita cortes por inactividad)
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", "30000"))  # Milisegundos máximos por consulta (statement_timeout de PostgreSQL)
+DB_ASYNC = os.getenv("DB_ASYNC", "0").lower() in ("1", "true", "si", "sí")  # Usar el motor asyncpg y los endpoints asincrónicos
+
+# Cadena de conexión; DATABASE_URL la reemplaza completa, por ejemplo "sqlite:///registros_local.db"
+# para probar la API localmente sin PostgreSQL
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ES_SQLITE = DATABASE_URL.startswith("sqlite")
+# Drivers explícitos de cada motor: psycopg2 (sincrónico) y asyncpg (asincrónico); aiosqlite para SQLite
+DATABASE_URL_SYNC = DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
+DATABASE_URL_ASYNC = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1).replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+OPCIONES_POOL = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": True,
+}
 
 # SQLAlchemy setup
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL_SYNC,
+    connect_args={"check_same_thread": False} if ES_SQLITE else {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT}"},
+    **OPCIONES_POOL
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Motor asincrónico: se crea solo con DB_ASYNC activado o al llamar a `crear_motor_async`,
+# porque requiere `asyncpg` y `greenlet`
+async_engine = None
+AsyncSessionLocal = None
+
+
+def crear_motor_async():
+    """Crea (una sola vez) el motor asincrónico de SQLAlchemy con el driver asyncpg y su fábrica de sesiones.
+
+    Usa las mismas opciones de pool que el motor sincrónico; el statement_timeout se envía como
+    parámetro de la sesión de PostgreSQL al abrir cada conexión.
+
+    Returns:
+        async_sessionmaker: Fábrica de sesiones `AsyncSession`.
+    """
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        async_engine = create_async_engine(
+            DATABASE_URL_ASYNC,
+            connect_args={} if ES_SQLITE else {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT)}},
+            **OPCIONES_POOL
+        )
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return AsyncSessionLocal
+
+
+if DB_ASYNC:
+    crear_motor_async()
+
 # Conexión directa con psycopg2 (usada por init_db)
 def get_connection():
     return psycopg2.connect(DATABASE_URL)
@@ -32,3 +87,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency para FastAPI (endpoints asincrónicos)
+async def get_async_db():
+    async with crear_motor_async()() as db:
+        yield db
@@ -1,11 +1,39 @@
 from connection import get_connection
 
+# Códigos de los sitios de Mercado Libre (los mismos de `scraping.scraper.SITIOS_ML`)
+SITIOS_ML = "MLA|MLB|MCO|MLM|MLC|MLU|MPE|MEC|MLV|MBO|MPY|MCR|MPA|MGT|MHN|MNI|MSV|MRD|MCU"
+
+# Expresión que extrae el ID de Mercado Libre (p. ej. MCO1234567) de un enlace guardado.
+# Equivale a `scraping.scraper.extraer_item_id`: prefiere el segmento "/p/MCO..." y la ruta del host
+# "articulo.", y solo acepta los códigos de SITIOS_ML; los enlaces de seguimiento (click1) no lo contienen.
+EXPRESION_ITEM_ID = (
+    "upper(replace(coalesce("
+    f"substring(enlace_articulo from '(?i)/p/((?:{SITIOS_ML})[0-9]+)'), "
+    f"substring(enlace_articulo from '(?i)^(?:https?:)?(?://)?articulo\\.[^/]+/((?:{SITIOS_ML})-?[0-9]+)'), "
+    f"substring(enlace_articulo from '(?i)(?:^|[^a-z0-9])((?:{SITIOS_ML})-?[0-9]{{4,}})')"
+    "), '-', ''))"
+)
+
+# Vector de búsqueda de texto; debe coincidir con `app.models.VECTOR_BUSQUEDA` para que las consultas usen el índice
+VECTOR_BUSQUEDA = "to_tsvector('spanish'::regconfig, coalesce(nombre_articulo, '') || ' ' || coalesce(descripcion, ''))"
+
 def crear_tabla_e_indice():
-    """Crea la tabla 'registros_ml' y un índice único en la base de datos si no existen.
+    """Crea las tablas 'registros_ml' y 'snapshots_ml' y sus índices en la base de datos si no existen.
+
+    Esta función establece una conexión a la base de datos, crea la tabla
+    'registros_ml' con sus respectivos campos y define un índice único sobre
+    el campo 'item_id' (ID del artículo en Mercado Libre) para evitar duplicados.
+
+    En bases de datos creadas con la versión anterior (deduplicadas por 'enlace_articulo') agrega
+    la columna 'item_id', la completa a partir de los enlaces guardados y reemplaza el índice único
+    sobre los enlaces, que pueden medir hasta 2 KB, por el índice sobre 'item_id'. Si varios
+    registros antiguos corresponden al mismo artículo, solo el más antiguo conserva el item_id.
 
-    Esta función establece una conexión a la base de datos, crea la tabla 
-    'registros_ml' con sus respectivos campos y define un índice único sobre 
-    el campo 'enlace_articulo' para evitar duplicados.
+    Crea los índices B-tree de precio y calificaciones y el índice GIN de texto completo (en español)
+    sobre el nombre y la descripción, usados por los filtros de `GET /registros/`.
+
+    También crea la tabla 'snapshots_ml' (historial de precio y calificaciones de cada registro) con
+    su índice (registro_id, capturado_en), y agrega una primera captura a los registros que no tienen.
 
     No recibe parámetros ni retorna valores.
     """
@@ -14,6 +42,7 @@ def crear_tabla_e_indice():
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS registros_ml (
                     id SERIAL PRIMARY KEY,
+                    item_id VARCHAR(20),
                     nombre_articulo VARCHAR(255),
                     precio INT,
                     calificacion_promedio FLOAT,
@@ -22,11 +51,55 @@ def crear_tabla_e_indice():
                     enlace_articulo TEXT
                 );
             """)
+            cur.execute("ALTER TABLE registros_ml ADD COLUMN IF NOT EXISTS item_id VARCHAR(20);")
+            cur.execute(f"""
+                UPDATE registros_ml AS r
+                SET item_id = c.item_id
+                FROM (
+                    SELECT id, item_id, row_number() OVER (PARTITION BY item_id ORDER BY id) AS orden
+                    FROM (SELECT id, {EXPRESION_ITEM_ID} AS item_id FROM registros_ml WHERE item_id IS NULL) AS e
+                    WHERE item_id IS NOT NULL
+                ) AS c
+                WHERE r.id = c.id
+                  AND c.orden = 1
+                  AND NOT EXISTS (SELECT 1 FROM registros_ml AS x WHERE x.item_id = c.item_id);
+            """)
+            cur.execute("DROP INDEX IF EXISTS idx_enlace_articulo;")
+            cur.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_item_id
+                ON registros_ml(item_id);
+            """)
+            # Filtros por rango y orden de GET /registros/ (el id desempata el orden)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_registros_precio ON registros_ml(precio, id);")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_registros_calificacion ON registros_ml(calificacion_promedio, id);")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_registros_cantidad_calificaciones ON registros_ml(cantidad_calificaciones, id);")
+            cur.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_registros_busqueda
+                ON registros_ml USING GIN ({VECTOR_BUSQUEDA});
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots_ml (
+                    id SERIAL PRIMARY KEY,
+                    registro_id INT NOT NULL REFERENCES registros_ml(id) ON DELETE CASCADE,
+                    capturado_en TIMESTAMPTZ NOT NULL,
+                    precio INT NOT NULL,
+                    calificacion_promedio FLOAT,
+                    cantidad_calificaciones INT
+                );
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_snapshots_registro_fecha
+                ON snapshots_ml(registro_id, capturado_en);
+            """)
+            # Los registros anteriores al historial arrancan con una captura de su estado actual
             cur.execute("""
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_enlace_articulo
-                ON registros_ml(enlace_articulo);
+                INSERT INTO snapshots_ml (registro_id, capturado_en, precio, calificacion_promedio, cantidad_calificaciones)
+                SELECT r.id, now(), r.precio, r.calificacion_promedio, r.cantidad_calificaciones
+                FROM registros_ml AS r
+                WHERE r.precio IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM snapshots_ml AS s WHERE s.registro_id = r.id);
             """)
         conn.commit()
 
 if __name__ == "__main__":
-    crear_tabla_e_indice()
\ No newline at end of file
+    crear_tabla_e_indice()
@@ -1,5 +1,8 @@
 from fastapi import FastAPI
-from .routers import registros_ml
+from . import metricas, models
+from .db import connection
+from .db.connection import DB_ASYNC, ES_SQLITE, Base, engine
+from .routers import metricas as router_metricas, registros_ml
 
 app = FastAPI(
     title="API MercadoLibre Scraper",
@@ -7,4 +10,21 @@ app = FastAPI(
     version="1.0.0"
 )
 
-app.include_router(registros_ml.router)
+# Con DB_ASYNC=1 los endpoints usan el motor asyncpg; si no, el motor sincrónico (psycopg2)
+if DB_ASYNC:
+    from .routers import registros_ml_async
+    app.include_router(registros_ml_async.router)
+else:
+    app.include_router(registros_ml.router)
+
+# Métricas en GET /metrics: latencia por ruta, duración de las consultas y uso del pool de conexiones
+app.middleware("http")(metricas.medir_peticion)
+app.include_router(router_metricas.router)
+metricas.instrumentar_motor(engine, "sync")
+if DB_ASYNC:
+    metricas.instrumentar_motor(connection.async_engine.sync_engine, "async")
+
+# Con una base SQLite local (DATABASE_URL=sqlite:///...) las tablas, índices y la tabla FTS5 se crean
+# al iniciar; en PostgreSQL los crea `db/init_db.py`
+if ES_SQLITE:
+    Base.metadata.create_all(engine)
@@ -0,0 +1,90 @@
+import time
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+
+# Métricas de la API en formato Prometheus, expuestas en GET /metrics (ver `routers.metricas`):
+# latencia de cada petición por ruta, duración de cada consulta a la base de datos y uso del pool de
+# conexiones. Cada proceso de uvicorn tiene su propio registro: con varios workers, Prometheus debe
+# consultar cada uno (o usar un solo worker por contenedor).
+REGISTRO = CollectorRegistry()
+
+PETICIONES = Counter(
+    "api_peticiones", "Peticiones atendidas, por método, ruta y código de respuesta",
+    ["metodo", "ruta", "estado"], registry=REGISTRO
+)
+DURACION_PETICION = Histogram(
+    "api_peticion_segundos", "Latencia de las peticiones, por método y ruta",
+    ["metodo", "ruta"], buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0), registry=REGISTRO
+)
+DURACION_CONSULTA = Histogram(
+    "db_consulta_segundos", "Duración de las consultas a la base de datos, por tipo de sentencia",
+    ["operacion"], buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0), registry=REGISTRO
+)
+
+
+async def medir_peticion(request, call_next):
+    """Middleware HTTP que mide la latencia de cada petición y cuenta su código de respuesta.
+
+    La ruta se registra con su plantilla (p. ej. "/registros/{registro_id}/historial") y no con la URL
+    concreta, para que la cantidad de series no crezca con los ids consultados. Para las respuestas en
+    streaming se mide hasta que se envían los encabezados.
+    """
+    inicio = time.perf_counter()
+    estado = 500
+    try:
+        respuesta = await call_next(request)
+        estado = respuesta.status_code
+        return respuesta
+    finally:
+        ruta = request.scope.get("route")
+        ruta = getattr(ruta, "path", "sin_ruta")
+        DURACION_PETICION.labels(request.method, ruta).observe(time.perf_counter() - inicio)
+        PETICIONES.labels(request.method, ruta, str(estado)).inc()
+
+
+def instrumentar_motor(motor, nombre):
+    """Mide cada consulta ejecutada por un motor de SQLAlchemy y publica el uso de su pool de conexiones.
+
+    Args:
+        motor (sqlalchemy.engine.Engine): Motor sincrónico (para el asincrónico, su `sync_engine`).
+        nombre (str): Nombre del motor en las métricas del pool ("sync" o "async").
+    """
+    @event.listens_for(motor, "before_cursor_execute")
+    def _antes(conexion, cursor, sentencia, parametros, contexto, executemany):
+        conexion.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+    @event.listens_for(motor, "after_cursor_execute")
+    def _despues(conexion, cursor, sentencia, parametros, contexto, executemany):
+        inicio = conexion.info["inicio_consultas"].pop()
+        operacion = sentencia.lstrip().split(None, 1)[0].upper() if sentencia.strip() else "OTRA"
+        DURACION_CONSULTA.labels(operacion).observe(time.perf_counter() - inicio)
+
+    REGISTRO.register(_ColectorPool(motor.pool, nombre))
+
+
+class _ColectorPool:
+    """Publica, en cada consulta a /metrics, el estado del pool de conexiones de un motor."""
+
+    def __init__(self, pool, nombre):
+        self.pool = pool
+        self.nombre = nombre
+
+    def describe(self):
+        # Evita que el registro llame a `collect` al registrar el colector
+        return []
+
+    def collect(self):
+        conexiones = GaugeMetricFamily(
+            "db_pool_conexiones", "Conexiones del pool, por motor y estado (en_uso, libres, desborde)",
+            labels=["motor", "estado"]
+        )
+        capacidad = GaugeMetricFamily("db_pool_tamano", "Conexiones que el pool mantiene abiertas (DB_POOL_SIZE)", labels=["motor"])
+        # Los pools sin tamaño fijo (p. ej. NullPool) no informan estas cifras
+        if hasattr(self.pool, "checkedout"):
+            conexiones.add_metric([self.nombre, "en_uso"], self.pool.checkedout())
+            conexiones.add_metric([self.nombre, "libres"], self.pool.checkedin())
+            conexiones.add_metric([self.nombre, "desborde"], max(self.pool.overflow(), 0))
+            capacidad.add_metric([self.nombre], self.pool.size())
+        yield conexiones
+        yield capacidad
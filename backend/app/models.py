@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String
+from sqlalchemy import DDL, Column, DateTime, Float, ForeignKey, Index, Integer, String, event, text
 from .db.connection import Base
 
 class RegistroML(Base):
@@ -9,19 +9,79 @@ class RegistroML(Base):
 
     Atributos:
         id (int): Identificador único del registro (clave primaria).
+        item_id (str): ID del artículo en Mercado Libre (p. ej. MCO1234567); clave única de deduplicación.
         nombre_articulo (str): Nombre del producto o artículo.
         precio (int): Precio del producto en COP.
         calificacion_promedio (float): Valoración promedio del producto.
         cantidad_calificaciones (int): Número de valoraciones que ha recibido.
         descripcion (str): Descripción textual del producto.
-        enlace_articulo (str): URL única del artículo; actúa como campo índice único.
+        enlace_articulo (str): URL del artículo (canónica cuando la página la indica).
     """
     __tablename__ = "registros_ml"
+    # Filtros por rango y orden de `GET /registros/`: con el id como desempate, `ORDER BY precio, id LIMIT n`
+    # se resuelve recorriendo el índice sin ordenar la tabla
+    __table_args__ = (
+        Index("idx_registros_precio", "precio", "id"),
+        Index("idx_registros_calificacion", "calificacion_promedio", "id"),
+        Index("idx_registros_cantidad_calificaciones", "cantidad_calificaciones", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(String(20), unique=True, index=True)
     nombre_articulo = Column(String(255), nullable=False)
     precio = Column(Integer, nullable=False)
     calificacion_promedio = Column(Float)
     cantidad_calificaciones = Column(Integer)
     descripcion = Column(String)
-    enlace_articulo = Column(String, unique=True, nullable=False)
+    enlace_articulo = Column(String, nullable=False)
+
+
+
+# BÚSQUEDA DE TEXTO SOBRE nombre_articulo Y descripcion
+# PostgreSQL: índice GIN sobre el tsvector en español de ambas columnas. Las consultas deben usar
+# exactamente esta expresión (ver `crud._condicion_texto`) para que el planificador use el índice.
+VECTOR_BUSQUEDA = "to_tsvector('spanish'::regconfig, coalesce(nombre_articulo, '') || ' ' || coalesce(descripcion, ''))"
+Index("idx_registros_busqueda", text(VECTOR_BUSQUEDA), postgresql_using="gin", _table=RegistroML.__table__).ddl_if(dialect="postgresql")
+
+# SQLite (pruebas locales): tabla FTS5 de contenido externo, sincronizada con triggers
+TABLA_FTS = "registros_ml_fts"
+for sentencia in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} USING fts5(nombre_articulo, descripcion, "
+    "content='registros_ml', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {TABLA_FTS}_ai AFTER INSERT ON registros_ml BEGIN "
+    f"INSERT INTO {TABLA_FTS}(rowid, nombre_articulo, descripcion) VALUES (new.id, new.nombre_articulo, new.descripcion); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TABLA_FTS}_ad AFTER DELETE ON registros_ml BEGIN "
+    f"INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, nombre_articulo, descripcion) VALUES ('delete', old.id, old.nombre_articulo, old.descripcion); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TABLA_FTS}_au AFTER UPDATE OF nombre_articulo, descripcion ON registros_ml BEGIN "
+    f"INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, nombre_articulo, descripcion) VALUES ('delete', old.id, old.nombre_articulo, old.descripcion); "
+    f"INSERT INTO {TABLA_FTS}(rowid, nombre_articulo, descripcion) VALUES (new.id, new.nombre_articulo, new.descripcion); END",
+):
+    event.listen(RegistroML.__table__, "after_create", DDL(sentencia).execute_if(dialect="sqlite"))
+
+
+class SnapshotML(Base):
+    """Modelo ORM de una captura del precio y las calificaciones de un artículo en un momento dado.
+
+    Se corresponde con la tabla 'snapshots_ml'. `RegistroML` guarda el estado actual de cada artículo
+    y esta tabla su historial: se agrega una fila al crear el registro y cada vez que una carga trae
+    un precio, una calificación promedio o una cantidad de calificaciones distintos de los vigentes,
+    por lo que la tabla crece con los cambios y no con la cantidad de veces que se scrapea.
+
+    Atributos:
+        id (int): Identificador único de la captura (clave primaria).
+        registro_id (int): ID del registro (`registros_ml.id`) al que corresponde.
+        capturado_en (datetime): Momento (UTC) en que se recibió el cambio.
+        precio (int): Precio del producto en COP.
+        calificacion_promedio (float): Valoración promedio del producto.
+        cantidad_calificaciones (int): Número de valoraciones que ha recibido.
+    """
+    __tablename__ = "snapshots_ml"
+    # El historial de un artículo se lee en orden cronológico recorriendo este índice
+    __table_args__ = (Index("idx_snapshots_registro_fecha", "registro_id", "capturado_en"),)
+
+    id = Column(Integer, primary_key=True)
+    registro_id = Column(Integer, ForeignKey("registros_ml.id", ondelete="CASCADE"), nullable=False)
+    capturado_en = Column(DateTime(timezone=True), nullable=False)
+    precio = Column(Integer, nullable=False)
+    calificacion_promedio = Column(Float)
+    cantidad_calificaciones = Column(Integer)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from ..metricas import REGISTRO
+
+router = APIRouter(tags=["metricas"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def obtener_metricas():
+    """Devuelve las métricas de la API (peticiones, consultas y pool de conexiones) en el formato de texto de Prometheus."""
+    return Response(generate_latest(REGISTRO), media_type=CONTENT_TYPE_LATEST)
@@ -1,16 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from typing import List
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from typing import List, Optional
 
-from .. import crud, schemas, models
-from ..db.connection import get_db
+from .. import cache, crud, schemas, serializacion, models
+from ..db.connection import SessionLocal, get_db
 
 router = APIRouter(
     prefix="/registros",
     tags=["registros_ml"]
 )
 
+# Máximo de registros aceptados en una sola carga masiva o consulta de existencia
+MAX_REGISTROS_BULK = 5000
+
+# Filas que se leen de la base de datos y se envían al cliente en cada bloque de la exportación
+TAM_BLOQUE_EXPORTACION = 1000
+
+# Columnas de la exportación, en el orden de la tabla
+COLUMNAS_EXPORTACION = [columna.name for columna in models.RegistroML.__table__.columns]
+
+# Tipo de contenido de cada formato de exportación
+TIPOS_EXPORTACION = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
 @router.post("/", response_model=schemas.Registro, status_code=status.HTTP_201_CREATED)
 def crear_registro(registro: schemas.RegistroCreate, db: Session = Depends(get_db)):
     """Crea un nuevo registro en la base de datos desde un endpoint POST.
@@ -23,35 +42,294 @@ def crear_registro(registro: schemas.RegistroCreate, db: Session = Depends(get_d
         schemas.Registro: Registro creado, incluyendo el ID asignado.
 
     Raises:
-        HTTPException: 409 si el enlace del artículo ya existe.
+        HTTPException: 409 si el item_id del artículo ya existe.
         HTTPException: 500 si ocurre un error inesperado de base de datos.
     """
     try:
-        return crud.crear_registro(db=db, registro=registro)
+        creado = crud.crear_registro(db=db, registro=registro)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=409,
-            detail="Este enlace_articulo ya fue registrado previamente."
+            detail="Este item_id ya fue registrado previamente."
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ocurrió un error inesperado en el servidor: {str(e)}"
+        )
+    cache.invalidar_lecturas()
+    return creado
+
+
+@router.post("/bulk", response_model=schemas.ResultadoBulk)
+def crear_registros_bulk(registros: List[schemas.RegistroCreate], db: Session = Depends(get_db)):
+    """Crea o actualiza muchos registros en una sola petición, con una sola sentencia INSERT.
+
+    Los registros cuyo item_id ya existe no rechazan la petición: si cambió su precio o sus
+    calificaciones se actualizan y se agrega una captura a su historial (`GET /registros/{id}/historial`);
+    si no cambió nada se informan como duplicados sin escribir en la base de datos. Solo un lote con
+    inserciones o actualizaciones invalida la caché de lecturas.
+
+    Args:
+        registros (List[schemas.RegistroCreate]): Registros a crear, validados en una sola pasada por FastAPI.
+        db (Session, optional): Sesión de base de datos inyectada por FastAPI.
+
+    Returns:
+        schemas.ResultadoBulk: Totales de insertados, actualizados y duplicados, y el estado de cada registro.
+
+    Raises:
+        HTTPException: 413 si el lote supera MAX_REGISTROS_BULK registros.
+        HTTPException: 500 si ocurre un error inesperado de base de datos.
+    """
+    if len(registros) > MAX_REGISTROS_BULK:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote supera el máximo de {MAX_REGISTROS_BULK} registros por petición."
         )
+    try:
+        resultados = crud.crear_registros_bulk(db=db, registros=registros)
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Ocurrió un error inesperado en el servidor: {str(e)}"
         )
+    return _totales_bulk(resultados)
+
+
+def _totales_bulk(resultados: List[dict]) -> dict:
+    """Arma la respuesta de la carga masiva (ver `schemas.ResultadoBulk`) a partir del estado de cada registro.
+
+    Si el lote insertó o actualizó algún registro, invalida la caché de lecturas.
+    """
+    insertados = sum(1 for r in resultados if r["estado"] == "insertado")
+    actualizados = sum(1 for r in resultados if r["estado"] == "actualizado")
+    if insertados or actualizados:
+        cache.invalidar_lecturas()
+    return {
+        "insertados": insertados,
+        "actualizados": actualizados,
+        "duplicados": len(resultados) - insertados - actualizados,
+        "resultados": resultados
+    }
+
+
+@router.post("/existentes", response_model=schemas.ItemsExistentes)
+def obtener_items_existentes(consulta: schemas.ConsultaItems, db: Session = Depends(get_db)):
+    """Indica cuáles de los artículos enviados (por item_id) ya están registrados.
+
+    Permite a los clientes deduplicar un lote de artículos con una consulta indexada, sin
+    descargar la tabla completa.
+
+    Args:
+        consulta (schemas.ConsultaItems): IDs de Mercado Libre a verificar.
+        db (Session, optional): Sesión de base de datos inyectada por FastAPI.
+
+    Returns:
+        schemas.ItemsExistentes: item_id consultados que ya existen en la base de datos.
+
+    Raises:
+        HTTPException: 413 si se consultan más de MAX_REGISTROS_BULK item_id.
+    """
+    if len(consulta.item_ids) > MAX_REGISTROS_BULK:
+        raise HTTPException(
+            status_code=413,
+            detail=f"La consulta supera el máximo de {MAX_REGISTROS_BULK} artículos por petición."
+        )
+    return {"existentes": crud.obtener_items_existentes(db=db, item_ids=consulta.item_ids)}
+
+
+# Valores aceptados por el parámetro `orden` de `GET /registros/`
+PATRON_ORDEN = "^-?(" + "|".join(crud.COLUMNAS_ORDEN) + ")$"
+
+
+def filtros_registros(
+    precio_min: Optional[int] = Query(None, ge=0),
+    precio_max: Optional[int] = Query(None, ge=0),
+    calificacion_min: Optional[float] = Query(None, ge=0, le=5),
+    calificaciones_min: Optional[int] = Query(None, ge=0),
+    q: Optional[str] = Query(None, max_length=200),
+    orden: str = Query("id", pattern=PATRON_ORDEN),
+):
+    """Dependencia de FastAPI que lee los filtros de `GET /registros/` desde los parámetros de la URL.
+
+    Returns:
+        schemas.FiltrosRegistros: Filtros y orden de la consulta.
+    """
+    return schemas.FiltrosRegistros(
+        precio_min=precio_min,
+        precio_max=precio_max,
+        calificacion_min=calificacion_min,
+        calificaciones_min=calificaciones_min,
+        q=q,
+        orden=orden,
+    )
+
+
+def validar_cursor(after_id: Optional[int], filtros: schemas.FiltrosRegistros):
+    """Rechaza `after_id` con un orden distinto de "id", porque el cursor es un id.
+
+    Raises:
+        HTTPException: 400 si se combina `after_id` con otro orden.
+    """
+    if after_id is not None and filtros.orden != "id":
+        raise HTTPException(
+            status_code=400,
+            detail="after_id solo se puede usar con orden=id; para otros órdenes se pagina con skip."
+        )
 
 
 @router.get("/", response_model=List[schemas.Registro])
-def obtener_registros(skip: int = 0, limit: int = 1000, db: Session = Depends(get_db)):
-    """Obtiene registros de la base de datos desde un endpoint GET con paginación.
+def obtener_registros(
+    request: Request,
+    skip: int = 0,
+    limit: int = 1000,
+    after_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, max_length=500),
+    filtros: schemas.FiltrosRegistros = Depends(filtros_registros),
+    db: Session = Depends(get_db)
+):
+    """Obtiene registros de la base de datos desde un endpoint GET con paginación, filtros y orden.
+
+    Para recorrer muchas páginas se recomienda `after_id` con el id del último registro recibido
+    (paginación por cursor); `skip` se mantiene por compatibilidad, pero su costo crece con la página.
+
+    Los filtros de precio y calificaciones y el orden usan los índices B-tree de cada columna; la
+    búsqueda de texto (`q`) usa el índice GIN de texto completo en PostgreSQL o la tabla FTS5 en SQLite.
+
+    La respuesta serializada se guarda en la caché de lecturas (ver `app.cache`) con un ETag: una
+    misma consulta se responde desde la caché, o con 304 si el cliente envía If-None-Match con el
+    ETag vigente, hasta que una escritura cambie la tabla.
+
+    Por defecto cada registro se valida con `schemas.Registro`, con la misma respuesta que daría
+    `response_model`. Con `fields` (o RESPUESTAS_RAPIDAS=1) la página se lee como tuplas con solo las
+    columnas pedidas y se serializa con orjson, sin construir objetos del ORM ni validarlos (ver
+    `app.serializacion`).
 
     Args:
+        request (Request): Petición HTTP (para el encabezado If-None-Match).
         skip (int, optional): Número de registros a omitir. Por defecto es 0.
         limit (int, optional): Número máximo de registros a retornar. Por defecto es 1000.
+        after_id (int, optional): Devuelve solo los registros con id mayor a este valor (solo con orden=id).
+        fields (str, optional): Campos a incluir, separados por comas (p. ej. "precio,enlace_articulo").
+        filtros (schemas.FiltrosRegistros): precio_min, precio_max, calificacion_min, calificaciones_min,
+            q (texto a buscar en el nombre y la descripción) y orden (p. ej. "precio" o "-calificacion_promedio").
         db (Session, optional): Sesión de base de datos inyectada por FastAPI.
 
     Returns:
         List[schemas.Registro]: Lista de registros obtenidos desde la base de datos.
+
+    Raises:
+        HTTPException: 400 si se combina `after_id` con un orden distinto de "id".
+        HTTPException: 400 si `fields` incluye un campo que no existe.
+    """
+    validar_cursor(after_id, filtros)
+    campos = serializacion.campos_solicitados(fields)
+    clave = cache.clave_lectura("registros", {"skip": skip, "limit": limit, "after_id": after_id, "fields": campos and ",".join(campos), **filtros.dict()})
+    respuesta = cache.respuesta_cacheada(request, clave)
+    if respuesta is not None:
+        return respuesta
+    if campos is None and not serializacion.RESPUESTAS_RAPIDAS:
+        registros = crud.obtener_registros(db, skip=skip, limit=limit, after_id=after_id, filtros=filtros)
+        return cache.respuesta_nueva(clave, serializacion.serializar(registros, schemas.Registro))
+    campos = campos or serializacion.CAMPOS_REGISTRO
+    filas = crud.obtener_filas_registros(db, campos, skip=skip, limit=limit, after_id=after_id, filtros=filtros)
+    return cache.respuesta_nueva(clave, serializacion.serializar_filas(filas, campos))
+
+
+@router.get("/{registro_id}/historial", response_model=List[schemas.Snapshot])
+def obtener_historial(request: Request, registro_id: int, limit: int = 1000, db: Session = Depends(get_db)):
+    """Obtiene el historial de precio y calificaciones de un registro, del cambio más antiguo al más reciente.
+
+    Usa la caché de lecturas y el ETag igual que `obtener_registros`.
+
+    Args:
+        request (Request): Petición HTTP (para el encabezado If-None-Match).
+        registro_id (int): ID del registro.
+        limit (int, optional): Número máximo de capturas a retornar. Por defecto es 1000.
+        db (Session, optional): Sesión de base de datos inyectada por FastAPI.
+
+    Returns:
+        List[schemas.Snapshot]: Capturas del registro, una por cada cambio detectado.
+
+    Raises:
+        HTTPException: 404 si el registro no existe.
+    """
+    clave = cache.clave_lectura("historial", {"registro_id": registro_id, "limit": limit})
+    respuesta = cache.respuesta_cacheada(request, clave)
+    if respuesta is not None:
+        return respuesta
+    historial = crud.obtener_historial(db, registro_id, limit=limit)
+    if historial is None:
+        raise HTTPException(status_code=404, detail="El registro no existe.")
+    return cache.respuesta_nueva(clave, serializacion.serializar(historial, schemas.Snapshot))
+
+
+def _escribir_fila(buffer: io.StringIO, escritor, registro: models.RegistroML):
+    """Agrega un registro a la exportación: como fila CSV si hay `escritor`, o como una línea NDJSON."""
+    valores = [getattr(registro, columna) for columna in COLUMNAS_EXPORTACION]
+    if escritor:
+        escritor.writerow(valores)
+    else:
+        buffer.write(json.dumps(dict(zip(COLUMNAS_EXPORTACION, valores)), ensure_ascii=False))
+        buffer.write("\n")
+
+
+def _generar_exportacion(formato: str, after_id: Optional[int]):
+    """Genera el contenido de la exportación por bloques, leyendo la tabla con un cursor del servidor.
+
+    Abre su propia sesión porque se ejecuta mientras se envía la respuesta, después de que FastAPI
+    ya cerró la sesión de la petición.
+
+    Args:
+        formato (str): "ndjson" (un objeto JSON por línea) o "csv" (con encabezado).
+        after_id (int, optional): Exporta solo los registros con id mayor a este valor.
+
+    Yields:
+        str: Bloques de texto con hasta TAM_BLOQUE_EXPORTACION filas.
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer) if formato == "csv" else None
+        if escritor:
+            escritor.writerow(COLUMNAS_EXPORTACION)
+
+        filas = 0
+        for registro in crud.iterar_registros(db, after_id=after_id, tam_bloque=TAM_BLOQUE_EXPORTACION):
+            _escribir_fila(buffer, escritor, registro)
+            filas += 1
+            if filas % TAM_BLOQUE_EXPORTACION == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/exportar")
+def exportar_registros(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after_id: Optional[int] = None
+):
+    """Exporta todos los registros en streaming, en formato NDJSON o CSV, ordenados por id.
+
+    La respuesta se genera a medida que se lee la tabla, con memoria constante en el servidor, por lo
+    que permite descargar millones de filas en una sola petición. Si la descarga se interrumpe, se
+    puede retomar con `after_id` igual al último id recibido.
+
+    Args:
+        formato (str, optional): "ndjson" (por defecto) o "csv".
+        after_id (int, optional): Exporta solo los registros con id mayor a este valor.
+
+    Returns:
+        StreamingResponse: Contenido de la exportación.
     """
-    return db.query(models.RegistroML).offset(skip).limit(limit).all()
\ No newline at end of file
+    return StreamingResponse(
+        _generar_exportacion(formato, after_id),
+        media_type=TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="registros_ml.{formato}"'}
+    )
\ No newline at end of file
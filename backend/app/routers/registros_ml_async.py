@@ -0,0 +1,171 @@
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from typing import List, Optional
+
+from .. import cache, crud, schemas, serializacion
+from ..db.connection import crear_motor_async, get_async_db
+from .registros_ml import (
+    COLUMNAS_EXPORTACION,
+    MAX_REGISTROS_BULK,
+    TAM_BLOQUE_EXPORTACION,
+    TIPOS_EXPORTACION,
+    _escribir_fila,
+    _totales_bulk,
+    filtros_registros,
+    validar_cursor,
+)
+
+# Mismos endpoints que `routers.registros_ml`, pero como corrutinas sobre el motor asyncpg: las
+# peticiones esperan a la base de datos sin ocupar un hilo del threadpool de FastAPI.
+# Se usan en lugar de los sincrónicos con DB_ASYNC=1 (ver `db.connection`).
+router = APIRouter(
+    prefix="/registros",
+    tags=["registros_ml"]
+)
+
+
+@router.post("/", response_model=schemas.Registro, status_code=status.HTTP_201_CREATED)
+async def crear_registro(registro: schemas.RegistroCreate, db=Depends(get_async_db)):
+    """Crea un nuevo registro en la base de datos (ver `routers.registros_ml.crear_registro`).
+
+    Raises:
+        HTTPException: 409 si el item_id del artículo ya existe.
+        HTTPException: 500 si ocurre un error inesperado de base de datos.
+    """
+    try:
+        creado = await crud.crear_registro_async(db=db, registro=registro)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Este item_id ya fue registrado previamente."
+        )
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ocurrió un error inesperado en el servidor: {str(e)}"
+        )
+    cache.invalidar_lecturas()
+    return creado
+
+
+@router.post("/bulk", response_model=schemas.ResultadoBulk)
+async def crear_registros_bulk(registros: List[schemas.RegistroCreate], db=Depends(get_async_db)):
+    """Crea o actualiza muchos registros en una sola petición (ver `routers.registros_ml.crear_registros_bulk`).
+
+    Raises:
+        HTTPException: 413 si el lote supera MAX_REGISTROS_BULK registros.
+        HTTPException: 500 si ocurre un error inesperado de base de datos.
+    """
+    if len(registros) > MAX_REGISTROS_BULK:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote supera el máximo de {MAX_REGISTROS_BULK} registros por petición."
+        )
+    try:
+        resultados = await crud.crear_registros_bulk_async(db=db, registros=registros)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ocurrió un error inesperado en el servidor: {str(e)}"
+        )
+    return _totales_bulk(resultados)
+
+
+@router.post("/existentes", response_model=schemas.ItemsExistentes)
+async def obtener_items_existentes(consulta: schemas.ConsultaItems, db=Depends(get_async_db)):
+    """Indica cuáles de los artículos enviados (por item_id) ya están registrados.
+
+    Raises:
+        HTTPException: 413 si se consultan más de MAX_REGISTROS_BULK item_id.
+    """
+    if len(consulta.item_ids) > MAX_REGISTROS_BULK:
+        raise HTTPException(
+            status_code=413,
+            detail=f"La consulta supera el máximo de {MAX_REGISTROS_BULK} artículos por petición."
+        )
+    return {"existentes": await crud.obtener_items_existentes_async(db=db, item_ids=consulta.item_ids)}
+
+
+@router.get("/", response_model=List[schemas.Registro])
+async def obtener_registros(
+    request: Request,
+    skip: int = 0,
+    limit: int = 1000,
+    after_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, max_length=500),
+    filtros: schemas.FiltrosRegistros = Depends(filtros_registros),
+    db=Depends(get_async_db)
+):
+    """Obtiene registros con paginación, filtros, orden, caché y ETag (ver `routers.registros_ml.obtener_registros`).
+
+    Raises:
+        HTTPException: 400 si se combina `after_id` con un orden distinto de "id".
+        HTTPException: 400 si `fields` incluye un campo que no existe.
+    """
+    validar_cursor(after_id, filtros)
+    campos = serializacion.campos_solicitados(fields)
+    clave = cache.clave_lectura("registros", {"skip": skip, "limit": limit, "after_id": after_id, "fields": campos and ",".join(campos), **filtros.dict()})
+    respuesta = cache.respuesta_cacheada(request, clave)
+    if respuesta is not None:
+        return respuesta
+    if campos is None and not serializacion.RESPUESTAS_RAPIDAS:
+        registros = await crud.obtener_registros_async(db, skip=skip, limit=limit, after_id=after_id, filtros=filtros)
+        return cache.respuesta_nueva(clave, serializacion.serializar(registros, schemas.Registro))
+    campos = campos or serializacion.CAMPOS_REGISTRO
+    filas = await crud.obtener_filas_registros_async(db, campos, skip=skip, limit=limit, after_id=after_id, filtros=filtros)
+    return cache.respuesta_nueva(clave, serializacion.serializar_filas(filas, campos))
+
+
+@router.get("/{registro_id}/historial", response_model=List[schemas.Snapshot])
+async def obtener_historial(request: Request, registro_id: int, limit: int = 1000, db=Depends(get_async_db)):
+    """Obtiene el historial de precio y calificaciones de un registro, del cambio más antiguo al más reciente.
+
+    Raises:
+        HTTPException: 404 si el registro no existe.
+    """
+    clave = cache.clave_lectura("historial", {"registro_id": registro_id, "limit": limit})
+    respuesta = cache.respuesta_cacheada(request, clave)
+    if respuesta is not None:
+        return respuesta
+    historial = await crud.obtener_historial_async(db, registro_id, limit=limit)
+    if historial is None:
+        raise HTTPException(status_code=404, detail="El registro no existe.")
+    return cache.respuesta_nueva(clave, serializacion.serializar(historial, schemas.Snapshot))
+
+
+async def _generar_exportacion(formato: str, after_id: Optional[int]):
+    """Genera el contenido de la exportación por bloques con un cursor del servidor (ver `routers.registros_ml._generar_exportacion`)."""
+    async with crear_motor_async()() as db:
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer) if formato == "csv" else None
+        if escritor:
+            escritor.writerow(COLUMNAS_EXPORTACION)
+
+        filas = 0
+        async for registro in crud.iterar_registros_async(db, after_id=after_id, tam_bloque=TAM_BLOQUE_EXPORTACION):
+            _escribir_fila(buffer, escritor, registro)
+            filas += 1
+            if filas % TAM_BLOQUE_EXPORTACION == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+
+@router.get("/exportar")
+async def exportar_registros(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after_id: Optional[int] = None
+):
+    """Exporta todos los registros en streaming, en formato NDJSON o CSV, ordenados por id."""
+    return StreamingResponse(
+        _generar_exportacion(formato, after_id),
+        media_type=TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="registros_ml.{formato}"'}
+    )
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Optional
 
 class RegistroBase(BaseModel):
     """Esquema base que define los campos comunes de un artículo.
@@ -7,6 +8,8 @@ class RegistroBase(BaseModel):
     Utilizado para validar la entrada y salida de datos en la API.
 
     Atributos:
+        item_id (Optional[str]): ID del artículo en Mercado Libre (p. ej. MCO1234567). Puede faltar
+            en registros antiguos cuyo enlace no lo contenía.
         nombre_articulo (str): Nombre del producto o artículo.
         precio (int): Precio del producto en COP.
         calificacion_promedio (Optional[float]): Valoración promedio del producto (puede no estar disponible).
@@ -14,6 +17,7 @@ class RegistroBase(BaseModel):
         descripcion (Optional[str]): Descripción textual del producto.
         enlace_articulo (HttpUrl): URL del artículo en el sitio web de origen.
     """
+    item_id: Optional[str] = None
     nombre_articulo: str
     precio: int
     calificacion_promedio: Optional[float] = None
@@ -25,9 +29,9 @@ class RegistroBase(BaseModel):
 class RegistroCreate(RegistroBase):
     """Esquema utilizado para validar los datos al crear un nuevo registro.
 
-    Hereda todos los campos de RegistroBase.
+    Hereda los campos de RegistroBase, pero el item_id es obligatorio porque es la clave de deduplicación.
     """
-    pass
+    item_id: str = Field(..., max_length=20)
 
 
 class Registro(RegistroBase):
@@ -42,3 +46,90 @@ class Registro(RegistroBase):
 
     class Config:
         orm_mode = True
+
+
+
+class EstadoRegistroBulk(BaseModel):
+    """Resultado de la carga de un registro dentro de un lote.
+
+    Atributos:
+        item_id (str): ID del artículo enviado.
+        estado (str): "insertado" si se creó el registro, "actualizado" si ya existía y cambió su precio o
+            sus calificaciones (se agregó una captura al historial) o "duplicado" si ya existía sin cambios.
+    """
+    item_id: str
+    estado: str
+
+
+class ResultadoBulk(BaseModel):
+    """Esquema de respuesta de la carga masiva de registros.
+
+    Atributos:
+        insertados (int): Cantidad de registros creados.
+        actualizados (int): Cantidad de registros existentes cuyo precio o calificaciones cambiaron.
+        duplicados (int): Cantidad de registros omitidos por tener un item_id ya registrado sin cambios.
+        resultados (List[EstadoRegistroBulk]): Estado de cada registro, en el orden en que se enviaron.
+    """
+    insertados: int
+    actualizados: int = 0
+    duplicados: int
+    resultados: List[EstadoRegistroBulk]
+
+
+
+class FiltrosRegistros(BaseModel):
+    """Filtros y orden de la consulta de registros (`GET /registros/`).
+
+    Atributos:
+        precio_min (Optional[int]): Precio mínimo (inclusive).
+        precio_max (Optional[int]): Precio máximo (inclusive).
+        calificacion_min (Optional[float]): Calificación promedio mínima; excluye los artículos sin calificar.
+        calificaciones_min (Optional[int]): Cantidad mínima de calificaciones.
+        q (Optional[str]): Texto a buscar en el nombre y la descripción (todas las palabras deben aparecer).
+        orden (str): Columna de orden (id, precio, calificacion_promedio o cantidad_calificaciones);
+            con "-" adelante el orden es descendente.
+    """
+    precio_min: Optional[int] = None
+    precio_max: Optional[int] = None
+    calificacion_min: Optional[float] = None
+    calificaciones_min: Optional[int] = None
+    q: Optional[str] = None
+    orden: str = "id"
+
+
+
+class Snapshot(BaseModel):
+    """Esquema de respuesta de una captura del historial de un artículo.
+
+    Atributos:
+        capturado_en (datetime): Momento (UTC) en que se registró el cambio.
+        precio (int): Precio del producto en COP.
+        calificacion_promedio (Optional[float]): Valoración promedio del producto.
+        cantidad_calificaciones (Optional[int]): Número de personas que calificaron el producto.
+    """
+    capturado_en: datetime
+    precio: int
+    calificacion_promedio: Optional[float] = None
+    cantidad_calificaciones: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+
+class ConsultaItems(BaseModel):
+    """Esquema de entrada para consultar qué artículos ya están registrados.
+
+    Atributos:
+        item_ids (List[str]): IDs de Mercado Libre a verificar.
+    """
+    item_ids: List[str]
+
+
+class ItemsExistentes(BaseModel):
+    """Esquema de respuesta con los artículos que ya están registrados.
+
+    Atributos:
+        existentes (List[str]): Subconjunto de los item_id consultados que ya existe en la base de datos.
+    """
+    existentes: List[str]
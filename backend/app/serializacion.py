@@ -0,0 +1,113 @@
+import functools
+import json
+import os
+from typing import List, Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from . import schemas
+
+try:
+    import orjson
+except ImportError:  # Sin orjson la ruta rápida usa json, con el mismo resultado pero más lenta
+    orjson = None
+
+# Serialización de las respuestas de lectura a JSON (bytes), que además se guardan en la caché
+# (ver `app.cache`). Hay dos rutas:
+#   - `serializar` (por defecto): valida cada objeto del ORM con el esquema de respuesta, igual que
+#     `response_model`, y produce los mismos bytes que FastAPI (enlaces normalizados por `HttpUrl`,
+#     precios convertidos a int, error 500 si una fila no cumple el esquema).
+#   - `serializar_filas` (ruta rápida, opcional): a partir de tuplas con solo las columnas pedidas
+#     (`crud.obtener_filas_registros`), sin construir objetos del ORM ni validar, con orjson. Los valores
+#     se devuelven tal como están en la base de datos: para las filas escritas por la API el resultado es
+#     el mismo que el de `serializar`, pero una fila escrita por otra vía puede diferir.
+# `GET /registros/` usa la ruta rápida solo con RESPUESTAS_RAPIDAS=1 o cuando se pide una proyección
+# de campos (`?fields=precio,enlace_articulo`).
+RESPUESTAS_RAPIDAS = os.getenv("RESPUESTAS_RAPIDAS", "0").lower() in ("1", "true", "si", "sí")
+
+# Campos de `schemas.Registro`, en el orden en que aparecen en la respuesta
+CAMPOS_REGISTRO = list(schemas.Registro.__fields__)
+
+
+def _a_json(contenido) -> bytes:
+    """Codifica a JSON compacto y UTF-8, igual que la respuesta JSON de FastAPI."""
+    if orjson is not None:
+        return orjson.dumps(contenido)
+    return json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _validador(esquema):
+    """Adaptador de pydantic 2 para validar listas de `esquema`, o None con pydantic 1."""
+    try:
+        from pydantic import TypeAdapter
+    except ImportError:
+        return None
+    return TypeAdapter(List[esquema])
+
+
+def serializar(datos, esquema) -> bytes:
+    """Serializa una lista de objetos ORM validándolos con su esquema de respuesta.
+
+    Equivale a devolver los objetos con `response_model=List[esquema]`: cada objeto se valida leyendo
+    sus atributos y se vuelca en modo JSON, así que el cuerpo es idéntico al de FastAPI también para
+    filas escritas fuera de la API. Ver tests/test_serializacion.py.
+
+    Args:
+        datos (list): Objetos del ORM (p. ej. `models.RegistroML`).
+        esquema (type): Esquema de pydantic de cada elemento de la respuesta.
+
+    Returns:
+        bytes: Cuerpo JSON compacto y UTF-8.
+
+    Raises:
+        pydantic.ValidationError: Si algún objeto no cumple el esquema (FastAPI responde 500).
+    """
+    validador = _validador(esquema)
+    if validador is None:
+        contenido = jsonable_encoder([esquema.from_orm(objeto) for objeto in datos])
+    else:
+        contenido = validador.dump_python(validador.validate_python(datos, from_attributes=True), mode="json")
+    return json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def serializar_filas(filas, campos: List[str]) -> bytes:
+    """Serializa tuplas de columnas (ver `crud.obtener_filas_registros`) como una lista de objetos JSON.
+
+    Args:
+        filas (list): Tuplas con los valores de `campos`, en ese orden.
+        campos (List[str]): Nombres de los campos, que serán las claves de cada objeto.
+
+    Returns:
+        bytes: Cuerpo JSON. Los valores no se validan: coincide con el de `serializar` para los
+               registros escritos por la API, no necesariamente para filas escritas por otra vía.
+    """
+    return _a_json([dict(zip(campos, fila)) for fila in filas])
+
+
+def campos_solicitados(fields: Optional[str]):
+    """Interpreta el parámetro `fields` (proyección de campos) de `GET /registros/`.
+
+    Los campos se devuelven sin repetir y en el orden de `schemas.Registro`, de modo que el orden en
+    que se pidan no cambia la respuesta (ni su entrada en la caché).
+
+    Args:
+        fields (str or None): Nombres de campos separados por comas, p. ej. "precio,enlace_articulo".
+
+    Returns:
+        List[str] or None: Campos pedidos, o None si no se pidió una proyección.
+
+    Raises:
+        HTTPException: 400 si algún campo no existe.
+    """
+    if fields is None:
+        return None
+    pedidos = {campo.strip() for campo in fields.split(",") if campo.strip()}
+    desconocidos = pedidos - set(CAMPOS_REGISTRO)
+    if desconocidos or not pedidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos en fields: {', '.join(sorted(desconocidos)) or '(vacío)'}. "
+                   f"Disponibles: {', '.join(CAMPOS_REGISTRO)}."
+        )
+    return [campo for campo in CAMPOS_REGISTRO if campo in pedidos]
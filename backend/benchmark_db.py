@@ -0,0 +1,183 @@
+# BENCHMARK DE LA CAPA DE BASE DE DATOS: SINCRÓNICA (psycopg2) VS. ASINCRÓNICA (asyncpg)
+#
+# Ejecuta la misma carga mixta con N clientes concurrentes sobre la base de datos configurada en `.env`:
+# cargas masivas con cambios de precio (`crear_registros_bulk`), páginas de registros (`obtener_registros`)
+# e historiales (`obtener_historial`). La ruta sincrónica corre en un pool de hilos, como los endpoints
+# `def` en el threadpool de FastAPI; la asincrónica, como corrutinas en un solo event loop. Ambas usan
+# las opciones de pool de `.env` (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, ...).
+#
+# Escribe artículos de prueba con item_id "BENCH..." y los borra al terminar: conviene ejecutarlo
+# sobre una base de datos de pruebas. Uso (desde la carpeta `backend`):
+#     python benchmark_db.py --clientes 50 --operaciones 2000 --modo ambos
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete, select
+
+from app import crud, models, schemas
+from app.db.connection import Base, SessionLocal, crear_motor_async, engine
+
+PREFIJO = "BENCH"
+
+
+def generar_registros(numeros):
+    """Genera registros de prueba para los números indicados, con un precio al azar entre tres posibles (provoca cambios)."""
+    return [
+        schemas.RegistroCreate(
+            item_id=f"{PREFIJO}{n}",
+            nombre_articulo=f"Artículo de prueba {n}",
+            precio=random.choice((1000, 1100, 1200)) * (n % 50 + 1),
+            calificacion_promedio=4.5,
+            cantidad_calificaciones=n % 100,
+            descripcion="Registro generado por benchmark_db.py",
+            enlace_articulo=f"https://articulo.mercadolibre.com.co/{PREFIJO}-{n}",
+        )
+        for n in numeros
+    ]
+
+
+def plan_operaciones(operaciones, tam_lote, universo, ids):
+    """Genera la secuencia de operaciones (tipo, argumento): 20 % cargas, 50 % páginas y 30 % historiales.
+
+    La misma secuencia se ejecuta en los dos modos, para que midan exactamente la misma carga.
+    """
+    plan = []
+    for _ in range(operaciones):
+        azar = random.random()
+        if azar < 0.2:
+            plan.append(("bulk", generar_registros(random.sample(range(universo), tam_lote))))
+        elif azar < 0.7:
+            plan.append(("pagina", random.choice(ids)))
+        else:
+            plan.append(("historial", random.choice(ids)))
+    return plan
+
+
+def resumir(nombre, latencias, errores, segundos):
+    """Imprime operaciones por segundo y percentiles de latencia de cada tipo de operación."""
+    total = sum(len(valores) for valores in latencias.values())
+    print(f"\n[{nombre}] {total} operaciones en {segundos:.2f} s -> {total / segundos:.1f} op/s | {errores} errores")
+    for tipo, valores in sorted(latencias.items()):
+        if not valores:
+            continue
+        valores = sorted(valores)
+        p95 = valores[int(len(valores) * 0.95) - 1] if len(valores) >= 20 else valores[-1]
+        print(f"  {tipo:<10} n={len(valores):<6} p50={statistics.median(valores) * 1000:8.2f} ms  "
+              f"p95={p95 * 1000:8.2f} ms  máx={valores[-1] * 1000:8.2f} ms")
+
+
+def correr_sync(plan, clientes):
+    """Ejecuta el plan con `clientes` hilos, cada operación con su propia sesión sincrónica."""
+    latencias = {"bulk": [], "pagina": [], "historial": []}
+    errores = 0
+
+    def operar(operacion):
+        tipo, argumento = operacion
+        inicio = time.perf_counter()
+        with SessionLocal() as db:
+            if tipo == "bulk":
+                crud.crear_registros_bulk(db, argumento)
+            elif tipo == "pagina":
+                crud.obtener_registros(db, limit=100, after_id=argumento)
+            else:
+                crud.obtener_historial(db, argumento)
+        return tipo, time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        for futuro in [executor.submit(operar, operacion) for operacion in plan]:
+            try:
+                tipo, segundos = futuro.result()
+                latencias[tipo].append(segundos)
+            except Exception as e:
+                errores += 1
+                print(f"Error: {type(e).__name__}: {e}")
+    return latencias, errores, time.perf_counter() - inicio
+
+
+async def correr_async(plan, clientes):
+    """Ejecuta el plan con `clientes` corrutinas concurrentes, cada operación con su propia `AsyncSession`."""
+    fabrica = crear_motor_async()
+    latencias = {"bulk": [], "pagina": [], "historial": []}
+    errores = 0
+    cola = asyncio.Queue()
+    for operacion in plan:
+        cola.put_nowait(operacion)
+
+    async def cliente():
+        nonlocal errores
+        while not cola.empty():
+            tipo, argumento = cola.get_nowait()
+            inicio = time.perf_counter()
+            try:
+                async with fabrica() as db:
+                    if tipo == "bulk":
+                        await crud.crear_registros_bulk_async(db, argumento)
+                    elif tipo == "pagina":
+                        await crud.obtener_registros_async(db, limit=100, after_id=argumento)
+                    else:
+                        await crud.obtener_historial_async(db, argumento)
+                latencias[tipo].append(time.perf_counter() - inicio)
+            except Exception as e:
+                errores += 1
+                print(f"Error: {type(e).__name__}: {e}")
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(clientes)))
+    return latencias, errores, time.perf_counter() - inicio
+
+
+def preparar(universo):
+    """Crea las tablas si faltan, carga todos los artículos de prueba y devuelve sus ids."""
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        for inicio in range(0, universo, 1000):
+            crud.crear_registros_bulk(db, generar_registros(range(inicio, min(inicio + 1000, universo))))
+        return db.execute(select(models.RegistroML.id).where(models.RegistroML.item_id.like(f"{PREFIJO}%"))).scalars().all()
+
+
+def limpiar():
+    """Borra los artículos de prueba y su historial."""
+    with SessionLocal() as db:
+        ids = select(models.RegistroML.id).where(models.RegistroML.item_id.like(f"{PREFIJO}%"))
+        db.execute(delete(models.SnapshotML).where(models.SnapshotML.registro_id.in_(ids)))
+        db.execute(delete(models.RegistroML).where(models.RegistroML.item_id.like(f"{PREFIJO}%")))
+        db.commit()
+
+
+async def main(args):
+    random.seed(args.semilla)
+    try:
+        ids = preparar(args.universo)
+        plan = plan_operaciones(args.operaciones, args.tam_lote, args.universo, ids)
+        if args.modo in ("sync", "ambos"):
+            resumir("sync (psycopg2 + hilos)", *correr_sync(plan, args.clientes))
+        if args.modo in ("async", "ambos"):
+            resumir("async (asyncpg)", *await correr_async(plan, args.clientes))
+    finally:
+        if not args.conservar:
+            limpiar()
+
+
+if __name__ == "__main__":
+    # Argumentos:
+    # --clientes     (int): Clientes concurrentes (default=50).
+    # --operaciones  (int): Operaciones por modo (default=2000).
+    # --tam_lote     (int): Registros por carga masiva (default=100).
+    # --universo     (int): Cantidad de artículos de prueba distintos (default=5000).
+    # --modo         (str): "sync", "async" o "ambos" (default=ambos).
+    # --semilla      (int): Semilla aleatoria, para repetir la misma carga (default=42).
+    # --conservar    (flag): No borrar los artículos de prueba al terminar.
+    parser = argparse.ArgumentParser(description="Benchmark de la capa de base de datos sincrónica vs. asincrónica.")
+    parser.add_argument("--clientes", type=int, default=50, help="Clientes concurrentes")
+    parser.add_argument("--operaciones", type=int, default=2000, help="Operaciones por modo")
+    parser.add_argument("--tam_lote", type=int, default=100, help="Registros por carga masiva")
+    parser.add_argument("--universo", type=int, default=5000, help="Cantidad de artículos de prueba distintos")
+    parser.add_argument("--modo", choices=["sync", "async", "ambos"], default="ambos", help="Capa a medir")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla aleatoria")
+    parser.add_argument("--conservar", action="store_true", help="No borrar los artículos de prueba al terminar")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+# BENCHMARK DE LA SERIALIZACIÓN DE GET /registros/: OBJETOS DEL ORM VS. TUPLAS + ORJSON
+#
+# Mide, sobre la base de datos configurada en `.env`, cuánto tarda en producirse el cuerpo JSON de
+# una página de registros con cada ruta de `app.serializacion`:
+#   - orm: objetos `RegistroML` completos, validados con `schemas.Registro` (`serializar`, la ruta por defecto).
+#   - filas: tuplas con todas las columnas, serializadas con orjson (`serializar_filas`).
+#   - proyeccion: tuplas con solo los campos de --fields (`?fields=...`).
+# Cada medición incluye la consulta y la serialización. Antes de medir verifica que "orm" y "filas"
+# producen exactamente los mismos bytes.
+#
+# Carga artículos de prueba con item_id "BENCH..." (ver `benchmark_db.py`) y los borra al terminar.
+# Uso (desde la carpeta `backend`):
+#     python benchmark_serializacion.py --limit 1000 --repeticiones 200
+import argparse
+import random
+import statistics
+import time
+
+from app import crud, schemas, serializacion
+from app.db.connection import SessionLocal
+from benchmark_db import limpiar, preparar
+
+
+def medir(nombre, producir, repeticiones):
+    """Ejecuta `producir` `repeticiones` veces e imprime la latencia (p50, p95) y el tamaño de la respuesta."""
+    latencias = []
+    cuerpo = b""
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        cuerpo = producir()
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    p50 = statistics.median(latencias)
+    p95 = latencias[max(0, int(len(latencias) * 0.95) - 1)]
+    print(f"  {nombre:<11} p50={p50 * 1000:8.2f} ms  p95={p95 * 1000:8.2f} ms  "
+          f"{len(cuerpo) / 1024:8.1f} KB  -> {1 / p50:7.1f} respuestas/s")
+    return p50
+
+
+def main(args):
+    random.seed(args.semilla)
+    campos = serializacion.campos_solicitados(args.fields)
+    try:
+        preparar(args.universo)
+        with SessionLocal() as db:
+            def ruta_orm():
+                registros = crud.obtener_registros(db, limit=args.limit)
+                cuerpo = serializacion.serializar(registros, schemas.Registro)
+                db.expunge_all()  # Como en la API, cada petición empieza con una sesión vacía
+                return cuerpo
+
+            def ruta_filas():
+                filas = crud.obtener_filas_registros(db, serializacion.CAMPOS_REGISTRO, limit=args.limit)
+                return serializacion.serializar_filas(filas, serializacion.CAMPOS_REGISTRO)
+
+            def ruta_proyeccion():
+                return serializacion.serializar_filas(crud.obtener_filas_registros(db, campos, limit=args.limit), campos)
+
+            identicas = ruta_orm() == ruta_filas()
+            print(f"\nPágina de {args.limit} registros | orjson: {'sí' if serializacion.orjson else 'no (json)'} | "
+                  f"respuestas idénticas orm/filas: {'sí' if identicas else 'NO'}")
+            base = medir("orm", ruta_orm, args.repeticiones)
+            rapida = medir("filas", ruta_filas, args.repeticiones)
+            proyeccion = medir("proyeccion", ruta_proyeccion, args.repeticiones)
+            print(f"  filas: {base / rapida:.1f}x más rápida | proyección ({','.join(campos)}): {base / proyeccion:.1f}x más rápida")
+    finally:
+        if not args.conservar:
+            limpiar()
+
+
+if __name__ == "__main__":
+    # Argumentos:
+    # --limit        (int): Registros por página (default=1000).
+    # --repeticiones (int): Respuestas generadas por cada ruta (default=200).
+    # --fields       (str): Campos de la ruta con proyección (default=precio,enlace_articulo).
+    # --universo     (int): Cantidad de artículos de prueba (default=5000).
+    # --semilla      (int): Semilla aleatoria (default=42).
+    # --conservar    (flag): No borrar los artículos de prueba al terminar.
+    parser = argparse.ArgumentParser(description="Benchmark de la serialización de GET /registros/.")
+    parser.add_argument("--limit", type=int, default=1000, help="Registros por página")
+    parser.add_argument("--repeticiones", type=int, default=200, help="Respuestas generadas por cada ruta")
+    parser.add_argument("--fields", default="precio,enlace_articulo", help="Campos de la ruta con proyección")
+    parser.add_argument("--universo", type=int, default=5000, help="Cantidad de artículos de prueba")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla aleatoria")
+    parser.add_argument("--conservar", action="store_true", help="No borrar los artículos de prueba al terminar")
+    main(parser.parse_args())
@@ -0,0 +1,231 @@
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+# Estados de una URL de artículo dentro de una ejecución
+PENDIENTE = "pendiente"      # Descubierta en un listado, aún sin descargar (o su descarga falló)
+COMPLETADA = "completada"    # Descargada y convertida en un registro
+DESCARTADA = "descartada"    # Descargada, pero sin los datos necesarios para armar un registro
+
+
+class BitacoraEjecucion:
+    """Bitácora persistente de una ejecución del scraper, guardada en un archivo SQLite.
+
+    Registra de forma incremental las URLs descubiertas, las descargas terminadas, los registros
+    limpios y cuáles ya se cargaron en la API, de modo que si el proceso se interrumpe se puede
+    reanudar la ejecución (`--reanudar <run_id>`) sin volver a descargar lo que ya se obtuvo.
+    Un mismo archivo guarda varias ejecuciones, identificadas por su `run_id`.
+
+    Se crea con `BitacoraEjecucion.nueva` o se abre una ejecución existente con `BitacoraEjecucion.abrir`.
+
+    Atributos:
+        ruta (str): Ruta del archivo SQLite de la bitácora.
+        run_id (str): Identificador de la ejecución.
+        terminos (list[dict]): Términos buscados en la ejecución (ver `scripts.automation.leer_terminos`).
+        parametros (dict): Opciones de la ejecución necesarias para reanudarla (por ejemplo, el modo).
+        estado (str): "en_curso" o "completada".
+    """
+
+    def __init__(self, ruta, run_id, terminos, parametros, estado):
+        self.ruta = ruta
+        self.run_id = run_id
+        self.terminos = terminos
+        self.parametros = parametros
+        self.estado = estado
+        self.conexion = _conectar(ruta)
+
+    @classmethod
+    def nueva(cls, ruta, terminos, parametros):
+        """Registra una nueva ejecución.
+
+        Args:
+            ruta (str): Ruta del archivo SQLite de la bitácora (se crea si no existe).
+            terminos (list[dict]): Términos que se van a buscar.
+            parametros (dict): Opciones de la ejecución que se deben conservar al reanudarla.
+
+        Returns:
+            BitacoraEjecucion: Bitácora de la ejecución, con un `run_id` basado en la fecha y hora.
+        """
+        conexion = _conectar(ruta)
+        base = datetime.now().strftime("%Y%m%d-%H%M%S")
+        run_id = base
+        sufijo = 1
+        while conexion.execute("SELECT 1 FROM ejecuciones WHERE run_id = ?", (run_id,)).fetchone():
+            sufijo += 1
+            run_id = f"{base}-{sufijo}"
+        ahora = time.time()
+        conexion.execute(
+            "INSERT INTO ejecuciones (run_id, terminos, parametros, estado, iniciada_en, actualizada_en) VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, json.dumps(terminos, ensure_ascii=False), json.dumps(parametros, ensure_ascii=False), "en_curso", ahora, ahora)
+        )
+        conexion.commit()
+        conexion.close()
+        return cls(ruta, run_id, terminos, parametros, "en_curso")
+
+    @classmethod
+    def abrir(cls, ruta, run_id):
+        """Abre una ejecución registrada para reanudarla.
+
+        Args:
+            ruta (str): Ruta del archivo SQLite de la bitácora.
+            run_id (str): Identificador de la ejecución.
+
+        Returns:
+            BitacoraEjecucion: Bitácora de la ejecución.
+
+        Raises:
+            ValueError: Si la ejecución no existe en la bitácora.
+        """
+        conexion = _conectar(ruta)
+        fila = conexion.execute(
+            "SELECT terminos, parametros, estado FROM ejecuciones WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        conexion.close()
+        if fila is None:
+            raise ValueError(f"No existe la ejecución '{run_id}' en la bitácora {ruta}")
+        terminos, parametros, estado = fila
+        return cls(ruta, run_id, json.loads(terminos), json.loads(parametros), estado)
+
+    def registrar_urls(self, urls, termino=None):
+        """Agrega las URLs descubiertas como pendientes (las ya registradas conservan su estado).
+
+        Args:
+            urls (list[str]): URLs de artículos a descargar.
+            termino (str, optional): Término de búsqueda con el que se descubrieron.
+
+        Returns:
+            None
+        """
+        self.conexion.executemany(
+            "INSERT OR IGNORE INTO urls (run_id, url, estado, termino) VALUES (?, ?, ?, ?)",
+            [(self.run_id, url, PENDIENTE, termino) for url in urls]
+        )
+        self._tocar()
+
+    def marcar_url(self, url, estado):
+        """Cambia el estado de una URL registrada (ver PENDIENTE, COMPLETADA y DESCARTADA); las demás se ignoran."""
+        self.conexion.execute(
+            "UPDATE urls SET estado = ? WHERE run_id = ? AND url = ?", (estado, self.run_id, url)
+        )
+        self._tocar()
+
+    def guardar_registro(self, registro, url=None):
+        """Guarda un registro limpio, pendiente de carga, y marca como completada la URL de la que se obtuvo.
+
+        Args:
+            registro (dict): Registro limpio (ver `scraping.scraper.limpiar_articulo`).
+            url (str, optional): URL descargada para obtenerlo (None si se armó desde el listado).
+
+        Returns:
+            None
+        """
+        self.conexion.execute(
+            "INSERT INTO registros (run_id, item_id, datos, subido) VALUES (?, ?, ?, 0) "
+            "ON CONFLICT(run_id, item_id) DO UPDATE SET datos = excluded.datos",
+            (self.run_id, registro["item_id"], json.dumps(registro, ensure_ascii=False))
+        )
+        if url is not None:
+            self.marcar_url(url, COMPLETADA)
+        else:
+            self._tocar()
+
+    def marcar_subidos(self, item_ids):
+        """Marca como cargados en la API (o ya existentes en ella) los registros indicados.
+
+        Args:
+            item_ids (iterable of str): IDs de los registros cargados.
+
+        Returns:
+            None
+        """
+        self.conexion.executemany(
+            "UPDATE registros SET subido = 1 WHERE run_id = ? AND item_id = ?",
+            [(self.run_id, item_id) for item_id in item_ids]
+        )
+        self._tocar()
+
+    def urls_pendientes(self):
+        """Devuelve las URLs descubiertas que aún no se descargaron con éxito."""
+        return list(self.terminos_pendientes())
+
+    def terminos_pendientes(self):
+        """Devuelve las URLs pendientes con el término de búsqueda con el que se descubrieron ({url: termino})."""
+        cursor = self.conexion.execute(
+            "SELECT url, termino FROM urls WHERE run_id = ? AND estado = ?", (self.run_id, PENDIENTE)
+        )
+        return dict(cursor.fetchall())
+
+    def urls_registradas(self):
+        """Devuelve todas las URLs descubiertas en la ejecución, en cualquier estado."""
+        cursor = self.conexion.execute("SELECT url FROM urls WHERE run_id = ?", (self.run_id,))
+        return [url for (url,) in cursor]
+
+    def item_ids_guardados(self):
+        """Devuelve los IDs de todos los registros guardados en la ejecución."""
+        cursor = self.conexion.execute("SELECT item_id FROM registros WHERE run_id = ?", (self.run_id,))
+        return {item_id for (item_id,) in cursor}
+
+    def registros_sin_subir(self):
+        """Devuelve los registros guardados que aún no se cargaron en la API."""
+        cursor = self.conexion.execute(
+            "SELECT datos FROM registros WHERE run_id = ? AND subido = 0", (self.run_id,)
+        )
+        return [json.loads(datos) for (datos,) in cursor]
+
+    def resumen(self):
+        """
+        Cuenta las URLs por estado y los registros guardados y subidos de la ejecución.
+
+        Returns:
+            dict: Cantidad de URLs en cada estado (PENDIENTE, COMPLETADA, DESCARTADA), más 'registros' y 'subidos'.
+        """
+        conteo = {PENDIENTE: 0, COMPLETADA: 0, DESCARTADA: 0}
+        conteo.update(self.conexion.execute(
+            "SELECT estado, COUNT(*) FROM urls WHERE run_id = ? GROUP BY estado", (self.run_id,)
+        ).fetchall())
+        registros, subidos = self.conexion.execute(
+            "SELECT COUNT(*), COALESCE(SUM(subido), 0) FROM registros WHERE run_id = ?", (self.run_id,)
+        ).fetchone()
+        conteo.update({"registros": registros, "subidos": subidos})
+        return conteo
+
+    def finalizar(self):
+        """Marca la ejecución como completada."""
+        self.estado = "completada"
+        self.conexion.execute("UPDATE ejecuciones SET estado = ? WHERE run_id = ?", (self.estado, self.run_id))
+        self._tocar()
+
+    def _tocar(self):
+        self.conexion.execute("UPDATE ejecuciones SET actualizada_en = ? WHERE run_id = ?", (time.time(), self.run_id))
+        self.conexion.commit()
+
+    def cerrar(self):
+        """Cierra la conexión con el archivo de la bitácora."""
+        self.conexion.close()
+
+
+def _conectar(ruta):
+    """Abre el archivo de la bitácora y crea sus tablas si no existen."""
+    conexion = sqlite3.connect(ruta)
+    # WAL con synchronous=NORMAL: cada commit es una escritura secuencial barata y lo ya confirmado
+    # sobrevive a que el proceso se interrumpa
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    conexion.execute(
+        "CREATE TABLE IF NOT EXISTS ejecuciones (run_id TEXT PRIMARY KEY, terminos TEXT NOT NULL, "
+        "parametros TEXT NOT NULL, estado TEXT NOT NULL, iniciada_en REAL NOT NULL, actualizada_en REAL NOT NULL)"
+    )
+    conexion.execute(
+        "CREATE TABLE IF NOT EXISTS urls (run_id TEXT NOT NULL, url TEXT NOT NULL, estado TEXT NOT NULL, "
+        "termino TEXT, PRIMARY KEY (run_id, url))"
+    )
+    # Bitácoras creadas antes de que se guardara el término de cada URL
+    if "termino" not in {columna[1] for columna in conexion.execute("PRAGMA table_info(urls)")}:
+        conexion.execute("ALTER TABLE urls ADD COLUMN termino TEXT")
+    conexion.execute(
+        "CREATE TABLE IF NOT EXISTS registros (run_id TEXT NOT NULL, item_id TEXT NOT NULL, datos TEXT NOT NULL, "
+        "subido INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (run_id, item_id))"
+    )
+    conexion.commit()
+    return conexion
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from scraping.config import DIRECTORIO_CACHE, TTL_CACHE, TAM_MAX_CACHE
+
+# Al superar el tamaño máximo se desalojan entradas hasta quedar en esta fracción del máximo,
+# para no desalojar en cada escritura
+FRACCION_DESALOJO = 0.9
+
+
+class CacheRespuestas:
+    """Caché en disco de las páginas descargadas, con vencimiento, revalidación y desalojo LRU.
+
+    Los cuerpos se guardan comprimidos con zlib en archivos cuyo nombre es el hash SHA-256 del
+    contenido (direccionados por contenido), de modo que páginas idénticas se guardan una sola vez.
+    Un índice SQLite relaciona cada URL con su archivo, sus validadores (ETag / Last-Modified) y
+    los momentos en que se guardó y se usó por última vez.
+
+    - Dentro de `ttl` segundos desde que se guardó, la página se entrega sin usar la red.
+    - Vencida, se revalida con If-None-Match / If-Modified-Since si el servidor entregó validadores;
+      un 304 renueva la entrada sin volver a descargar el cuerpo.
+    - En modo `replay` nunca se usa la red: se entrega lo que haya en la caché, aunque esté vencido,
+      lo que permite repetir el parseo y la limpieza de una ejecución de forma determinista.
+
+    Puede usarse desde el event loop y desde hilos (ruta sincrónica del scraper): el acceso al
+    índice se serializa con un lock.
+
+    Atributos:
+        directorio (str): Carpeta de la caché.
+        ttl (float): Segundos durante los que una entrada se considera vigente.
+        tam_max (int): Tamaño máximo en bytes (comprimidos) de los cuerpos guardados.
+        replay (bool): Si es True, la caché funciona sin conexión.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, ttl=TTL_CACHE, tam_max=TAM_MAX_CACHE, replay=False):
+        self.directorio = directorio
+        self.ttl = ttl
+        self.tam_max = tam_max
+        self.replay = replay
+        os.makedirs(directorio, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conexion = sqlite3.connect(os.path.join(directorio, "indice.sqlite3"), check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS respuestas ("
+            "url TEXT PRIMARY KEY, archivo TEXT NOT NULL, tamano INTEGER NOT NULL, etag TEXT, "
+            "last_modified TEXT, guardado_en REAL NOT NULL, usado_en REAL NOT NULL)"
+        )
+        self.conexion.execute("CREATE INDEX IF NOT EXISTS idx_usado_en ON respuestas(usado_en)")
+        self.conexion.commit()
+        self.tamano_total = self._calcular_tamano_total()
+
+    def _calcular_tamano_total(self):
+        fila = self.conexion.execute(
+            "SELECT COALESCE(SUM(tamano), 0) FROM (SELECT DISTINCT archivo, tamano FROM respuestas)"
+        ).fetchone()
+        return fila[0]
+
+    def _ruta(self, archivo):
+        return os.path.join(self.directorio, archivo[:2], archivo)
+
+    def obtener(self, url):
+        """
+        Busca la página de una URL en la caché.
+
+        Args:
+            url (str): URL de la página.
+
+        Returns:
+            dict or None: None si no está en la caché (o su archivo se perdió). Si está, un diccionario con
+                'cuerpo' (bytes), 'vigente' (bool, dentro del TTL), 'etag' y 'last_modified' (str o None).
+        """
+        with self._lock:
+            fila = self.conexion.execute(
+                "SELECT archivo, etag, last_modified, guardado_en FROM respuestas WHERE url = ?", (url,)
+            ).fetchone()
+            if fila is None:
+                return None
+            archivo, etag, last_modified, guardado_en = fila
+            try:
+                with open(self._ruta(archivo), "rb") as f:
+                    cuerpo = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                self.conexion.execute("DELETE FROM respuestas WHERE url = ?", (url,))
+                self.conexion.commit()
+                return None
+
+            self.conexion.execute("UPDATE respuestas SET usado_en = ? WHERE url = ?", (time.time(), url))
+            self.conexion.commit()
+            return {
+                "cuerpo": cuerpo,
+                "vigente": time.time() - guardado_en < self.ttl,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+
+    @staticmethod
+    def encabezados_revalidacion(entrada):
+        """
+        Construye los encabezados de una petición condicional a partir de una entrada vencida.
+
+        Args:
+            entrada (dict): Entrada devuelta por `obtener`.
+
+        Returns:
+            dict: If-None-Match y/o If-Modified-Since (vacío si el servidor no entregó validadores).
+        """
+        encabezados = {}
+        if entrada["etag"]:
+            encabezados["If-None-Match"] = entrada["etag"]
+        if entrada["last_modified"]:
+            encabezados["If-Modified-Since"] = entrada["last_modified"]
+        return encabezados
+
+    def guardar(self, url, cuerpo, etag=None, last_modified=None):
+        """
+        Guarda (o reemplaza) la página de una URL y desaloja las entradas menos usadas si se supera el tamaño máximo.
+
+        Args:
+            url (str): URL de la página.
+            cuerpo (bytes): Contenido descargado.
+            etag (str, optional): Encabezado ETag de la respuesta.
+            last_modified (str, optional): Encabezado Last-Modified de la respuesta.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            archivo = hashlib.sha256(cuerpo).hexdigest()
+            ruta = self._ruta(archivo)
+            if os.path.exists(ruta):
+                tamano = os.path.getsize(ruta)
+            else:
+                comprimido = zlib.compress(cuerpo, 6)
+                tamano = len(comprimido)
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                temporal = f"{ruta}.{os.getpid()}.tmp"
+                with open(temporal, "wb") as f:
+                    f.write(comprimido)
+                os.replace(temporal, ruta)
+                self.tamano_total += tamano
+
+            anterior = self.conexion.execute("SELECT archivo FROM respuestas WHERE url = ?", (url,)).fetchone()
+            ahora = time.time()
+            self.conexion.execute(
+                "INSERT INTO respuestas (url, archivo, tamano, etag, last_modified, guardado_en, usado_en) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET archivo = excluded.archivo, "
+                "tamano = excluded.tamano, etag = excluded.etag, last_modified = excluded.last_modified, "
+                "guardado_en = excluded.guardado_en, usado_en = excluded.usado_en",
+                (url, archivo, tamano, etag, last_modified, ahora, ahora)
+            )
+            if anterior and anterior[0] != archivo:
+                self._borrar_si_huerfano(anterior[0])
+            self.conexion.commit()
+
+            if self.tamano_total > self.tam_max:
+                self.desalojar()
+
+    def renovar(self, url):
+        """Marca como recién guardada una entrada revalidada con un 304 Not Modified."""
+        with self._lock:
+            ahora = time.time()
+            self.conexion.execute("UPDATE respuestas SET guardado_en = ?, usado_en = ? WHERE url = ?", (ahora, ahora, url))
+            self.conexion.commit()
+
+    def _borrar_si_huerfano(self, archivo):
+        """Borra el archivo de un cuerpo si ninguna URL lo referencia."""
+        if self.conexion.execute("SELECT 1 FROM respuestas WHERE archivo = ? LIMIT 1", (archivo,)).fetchone():
+            return
+        ruta = self._ruta(archivo)
+        try:
+            self.tamano_total -= os.path.getsize(ruta)
+            os.remove(ruta)
+        except OSError:
+            pass
+
+    def desalojar(self):
+        """
+        Elimina las entradas usadas hace más tiempo (LRU) hasta que la caché ocupe como máximo
+        FRACCION_DESALOJO de su tamaño máximo.
+
+        Returns:
+            int: Cantidad de entradas eliminadas.
+        """
+        with self._lock:
+            objetivo = self.tam_max * FRACCION_DESALOJO
+            eliminadas = 0
+            while self.tamano_total > objetivo:
+                filas = self.conexion.execute(
+                    "SELECT url, archivo FROM respuestas ORDER BY usado_en LIMIT 100"
+                ).fetchall()
+                if not filas:
+                    break
+                for url, archivo in filas:
+                    if self.tamano_total <= objetivo:
+                        break
+                    self.conexion.execute("DELETE FROM respuestas WHERE url = ?", (url,))
+                    self._borrar_si_huerfano(archivo)
+                    eliminadas += 1
+            self.conexion.commit()
+            return eliminadas
+
+    def cerrar(self):
+        """Cierra la conexión con el índice de la caché."""
+        self.conexion.close()
@@ -1,7 +1,38 @@
 # ARCHIVO CON LAS VARIABLES DE CONFIGURACIÓN DEL SCRAPER
 ARTICULO = "laptop" # Artículo a buscar
 MAX_PAGINAS = 1 # Número máximo de páginas a scrapear
-CONCURRENCY_LIMIT = 100 # Límite de concurrencia para las solicitudes con el Semaphore (controla cuan "agresivo" y rápido es el scraper)
+DOMINIO = "com.co" # Dominio del sitio de Mercado Libre donde se busca (com.co, com.ar, com.mx, ...)
+URL_LISTADO = "https://listado.mercadolibre.{dominio}" # Base de las páginas de resultados; se reemplaza para apuntar a un servidor local (ver scripts/servidor_simulado.py)
+CONCURRENCY_LIMIT = 100 # Límite máximo de solicitudes concurrentes; el control adaptativo (AIMD) nunca lo supera
+CONCURRENCIA_INICIAL = 10 # Concurrencia con la que arranca el control adaptativo antes de ajustarse a las respuestas del servidor
+CONCURRENCIA_MINIMA = 1 # Concurrencia mínima a la que puede bajar el control adaptativo ante 429, 5xx o timeouts
+LATENCIA_OBJETIVO = 2.0 # Segundos; si las respuestas tardan más, el control adaptativo deja de aumentar la concurrencia
+TASAS_POR_HOST = {"listado": 5.0, "articulo": 20.0, "click1": 20.0} # Máximo de peticiones por segundo por tipo de host (token bucket)
+RAFAGA_POR_HOST = 10 # Peticiones que se pueden hacer de golpe a un mismo tipo de host antes de aplicar su tasa
+TAM_COLA = 200 # Tamaño máximo de las colas del pipeline de scraping (backpressure: limita los artículos en memoria)
+TIPO_EXECUTOR_PARSEO = "proceso" # Pool donde se parsea el HTML fuera del event loop: "proceso" (usa todos los núcleos) o "hilo"
+WORKERS_PARSEO = None # Cantidad de workers de parseo (None = cantidad de núcleos de la máquina)
+PARSER_HTML = "bs4" # Backend de parseo de HTML: "bs4" (html.parser), "bs4-lxml" (lxml + SoupStrainer) o "selectolax" (el más rápido)
+LIMITE_CONEXIONES = 100 # Máximo de conexiones TCP abiertas en el pool HTTP compartido (scraping/transporte.py)
+LIMITE_CONEXIONES_POR_HOST = 50 # Máximo de conexiones TCP simultáneas a un mismo host
+TTL_CACHE_DNS = 300 # Segundos que se reutiliza la resolución DNS de un host
+KEEPALIVE_SEGUNDOS = 30 # Segundos que una conexión sin uso queda abierta para reutilizarla
+TAM_MAX_RESPUESTA = 10 * 1024 * 1024 # Tamaño máximo (bytes) de una página descargada; las más grandes se descartan
+DIRECTORIO_CACHE = "cache_http" # Carpeta de la caché en disco de páginas descargadas (opcional, ver scraping/cache.py)
+TTL_CACHE = 3600 # Segundos durante los que una página guardada en la caché se usa sin volver a consultar el servidor
+TAM_MAX_CACHE = 500 * 1024 * 1024 # Tamaño máximo (bytes comprimidos) de la caché; se desalojan las páginas usadas hace más tiempo
+MAX_REINTENTOS = 3 # Reintentos por página ante fallos transitorios (timeout, conexión, 429, 5xx)
+ESPERA_BASE_REINTENTO = 1.0 # Segundos de espera base del backoff exponencial entre reintentos (con jitter)
+ESPERA_MAXIMA_REINTENTO = 30.0 # Máximo de segundos de espera entre reintentos
+RESULTADOS_POR_PAGINA = 50 # Cantidad de artículos que Mercado Libre muestra en cada página de resultados
+RUTA_INDICE = "indice_articulos.sqlite3" # Índice local de artículos ya almacenados, por item_id (modo --solo_nuevos)
+RUTA_BITACORA = "bitacora_ejecuciones.sqlite3" # Bitácora de las ejecuciones (URLs, registros y cargas) para reanudarlas con --reanudar
+DIRECTORIO_SALIDA = "backups" # Carpeta donde se escriben los registros limpios (CSV o dataset Parquet, ver scraping/salidas.py)
+TAM_GRUPO_PARQUET = 5000 # Registros por grupo de filas (row group) de cada archivo Parquet; se mantienen en memoria hasta escribirse
+MAX_ESCRITORES_PARQUET = 64 # Máximo de archivos Parquet abiertos a la vez (uno por término y fecha)
+RESPETAR_ROBOTS = True # Consultar el robots.txt de cada sitio antes de descargar y omitir las URLs que prohíbe (ver scraping/robots.py)
+RUTA_CACHE_ROBOTS = "robots_cache.json" # Archivo donde se guardan los robots.txt descargados
+TTL_ROBOTS = 24 * 3600 # Segundos durante los que un robots.txt guardado se usa sin volver a descargarlo
 
 # cabecera de la solicitud
 # User-Agent y otros encabezados para simular un navegador web
@@ -0,0 +1,105 @@
+import sqlite3
+import time
+
+# Máximo de parámetros por consulta (SQLite antiguo admite hasta 999 variables por sentencia)
+TAM_CONSULTA = 500
+
+
+class IndiceArticulos:
+    """Índice local y persistente de los artículos ya conocidos, guardado en un archivo SQLite.
+
+    Permite descartar artículos ya almacenados antes de descargar su página, sin consultar la API
+    por cada ejecución. Las claves son los IDs de Mercado Libre (p. ej. MCO1234567), no los enlaces,
+    que cambian entre ejecuciones cuando son redirects de seguimiento. Cada clave guarda el momento en que se vio por última vez, para poder forzar
+    una nueva descarga de los artículos cuyo dato tiene más de cierta antigüedad.
+
+    Atributos:
+        ruta (str): Ruta del archivo SQLite del índice.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS articulos (item_id TEXT PRIMARY KEY, visto_en REAL NOT NULL)"
+        )
+        self.conexion.commit()
+
+    def vistos_en(self, item_ids):
+        """Devuelve el momento en que se vio por última vez cada artículo conocido.
+
+        Args:
+            item_ids (list[str]): IDs de Mercado Libre a buscar.
+
+        Returns:
+            dict: {item_id: timestamp (float)} solo para los artículos presentes en el índice.
+        """
+        item_ids = list(item_ids)
+        encontrados = {}
+        for i in range(0, len(item_ids), TAM_CONSULTA):
+            bloque = item_ids[i:i + TAM_CONSULTA]
+            marcadores = ",".join("?" * len(bloque))
+            cursor = self.conexion.execute(
+                f"SELECT item_id, visto_en FROM articulos WHERE item_id IN ({marcadores})", bloque
+            )
+            encontrados.update(cursor.fetchall())
+        return encontrados
+
+    def conocidos(self, item_ids, max_edad_dias=None):
+        """Filtra los artículos que están en el índice y no han vencido.
+
+        Args:
+            item_ids (list[str]): IDs de Mercado Libre a verificar.
+            max_edad_dias (float, optional): Antigüedad máxima en días. Los artículos vistos hace más
+                tiempo no se consideran conocidos, para que se vuelvan a descargar. None = sin vencimiento.
+
+        Returns:
+            set: IDs conocidos y vigentes.
+        """
+        vistos = self.vistos_en(item_ids)
+        if max_edad_dias is None:
+            return set(vistos)
+        limite = time.time() - max_edad_dias * 86400
+        return {item_id for item_id, visto_en in vistos.items() if visto_en >= limite}
+
+    def registrar(self, item_ids, visto_en=None):
+        """Agrega los artículos al índice o actualiza el momento en que se vieron.
+
+        Args:
+            item_ids (iterable of str): IDs de Mercado Libre a registrar.
+            visto_en (float, optional): Timestamp a guardar. Por defecto, el momento actual.
+
+        Returns:
+            None
+        """
+        visto_en = time.time() if visto_en is None else visto_en
+        self.conexion.executemany(
+            "INSERT INTO articulos (item_id, visto_en) VALUES (?, ?) "
+            "ON CONFLICT(item_id) DO UPDATE SET visto_en = excluded.visto_en",
+            [(item_id, visto_en) for item_id in item_ids]
+        )
+        self.conexion.commit()
+
+    def registrar_faltantes(self, item_ids, visto_en=None):
+        """Agrega al índice solo los artículos que no están en él, sin cambiar el momento en que se vieron los demás.
+
+        Se usa para los artículos que la API informa como existentes: que estén almacenados no dice
+        cuándo se descargaron, así que no deben renovar la antigüedad de una entrada del índice.
+
+        Args:
+            item_ids (iterable of str): IDs de Mercado Libre a agregar.
+            visto_en (float, optional): Timestamp de las entradas nuevas. Por defecto, el momento actual.
+
+        Returns:
+            None
+        """
+        visto_en = time.time() if visto_en is None else visto_en
+        self.conexion.executemany(
+            "INSERT INTO articulos (item_id, visto_en) VALUES (?, ?) ON CONFLICT(item_id) DO NOTHING",
+            [(item_id, visto_en) for item_id in item_ids]
+        )
+        self.conexion.commit()
+
+    def cerrar(self):
+        """Cierra la conexión con el archivo del índice."""
+        self.conexion.close()
@@ -0,0 +1,205 @@
+# CONTROL ADAPTATIVO DE CONCURRENCIA Y LÍMITE DE PETICIONES POR HOST
+#
+# Reemplaza al asyncio.Semaphore fijo del scraper. La concurrencia se ajusta con AIMD
+# (aumento aditivo / reducción multiplicativa, como el control de congestión de TCP):
+# crece de a poco mientras las respuestas son rápidas y exitosas, y se reduce a la mitad
+# ante un 429, un 5xx o un timeout. Además, cada tipo de host tiene un token bucket que
+# limita las peticiones por segundo, de modo que una ráfaga de artículos no dispare el
+# bloqueo de los listados (y viceversa).
+import asyncio
+import collections
+import time
+from urllib.parse import urlsplit
+
+from scraping.config import CONCURRENCIA_INICIAL, CONCURRENCIA_MINIMA, CONCURRENCY_LIMIT, LATENCIA_OBJETIVO, TASAS_POR_HOST, RAFAGA_POR_HOST
+
+# Factor por el que se multiplica la concurrencia (y la tasa del host) ante una señal de sobrecarga
+FACTOR_REDUCCION = 0.5
+# Fracción de la tasa configurada por debajo de la cual no se reduce la tasa de un host
+TASA_MINIMA_RELATIVA = 0.1
+
+
+def clasificar_host(url):
+    """
+    Clasifica una URL según el tipo de host de Mercado Libre al que apunta.
+
+    Args:
+        url (str): URL a clasificar.
+
+    Returns:
+        str: "listado" (listado.mercadolibre...), "click1" (redirects de seguimiento)
+             o "articulo" (cualquier otro host, incluidas las páginas de producto).
+    """
+    host = urlsplit(url).hostname or ""
+    if host.startswith("listado."):
+        return "listado"
+    if host.startswith("click1."):
+        return "click1"
+    return "articulo"
+
+
+def es_sobrecarga(estado):
+    """Indica si el resultado de una descarga es una señal de que el servidor está saturado o limitando."""
+    return estado in ("timeout", "conexion") or estado == 429 or (isinstance(estado, int) and estado >= 500)
+
+
+class CuboTokens:
+    """Token bucket: permite hasta `tasa` peticiones por segundo con ráfagas de hasta `capacidad`.
+
+    La tasa se reduce a la mitad cuando el host responde 429 y se recupera gradualmente con cada
+    respuesta exitosa, hasta la tasa configurada.
+
+    Atributos:
+        tasa_base (float): Tasa configurada (peticiones por segundo).
+        tasa (float): Tasa actual.
+        capacidad (float): Máximo de tokens acumulables.
+    """
+
+    def __init__(self, tasa, capacidad):
+        self.tasa_base = tasa
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self.tokens = capacidad
+        self.actualizado = time.monotonic()
+        self._turno = asyncio.Lock()
+
+    def _recargar(self):
+        ahora = time.monotonic()
+        self.tokens = min(self.capacidad, self.tokens + (ahora - self.actualizado) * self.tasa)
+        self.actualizado = ahora
+
+    async def consumir(self):
+        """Espera hasta que haya un token disponible y lo consume (las esperas se atienden en orden)."""
+        async with self._turno:
+            self._recargar()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.tasa)
+                self._recargar()
+            self.tokens -= 1
+
+    def reducir(self):
+        """Reduce la tasa a la mitad, sin bajar de TASA_MINIMA_RELATIVA de la tasa configurada."""
+        self._recargar()
+        self.tasa = max(self.tasa_base * TASA_MINIMA_RELATIVA, self.tasa * FACTOR_REDUCCION)
+
+    def recuperar(self):
+        """Aumenta la tasa en un 1% de la configurada, sin superarla."""
+        if self.tasa < self.tasa_base:
+            self._recargar()
+            self.tasa = min(self.tasa_base, self.tasa + self.tasa_base * 0.01)
+
+
+class LimitadorAdaptativo:
+    """Limitador de concurrencia AIMD con token buckets por tipo de host.
+
+    Se usa igual que un `asyncio.Semaphore` (`async with limitador:`), pero la cantidad de cupos
+    cambia según el resultado de las descargas, que se informa con `registrar`. `descargar_html`
+    (en `scraping.scraper`) hace ambas cosas automáticamente y además respeta el token bucket
+    del host con `esperar_turno`.
+
+    - Respuesta exitosa con latencia <= `latencia_objetivo`: la concurrencia sube 1/limite
+      (aproximadamente +1 por cada "ventana" de `limite` respuestas).
+    - 429, 5xx, timeout o error de conexión: la concurrencia se multiplica por FACTOR_REDUCCION,
+      como máximo una vez por cada `latencia_objetivo` segundos (una sola ráfaga de errores no la
+      lleva al mínimo). Un 429 también reduce la tasa del host que lo respondió.
+    - Respuesta lenta u otros códigos (404, etc.): la concurrencia se mantiene.
+
+    Atributos:
+        limite (float): Concurrencia actual (se usan int(limite) cupos).
+        minimo (int): Concurrencia mínima.
+        maximo (int): Concurrencia máxima.
+        latencia_objetivo (float): Latencia (segundos) por encima de la cual no se aumenta la concurrencia.
+        cubos (dict): Token bucket de cada tipo de host.
+    """
+
+    def __init__(self, inicial=CONCURRENCIA_INICIAL, minimo=CONCURRENCIA_MINIMA, maximo=CONCURRENCY_LIMIT,
+                 latencia_objetivo=LATENCIA_OBJETIVO, tasas=TASAS_POR_HOST, rafaga=RAFAGA_POR_HOST):
+        self.minimo = max(1, minimo)
+        self.maximo = max(self.minimo, maximo)
+        self.limite = float(min(max(inicial, self.minimo), self.maximo))
+        self.latencia_objetivo = latencia_objetivo
+        self.cubos = {tipo: CuboTokens(tasa, rafaga) for tipo, tasa in tasas.items()}
+        self.en_uso = 0
+        self.respuestas = collections.Counter()
+        self._esperando = collections.deque()
+        self._ultima_reduccion = 0.0
+
+    async def __aenter__(self):
+        while self.en_uso >= int(self.limite):
+            futuro = asyncio.get_running_loop().create_future()
+            self._esperando.append(futuro)
+            try:
+                await futuro
+            except asyncio.CancelledError:
+                if futuro in self._esperando:
+                    self._esperando.remove(futuro)
+                else:
+                    self._despertar()  # El cupo que se le asignó pasa al siguiente en espera
+                raise
+        self.en_uso += 1
+        return self
+
+    async def __aexit__(self, tipo_excepcion, excepcion, traceback):
+        self.en_uso -= 1
+        self._despertar()
+
+    def _despertar(self):
+        libres = int(self.limite) - self.en_uso
+        while libres > 0 and self._esperando:
+            futuro = self._esperando.popleft()
+            if not futuro.done():
+                futuro.set_result(None)
+                libres -= 1
+
+    async def esperar_turno(self, url):
+        """Espera a que el token bucket del host de `url` permita una nueva petición."""
+        cubo = self.cubos.get(clasificar_host(url))
+        if cubo is not None:
+            await cubo.consumir()
+
+    def registrar(self, url, estado, latencia):
+        """
+        Informa el resultado de una descarga y ajusta la concurrencia y la tasa del host.
+
+        Args:
+            url (str): URL descargada.
+            estado (int or str): Código HTTP de la respuesta, o "timeout" / "conexion" si no hubo respuesta.
+            latencia (float): Duración de la petición en segundos.
+
+        Returns:
+            None
+        """
+        self.respuestas[estado] += 1
+        cubo = self.cubos.get(clasificar_host(url))
+
+        if es_sobrecarga(estado):
+            ahora = time.monotonic()
+            if ahora - self._ultima_reduccion >= self.latencia_objetivo:
+                self.limite = max(self.minimo, self.limite * FACTOR_REDUCCION)
+                self._ultima_reduccion = ahora
+            if estado == 429 and cubo is not None:
+                cubo.reducir()
+        elif isinstance(estado, int) and estado < 400:
+            if latencia <= self.latencia_objetivo:
+                self.limite = min(self.maximo, self.limite + 1 / self.limite)
+            if cubo is not None:
+                cubo.recuperar()
+        self._despertar()
+
+    def estado(self):
+        """
+        Devuelve los límites actuales para monitorear el comportamiento del scraper.
+
+        Returns:
+            dict: Concurrencia actual, mínima y máxima, cupos en uso, tareas en espera, tasa actual
+                  de cada tipo de host (peticiones por segundo) y cantidad de respuestas por código.
+        """
+        return {
+            "concurrencia": int(self.limite),
+            "concurrencia_minima": self.minimo,
+            "concurrencia_maxima": self.maximo,
+            "en_uso": self.en_uso,
+            "esperando": len(self._esperando),
+            "tasas": {tipo: round(cubo.tasa, 2) for tipo, cubo in self.cubos.items()},
+            "respuestas": dict(self.respuestas),
+        }
@@ -0,0 +1,85 @@
+# MÉTRICAS DEL SCRAPER POR ETAPA (CONTADORES E HISTOGRAMAS ESTILO PROMETHEUS)
+#
+# Cada etapa del pipeline cuenta sus resultados y mide su latencia en un registro propio del proceso:
+#   - Descubrimiento: páginas de resultados obtenidas, vacías o perdidas, y su duración.
+#   - Descarga: respuestas por tipo de host y código (o "cache", "timeout", "conexion", ...) y su latencia.
+#   - Parseo: artículos con todos los campos o con algún campo faltante, y su duración.
+#   - Limpieza: registros válidos y descartados por motivo.
+#   - Carga: registros insertados, actualizados, sin cambios o con error, y la duración de cada lote.
+# Se registran siempre en el proceso principal (el parseo se mide al volver del pool de workers).
+# Al final de una ejecución el registro se puede volcar a un archivo de texto en el formato de
+# exposición de Prometheus (ver `escribir_snapshot`), apto para el textfile collector de node_exporter.
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, write_to_textfile
+
+# Registro propio (no el global de prometheus_client), para volcar solo las métricas del scraper
+REGISTRO = CollectorRegistry()
+
+# Límites de los histogramas, en segundos
+BUCKETS_DESCARGA = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+BUCKETS_PARSEO = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+BUCKETS_LOTE = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PAGINAS_LISTADO = Counter(
+    "scraper_paginas_listado", "Páginas de resultados procesadas, por resultado (ok, vacia, fallo)",
+    ["resultado"], registry=REGISTRO
+)
+DURACION_LISTADO = Histogram(
+    "scraper_pagina_listado_segundos", "Duración de cada página de resultados (descarga, reintentos y parseo)",
+    buckets=BUCKETS_DESCARGA, registry=REGISTRO
+)
+DESCARGAS = Counter(
+    "scraper_descargas", "Descargas por tipo de host y estado (código HTTP, cache, timeout, conexion, ...)",
+    ["host", "estado"], registry=REGISTRO
+)
+DURACION_DESCARGA = Histogram(
+    "scraper_descarga_segundos", "Latencia de las descargas hechas por la red, por tipo de host",
+    ["host"], buckets=BUCKETS_DESCARGA, registry=REGISTRO
+)
+REINTENTOS = Counter(
+    "scraper_reintentos", "Reintentos programados, por tipo de fallo",
+    ["fallo"], registry=REGISTRO
+)
+DESCARTES = Counter(
+    "scraper_descartes", "URLs descartadas definitivamente, por tipo de fallo",
+    ["fallo"], registry=REGISTRO
+)
+PARSEOS = Counter(
+    "scraper_parseos", "Artículos parseados, por resultado (ok, campo_faltante)",
+    ["resultado"], registry=REGISTRO
+)
+DURACION_PARSEO = Histogram(
+    "scraper_parseo_segundos", "Duración del parseo de cada artículo, incluida la espera del pool de workers",
+    buckets=BUCKETS_PARSEO, registry=REGISTRO
+)
+LIMPIEZA = Counter(
+    "scraper_limpieza", "Registros limpiados, por resultado (ok, vacio, formato_invalido, incompleto)",
+    ["resultado"], registry=REGISTRO
+)
+SUBIDAS = Counter(
+    "scraper_subida_registros", "Registros enviados a la API, por resultado (insertado, actualizado, sin_cambios, error)",
+    ["resultado"], registry=REGISTRO
+)
+DURACION_LOTE = Histogram(
+    "scraper_subida_lote_segundos", "Duración de cada petición de carga masiva a la API",
+    buckets=BUCKETS_LOTE, registry=REGISTRO
+)
+
+
+def escribir_snapshot(ruta):
+    """
+    Vuelca el estado actual de las métricas del scraper a un archivo de texto (formato de exposición de Prometheus).
+
+    El archivo se escribe en uno temporal y se renombra, así que quien lo lea nunca ve un volcado a medias.
+
+    Args:
+        ruta (str): Ruta del archivo; para el textfile collector de node_exporter debe terminar en `.prom`.
+
+    Returns:
+        None
+    """
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    write_to_textfile(ruta, REGISTRO)
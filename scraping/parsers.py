@@ -0,0 +1,292 @@
+# BACKENDS DE PARSEO DE HTML PARA LAS PÁGINAS DE MERCADO LIBRE
+#
+# Todos los backends entregan exactamente los mismos diccionarios; solo cambia la
+# librería usada para analizar el HTML. Las dependencias opcionales (lxml, selectolax)
+# se importan al usar el backend, de modo que "bs4" funciona sin ellas.
+
+# Clases CSS de los nodos que se leen en la página de un artículo
+CLASES_ARTICULO = {
+    "ui-pdp-title",
+    "andes-money-amount__fraction",
+    "ui-pdp-review__rating",
+    "ui-pdp-review__amount",
+    "ui-vpp-highlighted-specs__features-list-item",
+}
+
+# Clases CSS de los nodos que se leen en una página de resultados
+CLASES_LISTADO = {
+    "poly-card",
+    "ui-search-search-result__quantity-results",
+}
+
+
+def _tarjeta(nombre_articulo, precio, calificacion_promedio, cantidad_calificaciones, enlace):
+    """Arma los datos de una tarjeta del listado con las mismas claves que `parsear_articulo`.
+
+    La descripción no aparece en las tarjetas, por lo que queda vacía.
+    """
+    return {
+        "nombre_articulo": nombre_articulo,
+        "precio": precio,
+        "calificacion_promedio": calificacion_promedio,
+        "cantidad_calificaciones": cantidad_calificaciones,
+        "descripcion": "",
+        "enlace_articulo": enlace,
+        "enlace_canonico": None
+    }
+
+
+def _total_desde_texto(texto):
+    """Convierte un texto como "1.234 resultados" en el entero 1234 (o None si no tiene dígitos)."""
+    digitos = "".join(c for c in texto if c.isdigit())
+    return int(digitos) if digitos else None
+
+
+class ParserBS4:
+    """Parser basado en BeautifulSoup con el analizador `html.parser` de la librería estándar.
+
+    Construye el árbol completo del documento. Es el backend original del scraper y no requiere
+    dependencias adicionales.
+    """
+    nombre = "bs4"
+
+    def _soup(self, html, clases):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "html.parser")
+
+    def parsear_articulo(self, html, url):
+        """Extrae los datos de la página de un artículo.
+
+        Args:
+            html (bytes or str): Código HTML de la página del artículo.
+            url (str): URL del artículo.
+
+        Returns:
+            dict or None: Datos del artículo, o None si falta alguno de los campos obligatorios.
+        """
+        try:
+            soup = self._soup(html, CLASES_ARTICULO)
+
+            nombre_articulo = soup.find("h1", {"class": "ui-pdp-title"}).text
+            precio = soup.find("span", {"class": "andes-money-amount__fraction"}).text
+            calificacion_promedio = soup.find("span", {"class": "ui-pdp-review__rating"}).text
+            cantidad_calificaciones = soup.find("span", {"class": "ui-pdp-review__amount"}).text
+            caracteristicas = soup.find_all("li", class_="ui-vpp-highlighted-specs__features-list-item")
+            descripcion = " | ".join(c.text.strip() for c in caracteristicas)
+        except AttributeError:
+            return None
+        canonico = soup.find("link", rel="canonical")
+
+        return {
+            "nombre_articulo": nombre_articulo,
+            "precio": precio,
+            "calificacion_promedio": calificacion_promedio,
+            "cantidad_calificaciones": cantidad_calificaciones,
+            "descripcion": descripcion,
+            "enlace_articulo": url,
+            "enlace_canonico": canonico.get("href") if canonico else None
+        }
+
+    def parsear_listado(self, html):
+        """Extrae los enlaces de los artículos y el total de resultados de una página de listado.
+
+        Args:
+            html (bytes or str): Código HTML de la página de resultados.
+
+        Returns:
+            tuple: (bool hay_articulos, list enlaces, int or None total_resultados)
+        """
+        hay_articulos, tarjetas, total_resultados = self.parsear_tarjetas(html)
+        return hay_articulos, [tarjeta["enlace_articulo"] for tarjeta in tarjetas], total_resultados
+
+    def parsear_tarjetas(self, html):
+        """Extrae los datos de cada tarjeta (`poly-card`) de una página de listado.
+
+        Las tarjetas muestran el título, el precio y, si el artículo tiene opiniones, la calificación
+        y la cantidad de calificaciones. Los campos que no aparecen quedan en None.
+
+        Args:
+            html (bytes or str): Código HTML de la página de resultados.
+
+        Returns:
+            tuple: (bool hay_articulos, list de dict con las claves de `parsear_articulo`, int or None total_resultados).
+                   Se omiten las tarjetas sin enlace.
+        """
+        soup = self._soup(html, CLASES_LISTADO)
+
+        total_resultados = None
+        cantidad = soup.find("span", class_="ui-search-search-result__quantity-results")
+        if cantidad:
+            total_resultados = _total_desde_texto(cantidad.text)
+
+        articulos = soup.find_all("div", class_="poly-card")
+        if not articulos:
+            return False, [], total_resultados
+
+        tarjetas = []
+        for item in articulos:
+            enlace = item.find("a", class_="poly-component__title")
+            if not (enlace and enlace.get("href")):
+                continue
+            precio_actual = item.find(class_="poly-price__current")
+            precio = precio_actual.find("span", class_="andes-money-amount__fraction") if precio_actual else None
+            calificacion = item.find("span", class_="poly-reviews__rating")
+            total = item.find("span", class_="poly-reviews__total")
+            tarjetas.append(_tarjeta(
+                enlace.text,
+                precio.text if precio else None,
+                calificacion.text if calificacion else None,
+                total.text if total else None,
+                enlace["href"]
+            ))
+        return True, tarjetas, total_resultados
+
+
+def _valor_atributo(valor):
+    """Une en un texto los atributos multivaluados (class, rel), que según la versión de bs4 llegan como lista."""
+    if isinstance(valor, (list, tuple)):
+        return " ".join(valor)
+    return valor or ""
+
+
+def _filtro_nodos(clases):
+    """Crea un SoupStrainer que conserva los nodos con alguna de las `clases` y el <link rel="canonical">.
+
+    Un SoupStrainer normal solo combina sus reglas con AND; aquí se necesita un OR entre la regla
+    de clases y la del enlace canónico, por eso se redefinen los métodos que consulta el parser.
+    """
+    from bs4 import SoupStrainer
+
+    class FiltroNodos(SoupStrainer):
+        def _conservar(self, nombre, attrs):
+            attrs = attrs or {}
+            if not clases.isdisjoint(_valor_atributo(attrs.get("class")).split()):
+                return True
+            return nombre == "link" and _valor_atributo(attrs.get("rel")) == "canonical"
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            # bs4 >= 4.13
+            return self._conservar(name, attrs)
+
+        def allow_string_creation(self, string):
+            # bs4 >= 4.13: los textos sueltos fuera de los nodos conservados se descartan
+            return False
+
+        def search_tag(self, markup_name=None, markup_attrs={}):
+            # bs4 < 4.13
+            return self._conservar(markup_name, dict(markup_attrs))
+
+    return FiltroNodos()
+
+
+class ParserBS4Lxml(ParserBS4):
+    """Parser BeautifulSoup con el analizador `lxml` (escrito en C) y un `SoupStrainer`.
+
+    El strainer hace que solo se construyan en el árbol los nodos con las clases que se leen
+    (y sus descendientes) y el enlace canónico, en lugar del documento completo. Requiere `lxml`.
+    """
+    nombre = "bs4-lxml"
+
+    def _soup(self, html, clases):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "lxml", parse_only=_filtro_nodos(clases))
+
+
+class ParserSelectolax:
+    """Parser basado en selectores CSS con `selectolax` (motor lexbor, escrito en C).
+
+    No construye objetos Python por cada nodo del documento, solo por los nodos consultados,
+    por lo que es el backend más rápido. Requiere `selectolax`.
+    """
+    nombre = "selectolax"
+
+    def _arbol(self, html):
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser(html)
+
+    def parsear_articulo(self, html, url):
+        """Extrae los datos de la página de un artículo (ver `ParserBS4.parsear_articulo`)."""
+        arbol = self._arbol(html)
+
+        nodos = [
+            arbol.css_first("h1.ui-pdp-title"),
+            arbol.css_first("span.andes-money-amount__fraction"),
+            arbol.css_first("span.ui-pdp-review__rating"),
+            arbol.css_first("span.ui-pdp-review__amount"),
+        ]
+        if any(nodo is None for nodo in nodos):
+            return None
+        nombre_articulo, precio, calificacion_promedio, cantidad_calificaciones = (nodo.text() for nodo in nodos)
+        caracteristicas = arbol.css("li.ui-vpp-highlighted-specs__features-list-item")
+        descripcion = " | ".join(c.text().strip() for c in caracteristicas)
+        canonico = arbol.css_first('link[rel="canonical"]')
+
+        return {
+            "nombre_articulo": nombre_articulo,
+            "precio": precio,
+            "calificacion_promedio": calificacion_promedio,
+            "cantidad_calificaciones": cantidad_calificaciones,
+            "descripcion": descripcion,
+            "enlace_articulo": url,
+            "enlace_canonico": canonico.attributes.get("href") if canonico is not None else None
+        }
+
+    def parsear_listado(self, html):
+        """Extrae enlaces y total de resultados de un listado (ver `ParserBS4.parsear_listado`)."""
+        hay_articulos, tarjetas, total_resultados = self.parsear_tarjetas(html)
+        return hay_articulos, [tarjeta["enlace_articulo"] for tarjeta in tarjetas], total_resultados
+
+    def parsear_tarjetas(self, html):
+        """Extrae los datos de las tarjetas de un listado (ver `ParserBS4.parsear_tarjetas`)."""
+        arbol = self._arbol(html)
+
+        total_resultados = None
+        cantidad = arbol.css_first("span.ui-search-search-result__quantity-results")
+        if cantidad is not None:
+            total_resultados = _total_desde_texto(cantidad.text())
+
+        articulos = arbol.css("div.poly-card")
+        if not articulos:
+            return False, [], total_resultados
+
+        tarjetas = []
+        for item in articulos:
+            enlace = item.css_first("a.poly-component__title")
+            if enlace is None or not enlace.attributes.get("href"):
+                continue
+            precio = item.css_first(".poly-price__current span.andes-money-amount__fraction")
+            calificacion = item.css_first("span.poly-reviews__rating")
+            total = item.css_first("span.poly-reviews__total")
+            tarjetas.append(_tarjeta(
+                enlace.text(),
+                precio.text() if precio is not None else None,
+                calificacion.text() if calificacion is not None else None,
+                total.text() if total is not None else None,
+                enlace.attributes["href"]
+            ))
+        return True, tarjetas, total_resultados
+
+
+PARSERS = {
+    ParserBS4.nombre: ParserBS4(),
+    ParserBS4Lxml.nombre: ParserBS4Lxml(),
+    ParserSelectolax.nombre: ParserSelectolax(),
+}
+
+
+def obtener_parser(nombre):
+    """Devuelve la instancia del backend de parseo con el nombre indicado.
+
+    Args:
+        nombre (str): Nombre del backend ("bs4", "bs4-lxml" o "selectolax").
+
+    Returns:
+        ParserBS4 or ParserBS4Lxml or ParserSelectolax: Backend de parseo.
+
+    Raises:
+        ValueError: Si no existe un backend con ese nombre.
+    """
+    try:
+        return PARSERS[nombre]
+    except KeyError:
+        raise ValueError(f"Parser HTML no válido: {nombre}. Opciones: {', '.join(PARSERS)}")
@@ -0,0 +1,97 @@
+# CLASIFICACIÓN DE FALLOS Y POLÍTICA DE REINTENTOS DEL SCRAPER
+#
+# Cada descarga o parseo fallido se clasifica en un tipo de fallo. Los fallos transitorios
+# (timeouts, conexiones cortadas, 429, 5xx y respuestas exitosas sin cuerpo) se reintentan con espera exponencial y jitter;
+# el resto se descarta de inmediato. Todos se cuentan en un reporte por ejecución.
+import random
+
+from scraping import metricas
+from scraping.config import ESPERA_BASE_REINTENTO, ESPERA_MAXIMA_REINTENTO
+
+# Tipos de fallo que se cuentan en el reporte
+TIPOS_FALLO = ("timeout", "conexion", "http_429", "http_5xx", "http_404", "http_4xx", "vacia", "respuesta_grande", "sin_cache", "robots", "campo_faltante", "error")
+
+# Fallos transitorios, que vale la pena reintentar
+FALLOS_REINTENTABLES = {"timeout", "conexion", "http_429", "http_5xx", "vacia"}
+
+# Máximo de URLs fallidas que se guardan en el reporte (los contadores no tienen límite)
+MAX_URLS_FALLIDAS = 1000
+
+
+def clasificar_fallo(estado):
+    """
+    Clasifica el resultado de una descarga fallida (ver `scraping.scraper.descargar_html`).
+
+    Una respuesta sin error HTTP pero sin contenido (un 200 con el cuerpo vacío, o un 304 sin la
+    página en la caché) es "vacia"; un estado desconocido, "error".
+
+    Args:
+        estado (int or str): Código HTTP de la respuesta, o "timeout" / "conexion" / "respuesta_grande" /
+            "sin_cache" (modo replay) / "robots" (prohibida por robots.txt) / "error" si no se obtuvo el contenido.
+
+    Returns:
+        str: Uno de TIPOS_FALLO.
+    """
+    if estado in ("timeout", "conexion", "respuesta_grande", "sin_cache", "robots", "error"):
+        return estado
+    if not isinstance(estado, int):
+        return "error"
+    if estado == 429:
+        return "http_429"
+    if estado == 404:
+        return "http_404"
+    if estado >= 500:
+        return "http_5xx"
+    if estado >= 400:
+        return "http_4xx"
+    return "vacia"
+
+
+def calcular_espera(intento):
+    """
+    Calcula la espera antes de un reintento: backoff exponencial con jitter completo.
+
+    La espera es aleatoria entre 0 y ESPERA_BASE_REINTENTO * 2^(intento - 1), acotada por
+    ESPERA_MAXIMA_REINTENTO, para que los reintentos de muchas URLs no lleguen todos juntos.
+
+    Args:
+        intento (int): Número del reintento (1 para el primero).
+
+    Returns:
+        float: Segundos a esperar.
+    """
+    return random.uniform(0, min(ESPERA_MAXIMA_REINTENTO, ESPERA_BASE_REINTENTO * 2 ** (intento - 1)))
+
+
+def crear_reporte_fallos():
+    """
+    Crea el reporte de fallos de una ejecución, que el scraper va completando.
+
+    Returns:
+        dict: Contador por cada tipo de TIPOS_FALLO (URLs descartadas definitivamente), más
+              'reintentos' (reintentos programados), 'recuperados' (URLs que funcionaron tras
+              reintentar) y 'urls_fallidas' (lista de (url, tipo) con hasta MAX_URLS_FALLIDAS elementos).
+    """
+    reporte = {tipo: 0 for tipo in TIPOS_FALLO}
+    reporte.update({"reintentos": 0, "recuperados": 0, "urls_fallidas": []})
+    return reporte
+
+
+def registrar_fallo(reporte, url, tipo):
+    """
+    Registra en el reporte una URL descartada definitivamente (y en las métricas del scraper, aunque no haya reporte).
+
+    Args:
+        reporte (dict or None): Reporte creado con `crear_reporte_fallos`. Si es None no se registra nada.
+        url (str): URL descartada.
+        tipo (str): Tipo de fallo (uno de TIPOS_FALLO).
+
+    Returns:
+        None
+    """
+    metricas.DESCARTES.labels(tipo).inc()
+    if reporte is None:
+        return
+    reporte[tipo] += 1
+    if len(reporte["urls_fallidas"]) < MAX_URLS_FALLIDAS:
+        reporte["urls_fallidas"].append((url, tipo))
@@ -0,0 +1,167 @@
+# POLÍTICA DE ROBOTS.TXT DEL SCRAPER
+#
+# Antes de descargar una URL de la red se consulta el robots.txt de su origen (esquema + host),
+# con el User-Agent del scraper. Cada robots.txt se descarga recién la primera vez que hace falta,
+# con la misma sesión HTTP que el resto del scraper, y se guarda en un archivo JSON en disco
+# durante TTL_ROBOTS segundos: importar el scraper no hace ninguna petición y las ejecuciones
+# siguientes no lo vuelven a descargar.
+#
+# Las respuestas se interpretan igual que `urllib.robotparser`: un 401/403 prohíbe todo el sitio,
+# otro 4xx (p. ej. 404, sin robots.txt) lo permite todo y un 5xx o un error de red lo prohíben.
+# Estos últimos no se guardan en disco y se vuelven a intentar tras ESPERA_ROBOTS_FALLIDO segundos.
+import asyncio
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from scraping.config import HEADERS, RUTA_CACHE_ROBOTS, TTL_ROBOTS
+
+# Segundos tras los que se vuelve a intentar descargar un robots.txt que respondió 5xx o no respondió
+ESPERA_ROBOTS_FALLIDO = 300
+
+
+def interpretar_robots(estado, contenido):
+    """
+    Crea las reglas de un sitio a partir de la respuesta a su robots.txt.
+
+    Args:
+        estado (int or str): Código HTTP de la respuesta, o "error" si no se obtuvo.
+        contenido (str): Cuerpo del robots.txt (vacío si no se obtuvo).
+
+    Returns:
+        urllib.robotparser.RobotFileParser: Reglas listas para `can_fetch`.
+    """
+    # Se importa aquí porque arrastra urllib.request (y con él http.client y ssl)
+    from urllib.robotparser import RobotFileParser
+
+    reglas = RobotFileParser()
+    if estado in (401, 403):
+        reglas.disallow_all = True
+    elif isinstance(estado, int) and 400 <= estado < 500:
+        reglas.allow_all = True
+    elif isinstance(estado, int) and estado < 400:
+        reglas.parse(contenido.splitlines())
+    else:
+        reglas.disallow_all = True
+    return reglas
+
+
+class PoliticaRobots:
+    """Reglas de robots.txt por origen, cargadas en el primer uso y guardadas en disco con vencimiento.
+
+    Se puede consultar desde el event loop (`permitido`) y desde la ruta sincrónica (`permitido_sync`).
+    Cada robots.txt se descarga una sola vez aunque muchas descargas del mismo origen lo pidan a la vez.
+
+    Attributes:
+        ruta (str or None): Archivo JSON con los robots.txt descargados (None para no guardarlos en disco).
+        ttl (float): Segundos durante los que un robots.txt guardado se usa sin volver a descargarlo.
+        agente (str): User-Agent con el que se evalúan las reglas.
+    """
+
+    def __init__(self, ruta=RUTA_CACHE_ROBOTS, ttl=TTL_ROBOTS, agente=HEADERS["User-Agent"]):
+        self.ruta = ruta
+        self.ttl = ttl
+        self.agente = agente
+        self._reglas = {}  # {origen: (vence, RobotFileParser)}
+        self._disco = None  # {origen: {"estado", "contenido", "descargado"}}, leído en el primer uso
+        self._bloqueos = {}  # {origen: asyncio.Lock}
+        self._bloqueo = threading.Lock()
+
+    @staticmethod
+    def origen(url):
+        """Devuelve el origen (esquema://host[:puerto]) de una URL, cuyo robots.txt se aplica a ella."""
+        partes = urlsplit(url)
+        return f"{partes.scheme}://{partes.netloc}"
+
+    def _vigentes(self, origen):
+        """Devuelve las reglas del origen si ya están cargadas y no vencieron; si no, las busca en el disco."""
+        reglas = self._reglas.get(origen)
+        if reglas is not None and reglas[0] > time.time():
+            return reglas[1]
+        with self._bloqueo:
+            if self._disco is None:
+                self._disco = self._leer_disco()
+            guardado = self._disco.get(origen)
+        if guardado is None or guardado["descargado"] + self.ttl <= time.time():
+            return None
+        reglas = interpretar_robots(guardado["estado"], guardado["contenido"])
+        self._reglas[origen] = (guardado["descargado"] + self.ttl, reglas)
+        return reglas
+
+    def _leer_disco(self):
+        """Lee el archivo de robots.txt guardados; un archivo inexistente o dañado equivale a uno vacío."""
+        if not self.ruta or not os.path.exists(self.ruta):
+            return {}
+        try:
+            with open(self.ruta, encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _registrar(self, origen, estado, contenido):
+        """Guarda las reglas de una respuesta en memoria y, si es definitiva (no 5xx ni error), en el disco."""
+        reglas = interpretar_robots(estado, contenido)
+        ahora = time.time()
+        definitiva = isinstance(estado, int) and estado < 500
+        self._reglas[origen] = (ahora + (self.ttl if definitiva else ESPERA_ROBOTS_FALLIDO), reglas)
+        if definitiva and self.ruta:
+            with self._bloqueo:
+                self._disco[origen] = {"estado": estado, "contenido": contenido, "descargado": ahora}
+                carpeta = os.path.dirname(self.ruta)
+                if carpeta:
+                    os.makedirs(carpeta, exist_ok=True)
+                temporal = f"{self.ruta}.{os.getpid()}.tmp"
+                with open(temporal, "w", encoding="utf-8") as archivo:
+                    json.dump(self._disco, archivo, ensure_ascii=False)
+                os.replace(temporal, self.ruta)
+        return reglas
+
+    async def permitido(self, url, session):
+        """
+        Indica si el robots.txt del origen de `url` permite descargarla, descargándolo si hace falta.
+
+        Args:
+            url (str): URL a descargar.
+            session (aiohttp.ClientSession): Sesión con la que se descarga el robots.txt.
+
+        Returns:
+            bool: True si la URL se puede descargar.
+        """
+        origen = self.origen(url)
+        reglas = self._vigentes(origen)
+        if reglas is None:
+            bloqueo = self._bloqueos.setdefault(origen, asyncio.Lock())
+            async with bloqueo:
+                # Otra descarga pudo haberlo cargado mientras se esperaba el bloqueo
+                reglas = self._vigentes(origen)
+                if reglas is None:
+                    estado, contenido = await self._descargar(session, origen)
+                    reglas = self._registrar(origen, estado, contenido)
+        return reglas.can_fetch(self.agente, url)
+
+    def permitido_sync(self, url):
+        """Versión sincrónica de `permitido`, que descarga el robots.txt con la sesión de `requests` compartida."""
+        from scraping.transporte import obtener_sesion_sync
+
+        origen = self.origen(url)
+        reglas = self._vigentes(origen)
+        if reglas is None:
+            try:
+                respuesta = obtener_sesion_sync().get(origen + "/robots.txt", headers=HEADERS, timeout=10)
+                estado, contenido = respuesta.status_code, respuesta.text if respuesta.status_code < 400 else ""
+            except Exception:
+                estado, contenido = "error", ""
+            reglas = self._registrar(origen, estado, contenido)
+        return reglas.can_fetch(self.agente, url)
+
+    async def _descargar(self, session, origen):
+        """Descarga el robots.txt de un origen y devuelve (estado, contenido); ("error", "") si no responde."""
+        try:
+            async with session.get(origen + "/robots.txt", headers=HEADERS, timeout=10) as respuesta:
+                if respuesta.status >= 400:
+                    return respuesta.status, ""
+                return respuesta.status, await respuesta.text(errors="replace")
+        except Exception:
+            return "error", ""
@@ -0,0 +1,165 @@
+# DESTINOS DE SALIDA (SINKS) DE LOS REGISTROS LIMPIOS
+#
+# Los registros se escriben a medida que se producen, sin acumular la ejecución en memoria.
+# - "csv": un archivo CSV por ejecución, como el respaldo original.
+# - "parquet": dataset Parquet particionado por término de búsqueda y fecha
+#   (directorio/termino=<termino>/fecha=<AAAA-MM-DD>/parte-*.parquet) con tipos de columna fijos.
+#   Requiere `pyarrow`, que se importa solo al usar este destino.
+import csv
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+from scraping.config import DIRECTORIO_SALIDA, TAM_GRUPO_PARQUET, MAX_ESCRITORES_PARQUET
+
+# Columnas de los registros limpios (ver `scraping.scraper.limpiar_articulo`) y su tipo
+CAMPOS_REGISTRO = {
+    "item_id": "string",
+    "nombre_articulo": "string",
+    "precio": "int64",
+    "calificacion_promedio": "float64",
+    "cantidad_calificaciones": "int64",
+    "descripcion": "string",
+    "enlace_articulo": "string",
+}
+
+
+def esquema_parquet():
+    """Devuelve el esquema Arrow de los registros limpios (tipos de CAMPOS_REGISTRO)."""
+    import pyarrow as pa
+    return pa.schema([(campo, pa.type_for_alias(tipo)) for campo, tipo in CAMPOS_REGISTRO.items()])
+
+
+def valor_particion(texto):
+    """Convierte un término de búsqueda en un nombre de carpeta seguro ("Laptop HP/15" -> "laptop_hp_15")."""
+    return re.sub(r"[^0-9a-z]+", "_", texto.lower()).strip("_") or "sin_termino"
+
+
+class SalidaCSV:
+    """Escribe los registros en un único archivo CSV por ejecución.
+
+    Atributos:
+        ruta (str): Ruta del archivo CSV (dataset_{nombre}_{AAAA-MM-DD_HH-MM-SS}.csv).
+    """
+
+    def __init__(self, directorio=DIRECTORIO_SALIDA, nombre="dataset"):
+        os.makedirs(directorio, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.ruta = os.path.join(directorio, f"dataset_{nombre.replace(' ', '_')}_{timestamp}.csv")
+        self._archivo = open(self.ruta, "w", newline="", encoding="utf-8")
+        self._escritor = csv.DictWriter(self._archivo, fieldnames=list(CAMPOS_REGISTRO))
+        self._escritor.writeheader()
+
+    def escribir(self, registro, termino=None):
+        """Agrega un registro al archivo (el término no se usa en este destino)."""
+        self._escritor.writerow(registro)
+
+    def cerrar(self):
+        """Cierra el archivo y devuelve su ruta."""
+        self._archivo.close()
+        return self.ruta
+
+
+class SalidaParquet:
+    """Escribe los registros en un dataset Parquet particionado por término de búsqueda y fecha.
+
+    Los registros de cada partición se acumulan hasta TAM_GRUPO_PARQUET filas y se escriben como un
+    grupo de filas (row group) del archivo abierto de esa partición, de modo que la memoria usada no
+    depende del tamaño de la ejecución. Como máximo se mantienen MAX_ESCRITORES_PARQUET archivos
+    abiertos a la vez; al superarlo se cierra el usado hace más tiempo, y si esa partición vuelve a
+    recibir registros se abre un nuevo archivo. Los archivos pequeños que quedan se pueden unir
+    con `scripts/compactar_parquet.py`.
+
+    Atributos:
+        directorio (str): Carpeta raíz del dataset.
+        tam_grupo (int): Filas por grupo de filas.
+        archivos (list[str]): Rutas de los archivos escritos.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_SALIDA, tam_grupo=TAM_GRUPO_PARQUET, max_escritores=MAX_ESCRITORES_PARQUET):
+        import pyarrow.parquet  # Falla al crear el destino, y no a mitad de la ejecución, si falta pyarrow
+        self.directorio = directorio
+        self.tam_grupo = tam_grupo
+        self.max_escritores = max_escritores
+        self.esquema = esquema_parquet()
+        self.archivos = []
+        self._prefijo = f"parte-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._pendientes = {}
+        self._escritores = OrderedDict()
+
+    def escribir(self, registro, termino=None):
+        """
+        Agrega un registro a la partición de su término y de la fecha actual.
+
+        Args:
+            registro (dict): Registro limpio.
+            termino (str, optional): Término de búsqueda con el que se encontró el artículo.
+
+        Returns:
+            None
+        """
+        particion = (valor_particion(termino or ""), datetime.now().strftime("%Y-%m-%d"))
+        filas = self._pendientes.setdefault(particion, [])
+        filas.append(registro)
+        if len(filas) >= self.tam_grupo:
+            self._volcar(particion)
+
+    def _volcar(self, particion):
+        import pyarrow as pa
+        filas = self._pendientes.pop(particion, None)
+        if not filas:
+            return
+        escritor = self._escritores.get(particion)
+        if escritor is None:
+            escritor = self._abrir(particion)
+        else:
+            self._escritores.move_to_end(particion)
+        escritor.write_table(pa.Table.from_pylist(filas, schema=self.esquema))
+
+    def _abrir(self, particion):
+        import pyarrow.parquet as pq
+        if len(self._escritores) >= self.max_escritores:
+            _, antiguo = self._escritores.popitem(last=False)
+            antiguo.close()
+        termino, fecha = particion
+        carpeta = os.path.join(self.directorio, f"termino={termino}", f"fecha={fecha}")
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, f"{self._prefijo}-{len(self.archivos)}.parquet")
+        self.archivos.append(ruta)
+        escritor = pq.ParquetWriter(ruta, self.esquema, compression="zstd")
+        self._escritores[particion] = escritor
+        return escritor
+
+    def cerrar(self):
+        """Escribe los registros pendientes, cierra los archivos y devuelve la carpeta del dataset."""
+        for particion in list(self._pendientes):
+            self._volcar(particion)
+        for escritor in self._escritores.values():
+            escritor.close()
+        self._escritores.clear()
+        return self.directorio
+
+
+SALIDAS = {"csv": SalidaCSV, "parquet": SalidaParquet}
+
+
+def crear_salida(formato, directorio=DIRECTORIO_SALIDA, nombre="dataset"):
+    """Crea el destino de salida indicado.
+
+    Args:
+        formato (str): "csv" o "parquet".
+        directorio (str, optional): Carpeta donde se escriben los archivos.
+        nombre (str, optional): Nombre de la búsqueda, usado en el nombre del archivo CSV.
+
+    Returns:
+        SalidaCSV or SalidaParquet: Destino con los métodos `escribir(registro, termino)` y `cerrar()`.
+
+    Raises:
+        ValueError: Si el formato no existe.
+    """
+    if formato == "csv":
+        return SalidaCSV(directorio, nombre)
+    if formato == "parquet":
+        return SalidaParquet(directorio)
+    raise ValueError(f"Formato de salida no válido: {formato}. Opciones: {', '.join(SALIDAS)}")
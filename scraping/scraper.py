@@ -1,29 +1,176 @@
-import requests
 import asyncio
-import aiohttp
-import pandas as pd
 import random
 import time
 import sys
+import math
+import os
+import re
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
-from urllib.robotparser import RobotFileParser
 sys.path.append(str(Path(__file__).resolve().parent.parent))
-from scraping.config import ARTICULO, MAX_PAGINAS, CONCURRENCY_LIMIT, HEADERS
+from scraping.config import ARTICULO, MAX_PAGINAS, DOMINIO, URL_LISTADO, CONCURRENCY_LIMIT, RESULTADOS_POR_PAGINA, TAM_COLA, TIPO_EXECUTOR_PARSEO, WORKERS_PARSEO, PARSER_HTML, MAX_REINTENTOS, HEADERS, RESPETAR_ROBOTS
+from scraping.parsers import obtener_parser
+from scraping.limitador import LimitadorAdaptativo, clasificar_host
+from scraping import metricas
+from scraping.transporte import RespuestaDemasiadoGrande, cerrar_sesion, leer_cuerpo, obtener_sesion, obtener_sesion_sync
+from scraping.reintentos import FALLOS_REINTENTABLES, calcular_espera, clasificar_fallo, registrar_fallo
+from scraping.robots import PoliticaRobots
 
+# Las librerías pesadas (aiohttp, requests, pandas, bs4) se importan en las funciones que las usan,
+# de modo que importar este módulo no hace peticiones de red y tarda milisegundos.
 
 
+# Política de robots.txt aplicada antes de cada descarga por la red (None: no se consulta, ver `configurar_robots`)
+politica_robots = PoliticaRobots() if RESPETAR_ROBOTS else None
+
+
+def configurar_robots(politica):
+    """
+    Activa (o desactiva) la consulta del robots.txt antes de cada descarga por la red.
+
+    Args:
+        politica (scraping.robots.PoliticaRobots or None): Política a aplicar, o None para no consultar robots.txt.
+
+    Returns:
+        None
+    """
+    global politica_robots
+    politica_robots = politica
+
+# Backend de parseo activo en este proceso (en los workers de parseo se configura al crear el pool)
+parser_html = obtener_parser(PARSER_HTML)
+
+
+def configurar_parser(nombre):
+    """
+    Selecciona el backend de parseo de HTML usado por este proceso.
+
+    Se usa como `initializer` de los pools de parseo, para que cada worker (hilo o proceso)
+    utilice el mismo backend que el proceso principal.
+
+    Args:
+        nombre (str): Nombre del backend definido en `scraping.parsers.PARSERS`.
+
+    Returns:
+        None
+    """
+    global parser_html
+    parser_html = obtener_parser(nombre)
+
+
+# Caché en disco de las páginas descargadas (None: desactivada, ver `configurar_cache`)
+cache_http = None
+
+
+def configurar_cache(cache):
+    """
+    Activa (o desactiva) la caché en disco usada por `descargar_html` y `obtener_url_articulos`.
+
+    Args:
+        cache (scraping.cache.CacheRespuestas or None): Caché a usar, o None para descargar siempre de la red.
+
+    Returns:
+        None
+    """
+    global cache_http
+    cache_http = cache
+
+
+# Base de las URLs de las páginas de resultados (ver `configurar_url_listado`)
+url_listado = URL_LISTADO
+
+
+def configurar_url_listado(plantilla):
+    """
+    Cambia la base de las URLs de las páginas de resultados, por ejemplo para apuntar a un servidor local.
+
+    Args:
+        plantilla (str): Esquema y host de los listados, con `{dominio}` donde va el dominio del sitio
+            (p. ej. "https://listado.mercadolibre.{dominio}" o "http://127.0.0.1:8765").
+
+    Returns:
+        None
+    """
+    global url_listado
+    url_listado = plantilla.rstrip("/")
+
+def construir_url_listado(articulo, pagina, dominio=DOMINIO):
+    """
+    Construye la URL de una página de resultados de búsqueda de Mercado Libre.
+
+    Args:
+        articulo (str): Nombre o palabra clave del artículo a buscar.
+        pagina (int): Índice de la página de resultados, empezando en 0.
+        dominio (str, optional): Dominio del sitio de Mercado Libre (por ejemplo "com.co" o "com.ar").
+
+    Returns:
+        str: URL de la página de resultados con el offset `_Desde_` correspondiente.
+    """
+    offset = pagina * RESULTADOS_POR_PAGINA + 1
+    return "{}/{}_Desde_{}_NoIndex_True".format(url_listado.format(dominio=dominio), articulo.replace(" ", "-"), offset)
+
+
+def extraer_url_articulos(html):
+    """
+    Analiza el HTML de una página de resultados y extrae los enlaces de los artículos listados.
+
+    Además de los enlaces, intenta leer el total de resultados de la búsqueda que Mercado Libre
+    muestra en la cabecera del listado (por ejemplo "1.234 resultados"), usado por la paginación
+    asíncrona para conocer de antemano cuántas páginas existen.
+
+    El análisis lo hace el backend de parseo activo (ver `configurar_parser`).
+
+    Args:
+        html (bytes or str): Código HTML de la página de resultados.
+
+    Returns:
+        tuple:
+            bool: Indica si se encontraron artículos en la página (True) o no (False).
+            list: Lista de URLs (str) correspondientes a cada artículo encontrado en la página.
+            int or None: Total de resultados de la búsqueda, o None si no aparece en la página.
+    """
+    return parser_html.parsear_listado(html)
+
+
+# Campos que deben aparecer en una tarjeta del listado para armar el registro sin visitar la página
+# del artículo (los mismos que son obligatorios en `extraer_datos_articulo`)
+CAMPOS_TARJETA = ("nombre_articulo", "precio", "calificacion_promedio", "cantidad_calificaciones")
+
+
+def extraer_tarjetas(html):
+    """
+    Analiza el HTML de una página de resultados y extrae los datos que muestra cada tarjeta de artículo.
+
+    Las tarjetas (`poly-card`) traen el título, el precio, la calificación y la cantidad de
+    calificaciones, por lo que en el modo "listado" se pueden armar los registros sin descargar
+    la página de cada artículo. La descripción no aparece en las tarjetas.
+
+    Args:
+        html (bytes or str): Código HTML de la página de resultados.
+
+    Returns:
+        tuple:
+            bool: Indica si se encontraron artículos en la página (True) o no (False).
+            list: Diccionarios con las mismas claves que `extraer_datos_articulo`; los campos que la
+                  tarjeta no muestra quedan en None y la descripción vacía.
+            int or None: Total de resultados de la búsqueda, o None si no aparece en la página.
+    """
+    return parser_html.parsear_tarjetas(html)
+
+
+def tarjeta_completa(tarjeta):
+    """Indica si una tarjeta del listado trae todos los CAMPOS_TARJETA."""
+    return all(tarjeta.get(campo) for campo in CAMPOS_TARJETA)
 
-#Leer el archivo robots.txt para asegurarse de que la URL es accesible
-rp = RobotFileParser()
-rp.set_url("https://www.mercadolibre.com/robots.txt")
-rp.read()
 
 def obtener_url_articulos(base_url):
     """
     Extrae los enlaces de los artículos listados en una página de resultados de búsqueda de Mercado Libre.
 
+    Si la caché en disco está activa (ver `configurar_cache`), la página se toma de ella mientras
+    esté vigente y, vencida, se revalida con una petición condicional. Antes de usar la red se
+    consulta el robots.txt del sitio (ver `configurar_robots`); si prohíbe la página, no se descarga.
+
     Args:
         base_url (str): URL de la página de resultados a procesar.
 
@@ -32,28 +179,38 @@ def obtener_url_articulos(base_url):
             bool: Indica si se encontraron artículos en la página (True) o no (False).
             list: Lista de URLs (str) correspondientes a cada artículo encontrado en la página.
     """
-    try:
-        res = requests.get(base_url, headers=HEADERS, timeout=10)
-        res.raise_for_status()  # Lanza una excepción si la respuesta fue un error HTTP
-    except requests.RequestException as e:
-        print(f"Error al hacer la solicitud HTTP durante la obtención de los url de los artículos en la página {base_url}  | Error: {e}")
+    entrada = cache_http.obtener(base_url) if cache_http is not None else None
+    if entrada is not None and (entrada["vigente"] or cache_http.replay):
+        html = entrada["cuerpo"]
+    elif cache_http is not None and cache_http.replay:
+        print(f"La página {base_url} no está en la caché (modo replay)")
         return False, []
-
-    soup = BeautifulSoup(res.text, "html.parser")
-    lista_url_articulos = []
-
-    # Buscar los contenedores de artículos
-    articulos = soup.find_all("div", class_="poly-card")
-
-    if not articulos:
+    elif politica_robots is not None and not politica_robots.permitido_sync(base_url):
+        print(f"La página {base_url} está prohibida por robots.txt")
         return False, []
+    else:
+        import requests
 
-    for item in articulos:
-        enlace = item.find("a", class_="poly-component__title")
-        if enlace and enlace.get("href"):
-            lista_url_articulos.append(enlace["href"])
-    
-    return True, lista_url_articulos
+        encabezados = dict(HEADERS)
+        if entrada is not None:
+            encabezados.update(cache_http.encabezados_revalidacion(entrada))
+        try:
+            res = obtener_sesion_sync().get(base_url, headers=encabezados, timeout=10)
+            res.raise_for_status()  # Lanza una excepción si la respuesta fue un error HTTP
+        except requests.RequestException as e:
+            print(f"Error al hacer la solicitud HTTP durante la obtención de los url de los artículos en la página {base_url}  | Error: {e}")
+            return False, []
+
+        if res.status_code == 304 and entrada is not None:
+            cache_http.renovar(base_url)
+            html = entrada["cuerpo"]
+        else:
+            html = res.content
+            if cache_http is not None:
+                cache_http.guardar(base_url, html, res.headers.get("ETag"), res.headers.get("Last-Modified"))
+
+    flag, lista_url_articulos, _ = extraer_url_articulos(html)
+    return flag, lista_url_articulos
 
 
 
@@ -78,15 +235,8 @@ def obtener_url_todos_los_articulos(articulo, max_paginas):
     
     while seguir and pagina < max_paginas:
         
-        offset = pagina * 50 + 1
-        url = "https://listado.mercadolibre.com.co/{}_Desde_{}_NoIndex_True".format(articulo.replace(" ", "-"), offset)
+        url = construir_url_listado(articulo, pagina)
 
-        #Verificar si la URL es accesible según el archivo robots.txt
-        if rp.can_fetch(HEADERS["User-Agent"], url):
-            print("Permitido según robots.txt")
-        else:
-            print("Prohibido según robots.txt")
-            
         print(f"\n Procesando pagina {pagina + 1} de {max_paginas}")
         flag, urls = obtener_url_articulos(url)
         
@@ -102,27 +252,272 @@ def obtener_url_todos_los_articulos(articulo, max_paginas):
     return lista_total_url_articulos
 
 
+async def obtener_url_articulos_async(session, url, semaphore, executor=None, reporte_fallos=None, max_reintentos=MAX_REINTENTOS, tarjetas=False):
+    """
+    Versión asíncrona de `obtener_url_articulos` que descarga la página de resultados con aiohttp.
+
+    La descarga se hace con el limitador compartido con el scraping de artículos, de modo que
+    la paginación y la descarga de productos respetan el mismo límite de concurrencia. Los fallos
+    transitorios se reintentan con backoff exponencial, esperando fuera del limitador: una página
+    de resultados perdida haría que se cancelen todas las posteriores.
 
-async def fetch_html(session, url):
+    Args:
+        session (aiohttp.ClientSession): Sesión HTTP asíncrona reutilizable.
+        url (str): URL de la página de resultados a procesar.
+        semaphore (LimitadorAdaptativo or asyncio.Semaphore): Limitador de las solicitudes concurrentes activas.
+        executor (concurrent.futures.Executor, optional): Pool donde se analiza el HTML del listado.
+        reporte_fallos (dict, optional): Reporte de fallos de la ejecución (ver `scraping.reintentos.crear_reporte_fallos`).
+        max_reintentos (int, optional): Reintentos ante fallos transitorios.
+        tarjetas (bool, optional): Si es True, en lugar de las URLs se entregan los datos de cada tarjeta
+            del listado (ver `extraer_tarjetas`).
+
+    Returns:
+        tuple:
+            bool: Indica si se encontraron artículos en la página (True) o no (False).
+            list: Lista de URLs (str) de los artículos encontrados en la página, o de tarjetas (dict) si `tarjetas` es True.
+            int or None: Total de resultados de la búsqueda, si la página lo informa.
+    """
+    inicio = time.perf_counter()
+    intento = 0
+    while True:
+        html, estado = await descargar_html(session, url, semaphore)
+        if html:
+            break
+        fallo = clasificar_fallo(estado)
+        if fallo not in FALLOS_REINTENTABLES or intento >= max_reintentos:
+            registrar_fallo(reporte_fallos, url, fallo)
+            metricas.PAGINAS_LISTADO.labels("fallo").inc()
+            metricas.DURACION_LISTADO.observe(time.perf_counter() - inicio)
+            return False, [], None
+        intento += 1
+        metricas.REINTENTOS.labels(fallo).inc()
+        if reporte_fallos is not None:
+            reporte_fallos["reintentos"] += 1
+        await asyncio.sleep(calcular_espera(intento))
+
+    if intento and reporte_fallos is not None:
+        reporte_fallos["recuperados"] += 1
+    loop = asyncio.get_running_loop()
+    flag, elementos, total = await loop.run_in_executor(executor, extraer_tarjetas if tarjetas else extraer_url_articulos, html)
+    metricas.PAGINAS_LISTADO.labels("ok" if flag and elementos else "vacia").inc()
+    metricas.DURACION_LISTADO.observe(time.perf_counter() - inicio)
+    return flag, elementos, total
+
+
+async def iterar_paginas_articulos_async(articulo, max_paginas, limite_concurrencia=CONCURRENCY_LIMIT, session=None, semaphore=None, executor=None, reporte_fallos=None, max_reintentos=MAX_REINTENTOS, tarjetas=False, dominio=DOMINIO):
     """
-    Realiza una petición HTTP asíncrona para obtener el contenido HTML de una página web.
+    Generador asíncrono que entrega los enlaces de cada página de resultados a medida que se descargan.
+
+    Descarga primero la página inicial para leer el total de resultados y calcular cuántas páginas
+    existen (acotado por `max_paginas`). Luego lanza en paralelo la descarga de las páginas restantes
+    (`_Desde_{offset}`), usando la misma sesión aiohttp y el mismo limitador que el scraping de artículos.
+    Cada página se entrega apenas termina, sin esperar a las demás. Si alguna página vuelve vacía,
+    se cancelan las descargas de las páginas posteriores, ya que no puede haber más resultados después de ella.
+
+    Args:
+        articulo (str): Nombre o palabra clave del artículo a buscar.
+        max_paginas (int): Número máximo de páginas a recorrer como límite de seguridad.
+        limite_concurrencia (int, optional): Número máximo de solicitudes concurrentes si no se entrega un limitador.
+        session (aiohttp.ClientSession, optional): Sesión HTTP a reutilizar. Si no se entrega, se usa la sesión compartida
+            del proceso (ver `scraping.transporte.obtener_sesion`).
+        semaphore (LimitadorAdaptativo, optional): Limitador compartido. Si no se entrega, se crea uno con máximo `limite_concurrencia`.
+        executor (concurrent.futures.Executor, optional): Pool donde se analiza el HTML de los listados.
+        reporte_fallos (dict, optional): Reporte de fallos de la ejecución (ver `scraping.reintentos.crear_reporte_fallos`).
+        max_reintentos (int, optional): Reintentos por página ante fallos transitorios.
+        tarjetas (bool, optional): Si es True, se entregan los datos de las tarjetas del listado en lugar de los enlaces.
+        dominio (str, optional): Dominio del sitio de Mercado Libre donde se busca.
+
+    Yields:
+        tuple:
+            int: Índice de la página (empezando en 0).
+            list: Enlaces de los artículos encontrados en esa página (o sus tarjetas, si `tarjetas` es True).
+    """
+    if max_paginas <= 0:
+        return
+
+    if semaphore is None:
+        semaphore = LimitadorAdaptativo(maximo=limite_concurrencia)
+    if session is None:
+        session = await obtener_sesion()
+
+    flag, urls, total_resultados = await obtener_url_articulos_async(session, construir_url_listado(articulo, 0, dominio), semaphore, executor, reporte_fallos, max_reintentos, tarjetas)
+    if not flag or not urls:
+        print(" No se encontraron resultados para la búsqueda.")
+        return
+    yield 0, urls
+
+    # Si la página no informa el total, se intentan todas las páginas hasta max_paginas
+    total_paginas = max_paginas
+    if total_resultados is not None:
+        total_paginas = min(max_paginas, math.ceil(total_resultados / RESULTADOS_POR_PAGINA))
+    print(f"\n {total_resultados or 'N/D'} resultados. Procesando {total_paginas} de {max_paginas} paginas en paralelo")
+
+    async def procesar_pagina(pagina):
+        flag, urls, _ = await obtener_url_articulos_async(session, construir_url_listado(articulo, pagina, dominio), semaphore, executor, reporte_fallos, max_reintentos, tarjetas)
+        return pagina, flag, urls
+
+    tareas = {pagina: asyncio.create_task(procesar_pagina(pagina)) for pagina in range(1, total_paginas)}
+    pendientes = set(tareas.values())
+
+    try:
+        while pendientes:
+            terminadas, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+            for tarea in terminadas:
+                pagina, flag, urls = tarea.result()
+                if flag and urls:
+                    yield pagina, urls
+                else:
+                    # Página vacía: no hay resultados después de ella, se cancelan las posteriores
+                    for pagina_posterior, otra in tareas.items():
+                        if pagina_posterior > pagina and not otra.done():
+                            otra.cancel()
+                            pendientes.discard(otra)
+    finally:
+        for tarea in tareas.values():
+            tarea.cancel()
+        await asyncio.gather(*tareas.values(), return_exceptions=True)
+
+
+async def obtener_url_todos_los_articulos_async(articulo, max_paginas, limite_concurrencia=CONCURRENCY_LIMIT, session=None, semaphore=None, executor=None):
+    """
+    Obtiene los enlaces de todas las páginas de resultados de forma concurrente.
+
+    Envoltorio de `iterar_paginas_articulos_async` que espera a que terminen todas las páginas
+    y devuelve los enlaces en una sola lista, ordenados según el número de página.
+
+    Args:
+        articulo (str): Nombre o palabra clave del artículo a buscar.
+        max_paginas (int): Número máximo de páginas a recorrer como límite de seguridad.
+        limite_concurrencia (int, optional): Número máximo de solicitudes concurrentes si no se entrega un limitador.
+        session (aiohttp.ClientSession, optional): Sesión HTTP a reutilizar. Si no se entrega, se usa la sesión compartida
+            del proceso (ver `scraping.transporte.obtener_sesion`).
+        semaphore (LimitadorAdaptativo, optional): Limitador compartido. Si no se entrega, se crea uno con máximo `limite_concurrencia`.
+        executor (concurrent.futures.Executor, optional): Pool donde se analiza el HTML de los listados.
+
+    Returns:
+        list: Lista con los enlaces de todos los artículos encontrados, en el orden de las páginas.
+    """
+    urls_por_pagina = {}
+    async for pagina, urls in iterar_paginas_articulos_async(articulo, max_paginas, limite_concurrencia, session, semaphore, executor):
+        urls_por_pagina[pagina] = urls
+
+    lista_total_url_articulos = []
+    for pagina in sorted(urls_por_pagina):
+        lista_total_url_articulos.extend(urls_por_pagina[pagina])
+    return lista_total_url_articulos
+
+
+async def descargar_html(session, url, limitador):
+    """
+    Descarga una página respetando el limitador e informa el resultado para ajustar la concurrencia.
+
+    Si el limitador es un `LimitadorAdaptativo`, primero se espera el turno del token bucket del host
+    (fuera del cupo de concurrencia, para no ocupar un cupo que podría usar otro host) y al terminar
+    se le informa el código de respuesta y la latencia. También acepta un `asyncio.Semaphore`.
+
+    Si la caché en disco está activa (ver `configurar_cache`), una página vigente se devuelve sin
+    usar la red ni el limitador; una vencida se revalida con If-None-Match / If-Modified-Since y,
+    ante un 304, se devuelve el contenido guardado. En modo replay nunca se usa la red.
+
+    Antes de usar la red se consulta el robots.txt del sitio (ver `configurar_robots`), que se
+    descarga en la primera consulta a cada sitio; las URLs que prohíbe no se descargan.
 
     Args:
         session (aiohttp.ClientSession): Sesión HTTP asíncrona reutilizable para optimizar las conexiones.
         url (str): URL de la página web a la que se desea acceder.
+        limitador (LimitadorAdaptativo or asyncio.Semaphore): Limitador de las solicitudes concurrentes.
 
     Returns:
-        str or None: Contenido HTML de la respuesta si la solicitud es exitosa, o None en caso de error de red o HTTP.
+        tuple:
+            bytes or None: Contenido HTML crudo si la respuesta fue exitosa, o None en caso de error de red o HTTP.
+                           Se devuelven bytes sin decodificar para poder enviarlos tal cual a los workers de parseo.
+            int or str: Código HTTP de la respuesta (200 si se tomó de la caché), o "timeout" / "conexion" /
+                        "respuesta_grande" / "sin_cache" (modo replay) / "robots" (prohibida por robots.txt) /
+                        "error" si no se obtuvo el contenido.
     """
-    try:
-        async with session.get(url, headers=HEADERS, timeout=10) as response:
-            response.raise_for_status()
-            return await response.text()
-    except Exception as e:
-        #print(f"Error al hacer request de la pagina de un arrticulo cuyo enlace es {url} | Detalles del error: {e}")
-        return None
+    import aiohttp  # Ya cargado al crear la sesión
+
+    host = clasificar_host(url)
+    encabezados = HEADERS
+    entrada = cache_http.obtener(url) if cache_http is not None else None
+    if entrada is not None:
+        if entrada["vigente"] or cache_http.replay:
+            metricas.DESCARGAS.labels(host, "cache").inc()
+            return entrada["cuerpo"], 200
+        encabezados = {**HEADERS, **cache_http.encabezados_revalidacion(entrada)}
+    elif cache_http is not None and cache_http.replay:
+        metricas.DESCARGAS.labels(host, "sin_cache").inc()
+        return None, "sin_cache"
+
+    if politica_robots is not None and not await politica_robots.permitido(url, session):
+        metricas.DESCARGAS.labels(host, "robots").inc()
+        return None, "robots"
+
+    adaptativo = isinstance(limitador, LimitadorAdaptativo)
+    if adaptativo:
+        await limitador.esperar_turno(url)
+
+    html = None
+    async with limitador:
+        inicio = time.perf_counter()
+        try:
+            async with session.get(url, headers=encabezados, timeout=10) as response:
+                estado = response.status
+                if estado == 304 and entrada is not None:
+                    cache_http.renovar(url)
+                    html = entrada["cuerpo"]
+                elif estado < 400:
+                    html = await leer_cuerpo(response)
+                    if cache_http is not None:
+                        cache_http.guardar(url, html, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        except asyncio.TimeoutError:
+            estado = "timeout"
+        except aiohttp.ClientError:
+            estado = "conexion"
+        except RespuestaDemasiadoGrande:
+            estado = "respuesta_grande"
+        except Exception:
+            # Por ejemplo, una URL mal formada: no es un problema del servidor y no se reintenta
+            estado = "error"
+        latencia = time.perf_counter() - inicio
+
+    metricas.DESCARGAS.labels(host, str(estado)).inc()
+    metricas.DURACION_DESCARGA.labels(host).observe(latencia)
+    if adaptativo:
+        limitador.registrar(url, estado, latencia)
+    return html, estado
+
+def crear_executor_parseo(tipo=TIPO_EXECUTOR_PARSEO, workers=WORKERS_PARSEO, parser=PARSER_HTML):
+    """
+    Crea el pool donde se ejecuta el parseo de HTML, fuera del event loop.
+
+    Con `tipo="proceso"` el parseo escala con los núcleos disponibles, ya que cada worker tiene su
+    propio intérprete y no compite por el GIL. Con `tipo="hilo"` se evita el costo de enviar el HTML
+    entre procesos, útil en máquinas con un solo núcleo o para depurar.
+
+    Args:
+        tipo (str, optional): "proceso" para ProcessPoolExecutor o "hilo" para ThreadPoolExecutor.
+        workers (int or None, optional): Cantidad de workers. Si es None se usa la cantidad de núcleos.
+        parser (str, optional): Backend de parseo que usarán los workers ("bs4", "bs4-lxml" o "selectolax").
 
-async def parse_articulo(html, url):
+    Returns:
+        concurrent.futures.Executor: Pool listo para usarse con `parse_articulo` y `procesar_url`.
+
+    Raises:
+        ValueError: Si el tipo de executor no es "proceso" ni "hilo", o si el parser no existe.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    configurar_parser(parser)
+    if tipo == "proceso":
+        return ProcessPoolExecutor(max_workers=workers, initializer=configurar_parser, initargs=(parser,))
+    if tipo == "hilo":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Tipo de executor de parseo no válido: {tipo}")
+
+
+def extraer_datos_articulo(html, url):
     """
     Extrae información estructurada de un artículo a partir de su HTML.
 
@@ -134,8 +529,12 @@ async def parse_articulo(html, url):
         - Descripción compuesta por las características destacadas.
         - Enlace del artículo (URL original proporcionada).
 
+    Es una función síncrona y sin estado para poder ejecutarse en un worker de un
+    ProcessPoolExecutor: recibe el HTML crudo y devuelve un diccionario simple.
+    El análisis lo hace el backend de parseo activo (ver `configurar_parser`).
+
     Args:
-        html (str): Código HTML de la página del artículo.
+        html (bytes or str): Código HTML de la página del artículo.
         url (str): URL del artículo, incluida en los datos finales por trazabilidad.
 
     Returns:
@@ -143,75 +542,346 @@ async def parse_articulo(html, url):
                       Retorna None si ocurre un error al parsear el HTML.
     """
     try:
-        soup = BeautifulSoup(html, "html.parser")
-
-        nombre_articulo = soup.find("h1", {"class": "ui-pdp-title"}).text
-        precio = soup.find("span", {"class": "andes-money-amount__fraction"}).text
-        calificacion_promedio = soup.find("span", {"class": "ui-pdp-review__rating"}).text
-        cantidad_calificaciones = soup.find("span", {"class": "ui-pdp-review__amount"}).text
-        caracteristicas = soup.find_all("li", class_="ui-vpp-highlighted-specs__features-list-item")
-        descripcion = " | ".join(c.text.strip() for c in caracteristicas)
-
-        return {
-            "nombre_articulo": nombre_articulo,
-            "precio": precio,
-            "calificacion_promedio": calificacion_promedio,
-            "cantidad_calificaciones": cantidad_calificaciones,
-            "descripcion": descripcion,
-            "enlace_articulo": url
-        }
+        return parser_html.parsear_articulo(html, url)
     except Exception as e:
         #print(f"El artículo no tiene todos los atributos buscados. Error al parsear HTML de {url} | Detalles del error: {e}")
         return None
 
-async def procesar_url(session, url, semaphore):
+
+async def parse_articulo(html, url, executor=None):
+    """
+    Analiza el HTML de un artículo fuera del event loop.
+
+    Despacha `extraer_datos_articulo` al executor indicado para que el parseo (intensivo en CPU)
+    no detenga las descargas en curso.
+
+    Args:
+        html (bytes or str): Código HTML de la página del artículo.
+        url (str): URL del artículo, incluida en los datos finales por trazabilidad.
+        executor (concurrent.futures.Executor, optional): Pool donde ejecutar el parseo. Si es None,
+            se usa el pool de hilos por defecto del event loop.
+
+    Returns:
+        dict or None: Diccionario con los datos del artículo, o None si ocurre un error al parsear el HTML.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, extraer_datos_articulo, html, url)
+
+async def procesar_url(session, url, semaphore, executor=None):
     """
     Orquesta la descarga y procesamiento de un artículo específico, respetando un límite de concurrencia.
 
-    Esta función coordina la obtención del HTML de un artículo y su posterior análisis, utilizando un semáforo
-    asíncrono (semaphore) para garantizar que no se exceda el número máximo permitido de solicitudes HTTP simultáneas.
-    El uso del semáforo previene sobrecargar el servidor y reduce el riesgo de bloqueos por parte del sitio web.
+    Esta función coordina la obtención del HTML de un artículo y su posterior análisis, utilizando un limitador
+    adaptativo (semaphore) para no exceder la cantidad de solicitudes HTTP simultáneas ni la tasa de peticiones del host.
+    El limitador previene sobrecargar el servidor y reduce el riesgo de bloqueos por parte del sitio web.
 
     Args:
         session (aiohttp.ClientSession): Sesión HTTP asíncrona para realizar las peticiones HTTP.
         url (str): URL del artículo a scrapear.
-        semaphore (asyncio.Semaphore): Semáforo asíncrono que limita la cantidad de solicitudes concurrentes activas.
+        semaphore (LimitadorAdaptativo or asyncio.Semaphore): Limitador de la cantidad de solicitudes concurrentes activas.
+        executor (concurrent.futures.Executor, optional): Pool donde se ejecuta el parseo del HTML.
 
     Returns:
-        dict or None: Diccionario con los datos estructurados del artículo si la descarga y parsing son exitosos;
-                      None si falla la obtención del HTML o el análisis del contenido.
+        tuple:
+            dict or None: Datos estructurados del artículo si la descarga y el parseo son exitosos, o None.
+            str or None: Tipo de fallo (ver `scraping.reintentos.TIPOS_FALLO`), o None si no hubo fallo.
+                         Si la página se descargó pero le falta algún campo obligatorio, es "campo_faltante".
     """
-    #Semáforo para configurar concurrencia de peticiones HTTP y evitar sobrecargar el servidor y posteriores bloqueos a la IP
-    
-    async with semaphore:
-        html = await fetch_html(session, url)
-        if html:
-            return await parse_articulo(html, url)
-        # Si no se pudo obtener el HTML, se retorna None
-        return None
+    #El limitador controla la concurrencia de peticiones HTTP para evitar sobrecargar el servidor y posteriores bloqueos a la IP
+    #El parseo se hace fuera del limitador para no ocupar un cupo de descarga mientras se analiza el HTML
+    html, estado = await descargar_html(session, url, semaphore)
+    if not html:
+        return None, clasificar_fallo(estado)
+    inicio = time.perf_counter()
+    articulo = await parse_articulo(html, url, executor)
+    metricas.DURACION_PARSEO.observe(time.perf_counter() - inicio)
+    if articulo is None:
+        metricas.PARSEOS.labels("campo_faltante").inc()
+        return None, "campo_faltante"
+    metricas.PARSEOS.labels("ok").inc()
+    return articulo, None
+
+async def scrapear_articulos_stream(urls, limite_concurrencia, session=None, semaphore=None, tam_cola=TAM_COLA, executor=None, reporte_fallos=None, max_reintentos=MAX_REINTENTOS):
+    """
+    Generador asíncrono que descarga y analiza artículos, entregando cada resultado apenas está listo.
+
+    Implementa un pipeline productor/consumidor: una tarea productora coloca las URLs en una cola
+    acotada (`asyncio.Queue`) y un grupo de trabajadores las consume ejecutando `procesar_url`.
+    Los artículos analizados pasan por una segunda cola acotada hacia quien itera el generador.
+    Como ambas colas tienen tamaño máximo, si el consumidor es más lento que la descarga,
+    los trabajadores y el productor se detienen (backpressure) y el uso de memoria se mantiene constante.
+
+    Los fallos transitorios (timeout, conexión, 429, 5xx) se reintentan hasta `max_reintentos` veces:
+    una tarea aparte espera el backoff y vuelve a poner la URL en la cola, de modo que la espera no
+    ocupa un trabajador ni un cupo del limitador. Los demás fallos (404, campos faltantes) se descartan.
+    Todos los descartes se cuentan en `reporte_fallos`.
+
+    Args:
+        urls (iterable or async iterable of str): URLs de artículos a scrapear. Puede ser un generador
+            asíncrono (por ejemplo, el resultado de la paginación) para empezar antes de conocer todas las URLs.
+        limite_concurrencia (int): Número máximo de solicitudes HTTP concurrentes permitidas (cantidad de trabajadores).
+        session (aiohttp.ClientSession, optional): Sesión HTTP a reutilizar. Si no se entrega, se usa la sesión compartida del proceso.
+        semaphore (LimitadorAdaptativo, optional): Limitador compartido con otras etapas. Si no se entrega, se crea uno
+            que ajusta la concurrencia hasta `limite_concurrencia`.
+        tam_cola (int, optional): Tamaño máximo de las colas internas del pipeline.
+        executor (concurrent.futures.Executor, optional): Pool donde se ejecuta el parseo del HTML.
+        reporte_fallos (dict, optional): Reporte de fallos de la ejecución (ver `scraping.reintentos.crear_reporte_fallos`).
+        max_reintentos (int, optional): Reintentos por URL ante fallos transitorios.
+
+    Yields:
+        dict: Datos de cada artículo scrapeado exitosamente, en orden de finalización.
+    """
+    if semaphore is None:
+        semaphore = LimitadorAdaptativo(maximo=limite_concurrencia)
+    if session is None:
+        session = await obtener_sesion()
+
+    fin = object()  # Marca de fin de las colas
+    cantidad_trabajadores = max(1, limite_concurrencia)
+    cola_urls = asyncio.Queue(maxsize=tam_cola)  # Elementos (url, intento)
+    cola_resultados = asyncio.Queue(maxsize=tam_cola)
+    reintentos = set()  # Tareas que esperan el backoff antes de volver a encolar una URL
+
+    async def productor():
+        try:
+            if hasattr(urls, "__aiter__"):
+                async for url in urls:
+                    await cola_urls.put((url, 0))
+            else:
+                for url in urls:
+                    await cola_urls.put((url, 0))
+            # Cada URL se marca como terminada (task_done) recién cuando se obtiene o se descarta,
+            # así que join() también espera a los reintentos pendientes
+            await cola_urls.join()
+        except asyncio.CancelledError:
+            # Al cancelar el pipeline también se cancelan los trabajadores: no se espera a encolar el aviso
+            # de fin, que con la cola llena quedaría bloqueado para siempre
+            raise
+        except BaseException:
+            for _ in range(cantidad_trabajadores):
+                await cola_urls.put(fin)
+            raise
+        else:
+            for _ in range(cantidad_trabajadores):
+                await cola_urls.put(fin)
+
+    async def reencolar(url, intento):
+        await asyncio.sleep(calcular_espera(intento))
+        await cola_urls.put((url, intento))
+        # El intento anterior se marca como terminado después de encolar el nuevo, para que join() no termine antes
+        cola_urls.task_done()
+
+    async def trabajador():
+        while True:
+            elemento = await cola_urls.get()
+            if elemento is fin:
+                break
+            url, intento = elemento
+            articulo, fallo = await procesar_url(session, url, semaphore, executor)
+            if fallo is None:
+                if intento and reporte_fallos is not None:
+                    reporte_fallos["recuperados"] += 1
+                await cola_resultados.put(articulo)
+            elif fallo in FALLOS_REINTENTABLES and intento < max_reintentos:
+                metricas.REINTENTOS.labels(fallo).inc()
+                if reporte_fallos is not None:
+                    reporte_fallos["reintentos"] += 1
+                tarea = asyncio.create_task(reencolar(url, intento + 1))
+                reintentos.add(tarea)
+                tarea.add_done_callback(reintentos.discard)
+                continue
+            else:
+                registrar_fallo(reporte_fallos, url, fallo)
+            cola_urls.task_done()
+        await cola_resultados.put(fin)
+
+    tarea_productor = asyncio.create_task(productor())
+    trabajadores = [asyncio.create_task(trabajador()) for _ in range(cantidad_trabajadores)]
+
+    try:
+        terminados = 0
+        while terminados < cantidad_trabajadores:
+            resultado = await cola_resultados.get()
+            if resultado is fin:
+                terminados += 1
+            else:
+                yield resultado
+        # Propaga cualquier excepción ocurrida al generar las URLs
+        await tarea_productor
+    finally:
+        tareas = [tarea_productor, *trabajadores, *reintentos]
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+
+
+async def intercalar_flujos(flujos, tam_cola=TAM_COLA):
+    """
+    Combina varios generadores asíncronos en uno solo, tomando sus elementos por turnos (round-robin).
+
+    Cada flujo se consume en una tarea propia con una cola acotada. En cada vuelta se entrega como
+    máximo un elemento de cada flujo que tenga elementos listos, de modo que un flujo con muchos
+    elementos (por ejemplo, una búsqueda con muchas páginas) no retrasa a los demás. Se usa en el
+    modo por lotes para repartir el límite de concurrencia compartido entre todos los términos.
 
-async def scrapear_lista_articulos_async(urls, limite_concurrencia):
+    Args:
+        flujos (list): Generadores asíncronos a combinar.
+        tam_cola (int, optional): Elementos que cada flujo puede adelantar mientras espera su turno.
+
+    Yields:
+        object: Elementos de los flujos, intercalados.
+
+    Raises:
+        Exception: Cualquier excepción ocurrida en uno de los flujos.
+    """
+    colas = [asyncio.Queue(maxsize=tam_cola) for _ in flujos]
+    hay_novedades = asyncio.Event()
+
+    async def alimentar(flujo, cola):
+        try:
+            async for elemento in flujo:
+                await cola.put(elemento)
+                hay_novedades.set()
+        finally:
+            hay_novedades.set()
+            await flujo.aclose()
+
+    tareas = [asyncio.create_task(alimentar(flujo, cola)) for flujo, cola in zip(flujos, colas)]
+    activos = list(range(len(flujos)))
+    try:
+        while activos:
+            entregado = False
+            for i in list(activos):
+                if not colas[i].empty():
+                    entregado = True
+                    yield colas[i].get_nowait()
+                elif tareas[i].done():
+                    activos.remove(i)
+                    tareas[i].result()  # Propaga la excepción del flujo, si la hubo
+            if not entregado and activos:
+                hay_novedades.clear()
+                await hay_novedades.wait()
+    finally:
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+
+
+async def scrapear_lista_articulos_async(urls, limite_concurrencia, session=None, semaphore=None, executor=None):
     """
     Gestiona el scraping asíncrono de múltiples artículos en paralelo, respetando un límite de concurrencia.
 
-    Esta función crea un semáforo asíncrono (asyncio.Semaphore) para limitar la cantidad de solicitudes
-    HTTP concurrentes activas, inicializa una sesión HTTP asíncrona y coordina la ejecución paralela
-    de las tareas de scraping mediante asyncio.gather(). Al finalizar, filtra los resultados exitosos.
+    Envoltorio de `scrapear_articulos_stream` que consume todo el pipeline y devuelve los
+    resultados exitosos en una lista.
 
     Args:
         urls (list of str): Lista de URLs de artículos a scrapear.
         limite_concurrencia (int): Número máximo de solicitudes HTTP concurrentes permitidas.
+        session (aiohttp.ClientSession, optional): Sesión HTTP a reutilizar (por ejemplo, la usada en la paginación).
+        semaphore (LimitadorAdaptativo, optional): Limitador compartido con otras etapas. Si no se entrega, se crea uno.
+        executor (concurrent.futures.Executor, optional): Pool donde se ejecuta el parseo del HTML.
 
     Returns:
         list of dict: Lista de diccionarios con los datos de cada artículo scrapeado exitosamente.
     """
-    semaphore = asyncio.Semaphore(limite_concurrencia)
-    async with aiohttp.ClientSession() as session:
-        tareas = [procesar_url(session, url, semaphore) for url in urls]
-        resultados = await asyncio.gather(*tareas)
+    return [articulo async for articulo in scrapear_articulos_stream(urls, limite_concurrencia, session, semaphore, executor=executor)]
+
+
+def normalizar_enlace(enlace):
+    """
+    Normaliza un enlace de artículo para poder compararlo con los ya almacenados.
+
+    Elimina el fragmento (`#` y lo que sigue), los espacios, la `/` final y convierte a minúsculas.
+
+    Args:
+        enlace (str): Enlace del artículo tal como se obtuvo del listado.
+
+    Returns:
+        str: Enlace normalizado.
+    """
+    return enlace.split("#")[0].strip().rstrip("/").lower()
+
+
+# Códigos de los sitios de Mercado Libre, que son el prefijo de cada ID de artículo (MCO1234567)
+SITIOS_ML = ("MLA", "MLB", "MCO", "MLM", "MLC", "MLU", "MPE", "MEC", "MLV", "MBO", "MPY", "MCR", "MPA", "MGT", "MHN", "MNI", "MSV", "MRD", "MCU")
+_SITIO = "|".join(SITIOS_ML)
+
+# Ubicaciones del ID en un enlace, en orden de preferencia: el segmento de catálogo ".../p/MCO18302",
+# la ruta del host de publicaciones "articulo.mercadolibre.com.co/MCO-123456789-..." y, por último,
+# cualquier código de sitio seguido de dígitos. Solo se aceptan los códigos de SITIOS_ML, para que
+# un slug como "audifonos-max-1000" no se confunda con un ID.
+PATRONES_ITEM_ID = (
+    re.compile(rf"/p/({_SITIO})(\d+)(?![0-9])", re.IGNORECASE),
+    re.compile(rf"^(?:https?:)?(?://)?articulo\.[^/]+/({_SITIO})-?(\d+)(?![0-9])", re.IGNORECASE),
+    re.compile(rf"(?<![a-z0-9])({_SITIO})-?(\d{{4,}})(?![0-9])", re.IGNORECASE),
+)
+
+
+def extraer_item_id(texto):
+    """
+    Extrae el ID de artículo de Mercado Libre (por ejemplo `MCO1234567`) de una URL.
+
+    Los enlaces de seguimiento (`click1.mercadolibre.com.co/mclics/...`) no contienen el ID;
+    para esos artículos el ID se obtiene del enlace canónico de la página.
+
+    Args:
+        texto (str or None): URL del artículo o enlace canónico.
+
+    Returns:
+        str or None: ID en mayúsculas y sin guion, o None si el texto no contiene un ID.
+    """
+    for patron in PATRONES_ITEM_ID:
+        coincidencia = patron.search(texto or "")
+        if coincidencia:
+            return (coincidencia.group(1) + coincidencia.group(2)).upper()
+    return None
+
+
+def limpiar_articulo(articulo):
+    """
+    Limpia y normaliza los datos de un único artículo scrapeado.
+
+    Args:
+        articulo (dict or None): Diccionario con los datos crudos del artículo.
+
+    Returns:
+        dict or None: Diccionario limpio con la misma estructura que `limpiar_datos_articulos`,
+                      o None si el artículo está incompleto, no tiene ID o tiene un formato inesperado.
+    """
+    if not articulo:
+        metricas.LIMPIEZA.labels("vacio").inc()
+        return None  # Ignora elementos None
 
-    # Filtrar los resultados exitosos
-    return [r for r in resultados if r is not None]
+    try:
+        # Convertir y limpiar datos usando get() para evitar KeyError
+        nombre = articulo.get("nombre_articulo", "").strip()
+        # Se prefiere el enlace canónico: el del listado suele ser un redirect de seguimiento de 1-2 KB
+        enlace = normalizar_enlace(articulo.get("enlace_canonico") or articulo.get("enlace_articulo", ""))
+        item_id = extraer_item_id(articulo.get("enlace_canonico")) or extraer_item_id(articulo.get("enlace_articulo"))
+        precio = int(str(articulo.get("precio", 0)).strip().replace(".", ""))
+        calificacion = float(str(articulo.get("calificacion_promedio", 0.0)).strip().replace(",", "."))
+        # Las tarjetas del listado usan separador de miles, p. ej. "(1.532)"
+        cantidad_calificaciones = int(str(articulo.get("cantidad_calificaciones", 0)).strip().replace("(", "").replace(")", "").replace(".", ""))
+        descripcion = articulo.get("descripcion", "").strip()
+    except (ValueError, TypeError, AttributeError):
+        #Si un artículo no tiene el formato esperado, se ignora
+        metricas.LIMPIEZA.labels("formato_invalido").inc()
+        return None
+
+    if not (nombre and enlace and item_id):
+        metricas.LIMPIEZA.labels("incompleto").inc()
+        return None
+
+    metricas.LIMPIEZA.labels("ok").inc()
+    return {
+        "item_id": item_id,
+        "nombre_articulo": nombre,
+        "precio": precio,
+        "calificacion_promedio": calificacion,
+        "cantidad_calificaciones": cantidad_calificaciones,
+        "descripcion": descripcion,
+        "enlace_articulo": enlace
+    }
 
 
 def limpiar_datos_articulos(lista_articulos):
@@ -230,42 +900,21 @@ def limpiar_datos_articulos(lista_articulos):
 
     Returns:
         list: Lista de diccionarios limpios y válidos con la siguiente estructura:
+            - item_id (str) [ID de Mercado Libre, p. ej. MCO1234567]
             - nombre_articulo (str)
             - precio (int)
             - calificacion_promedio (float)
             - cantidad_calificaciones (int)
             - descripcion (str)
-            - enlace_articulo (str) [normalizado, sin parámetros ni #]
+            - enlace_articulo (str) [canónico si la página lo indica, normalizado, sin #]
     """
 
     datos_limpios = []
 
     for articulo in lista_articulos:
-        if not articulo:
-            continue  # Ignora elementos None
-        
-        try:
-            # Convertir y limpiar datos usando get() para evitar KeyError
-            nombre = articulo.get("nombre_articulo", "").strip()
-            enlace = articulo.get("enlace_articulo", "").split("#")[0].strip().rstrip("/").lower()
-            precio = int(str(articulo.get("precio", 0)).strip().replace(".", ""))
-            calificacion = float(str(articulo.get("calificacion_promedio", 0.0)).strip().replace(",", "."))
-            cantidad_calificaciones = int(str(articulo.get("cantidad_calificaciones", 0)).strip().replace("(", "").replace(")", ""))
-            descripcion = articulo.get("descripcion", "").strip()
-
-            if nombre and enlace:
-                datos_limpios.append({
-                    "nombre_articulo": nombre,
-                    "precio": precio,
-                    "calificacion_promedio": calificacion,
-                    "cantidad_calificaciones": cantidad_calificaciones,
-                    "descripcion": descripcion,
-                    "enlace_articulo": enlace
-                })
-                
-        except (ValueError, TypeError) as e:
-            #Si un artículo no tiene el formato esperado, se ignora y no se añade a la lista
-            continue
+        articulo_limpio = limpiar_articulo(articulo)
+        if articulo_limpio:
+            datos_limpios.append(articulo_limpio)
 
     return datos_limpios
 
@@ -294,6 +943,8 @@ def guardar_en_csv(lista_diccionarios, articulo):
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         nombre_archivo = f"dataset_{prefijo_nombre}_{timestamp}.csv"
 
+        import pandas as pd
+
         df = pd.DataFrame(lista_diccionarios)
         df.to_csv(nombre_archivo, index=False, encoding='utf-8-sig')
         print(f"Archivo CSV con {len(lista_diccionarios)} articulos ha sido guardado exitosamente: {nombre_archivo}")
@@ -308,7 +959,7 @@ async def main():
     Función principal que orquesta el proceso completo de scraping, limpieza y almacenamiento de datos.
 
     Flujo de ejecución:
-    1. Obtiene todas las URLs de productos desde Mercado Libre, realizando paginación.
+    1. Obtiene todas las URLs de productos desde Mercado Libre, realizando paginación concurrente.
     2. Realiza scraping asincrónico sobre cada URL encontrada.
     3. Limpia y estructura los datos extraídos.
     4. Guarda los datos limpios en un archivo CSV con nombre dinámico basado en la fecha/hora actual.
@@ -316,14 +967,22 @@ async def main():
     Variables utilizadas (importadas desde config):
         - ARTICULO (str): Término de búsqueda.
         - MAX_PAGINAS (int): Cantidad máxima de páginas a recorrer.
-        - CONCURRENCY_LIMIT (int): Límite de peticiones concurrentes.
+        - CONCURRENCY_LIMIT (int): Límite máximo de peticiones concurrentes del control adaptativo.
+        - TIPO_EXECUTOR_PARSEO / WORKERS_PARSEO: Pool donde se ejecuta el parseo de HTML.
+        - PARSER_HTML (str): Backend de parseo de HTML.
 
     Nota:
         Esta función no retorna nada. Ejecuta acciones con efectos secundarios (impresiones y escritura de archivos).
         Debe ser llamada dentro de un entorno asincrónico usando `asyncio.run(main())`.
     """
-    lista_urls = obtener_url_todos_los_articulos(ARTICULO, MAX_PAGINAS)
-    datos_scrapeados = await scrapear_lista_articulos_async(lista_urls, CONCURRENCY_LIMIT)
+    semaphore = LimitadorAdaptativo(maximo=CONCURRENCY_LIMIT)
+    with crear_executor_parseo() as executor:
+        try:
+            session = await obtener_sesion()
+            lista_urls = await obtener_url_todos_los_articulos_async(ARTICULO, MAX_PAGINAS, CONCURRENCY_LIMIT, session, semaphore, executor)
+            datos_scrapeados = await scrapear_lista_articulos_async(lista_urls, CONCURRENCY_LIMIT, session, semaphore, executor)
+        finally:
+            await cerrar_sesion()
     datos_limpios = limpiar_datos_articulos(datos_scrapeados)
     guardar_en_csv(datos_limpios, "mercado_libre")
 #
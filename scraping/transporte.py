@@ -0,0 +1,117 @@
+# TRANSPORTE HTTP COMPARTIDO POR TODAS LAS ETAPAS
+#
+# Un único pool de conexiones por proceso: la sesión aiohttp (paginación y artículos) y la
+# sesión de requests (ruta sincrónica y carga a la API) se crean una sola vez y se reutilizan,
+# de modo que las conexiones TCP/TLS quedan abiertas (keep-alive) entre peticiones en lugar de
+# pagar un nuevo handshake por cada una.
+# aiohttp y requests se importan al crear cada sesión, para que importar el scraper sea inmediato.
+
+from scraping.config import (
+    LIMITE_CONEXIONES, LIMITE_CONEXIONES_POR_HOST, TTL_CACHE_DNS, KEEPALIVE_SEGUNDOS, TAM_MAX_RESPUESTA
+)
+
+# Encabezado para recibir las respuestas comprimidas (aiohttp y requests las descomprimen)
+ENCABEZADOS_TRANSPORTE = {"Accept-Encoding": "gzip, deflate"}
+
+_sesion = None
+_sesion_sync = None
+
+
+class RespuestaDemasiadoGrande(Exception):
+    """La respuesta supera TAM_MAX_RESPUESTA bytes."""
+
+
+def crear_connector():
+    """
+    Crea el `aiohttp.TCPConnector` ajustado para el scraper.
+
+    Returns:
+        aiohttp.TCPConnector: Connector con límite total y por host de conexiones simultáneas,
+            caché de DNS de TTL_CACHE_DNS segundos y conexiones keep-alive de KEEPALIVE_SEGUNDOS.
+    """
+    import aiohttp
+
+    return aiohttp.TCPConnector(
+        limit=LIMITE_CONEXIONES,
+        limit_per_host=LIMITE_CONEXIONES_POR_HOST,
+        ttl_dns_cache=TTL_CACHE_DNS,
+        keepalive_timeout=KEEPALIVE_SEGUNDOS,
+    )
+
+
+async def obtener_sesion():
+    """
+    Devuelve la sesión aiohttp compartida del proceso, creándola en el primer uso.
+
+    Debe llamarse dentro del event loop que la va a usar. Al terminar, se cierra con `cerrar_sesion`.
+
+    Returns:
+        aiohttp.ClientSession: Sesión con el connector de `crear_connector`.
+    """
+    global _sesion
+    if _sesion is None or _sesion.closed:
+        import aiohttp
+
+        _sesion = aiohttp.ClientSession(connector=crear_connector(), headers=ENCABEZADOS_TRANSPORTE)
+    return _sesion
+
+
+async def cerrar_sesion():
+    """Cierra la sesión aiohttp compartida y sus conexiones, si existe."""
+    global _sesion
+    if _sesion is not None:
+        await _sesion.close()
+        _sesion = None
+
+
+def obtener_sesion_sync():
+    """
+    Devuelve la sesión de `requests` compartida del proceso, creándola en el primer uso.
+
+    Se usa en la ruta sincrónica del scraper y en las peticiones a la API REST. Su pool admite
+    LIMITE_CONEXIONES_POR_HOST conexiones por host, por lo que puede usarse desde varios hilos
+    (por ejemplo, con `asyncio.to_thread`).
+
+    Returns:
+        requests.Session: Sesión con conexiones keep-alive reutilizables.
+    """
+    global _sesion_sync
+    if _sesion_sync is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _sesion_sync = requests.Session()
+        _sesion_sync.headers.update(ENCABEZADOS_TRANSPORTE)
+        adaptador = HTTPAdapter(pool_connections=LIMITE_CONEXIONES_POR_HOST, pool_maxsize=LIMITE_CONEXIONES_POR_HOST)
+        _sesion_sync.mount("http://", adaptador)
+        _sesion_sync.mount("https://", adaptador)
+    return _sesion_sync
+
+
+async def leer_cuerpo(response, tam_max=TAM_MAX_RESPUESTA):
+    """
+    Lee el cuerpo de una respuesta aiohttp sin superar un tamaño máximo.
+
+    Si el encabezado Content-Length ya indica un tamaño mayor, no se descarga nada; si no lo
+    indica, se corta la lectura apenas se supera el máximo.
+
+    Args:
+        response (aiohttp.ClientResponse): Respuesta a leer.
+        tam_max (int, optional): Tamaño máximo en bytes (ya descomprimido).
+
+    Returns:
+        bytes: Contenido de la respuesta.
+
+    Raises:
+        RespuestaDemasiadoGrande: Si el cuerpo supera `tam_max` bytes.
+    """
+    if response.content_length is not None and response.content_length > tam_max:
+        raise RespuestaDemasiadoGrande(f"{response.content_length} bytes")
+    partes = []
+    leidos = 0
+    async for parte in response.content.iter_chunked(64 * 1024):
+        leidos += len(parte)
+        if leidos > tam_max:
+            raise RespuestaDemasiadoGrande(f"más de {tam_max} bytes")
+        partes.append(parte)
+    return b"".join(partes)
@@ -1,26 +1,47 @@
 import argparse
-import requests
 import asyncio
 import os
-import pandas as pd
+import time
 from datetime import datetime
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from scraping.config import TAM_COLA, TIPO_EXECUTOR_PARSEO, WORKERS_PARSEO, PARSER_HTML, RUTA_INDICE, CONCURRENCY_LIMIT, LATENCIA_OBJETIVO, MAX_REINTENTOS, DIRECTORIO_CACHE, TTL_CACHE, DOMINIO, RUTA_BITACORA, DIRECTORIO_SALIDA, RUTA_CACHE_ROBOTS, TTL_ROBOTS, URL_LISTADO
+from scraping.bitacora import BitacoraEjecucion, DESCARTADA
+from scraping import metricas
+from scraping.cache import CacheRespuestas
+from scraping.indice import IndiceArticulos
+from scraping.limitador import LimitadorAdaptativo
+from scraping.salidas import SALIDAS, crear_salida
+from scraping.reintentos import FALLOS_REINTENTABLES, TIPOS_FALLO, crear_reporte_fallos
+from scraping.robots import PoliticaRobots
+from scraping.transporte import cerrar_sesion, obtener_sesion, obtener_sesion_sync
+from scraping.parsers import PARSERS
 from scraping.scraper import (
-    obtener_url_todos_los_articulos,
-    scrapear_lista_articulos_async,
-    limpiar_datos_articulos
+    configurar_cache,
+    configurar_robots,
+    configurar_url_listado,
+    crear_executor_parseo,
+    intercalar_flujos,
+    iterar_paginas_articulos_async,
+    scrapear_articulos_stream,
+    limpiar_articulo,
+    extraer_item_id,
+    normalizar_enlace,
+    tarjeta_completa
 )
 
 # Configuración
-API_URL = "http://localhost:8000/registros/"
+API_URL = os.getenv("API_URL", "http://localhost:8000/registros/")  # La variable de entorno API_URL permite apuntar a otra instancia (p. ej. la del benchmark)
+API_URL_BULK = API_URL + "bulk"
+API_URL_EXISTENTES = API_URL + "existentes"
+TAM_LOTE = 500  # Registros por petición en la carga masiva (el backend acepta hasta 5000)
 LOG_FILE = "logs/automation_log.txt"
+INTERVALO_ESTADO = 10  # Segundos entre cada registro en el log de los límites actuales del scraper
 
 
 # Crear carpetas si no existen
 os.makedirs("logs", exist_ok=True)
-os.makedirs("backups", exist_ok=True)
 
 
 def log_mensaje(mensaje):
@@ -34,77 +55,358 @@ def log_mensaje(mensaje):
     with open(LOG_FILE, "a", encoding="utf-8") as f:
         f.write(f"{timestamp} {mensaje}\n")
 
-def obtener_enlaces_existentes():
+def obtener_items_existentes(item_ids):
     """
-    Recupera todos los enlaces de artículos ya registrados en la base de datos a través de la API REST.
+    Consulta a la API REST cuáles de los artículos indicados ya están registrados en la base de datos.
 
-    Utiliza paginación con los parámetros `skip` y `limit` para solicitar todos los registros de la API
-    en bloques sucesivos. Normaliza los enlaces para facilitar la comparación con nuevos registros:
-    - Elimina parámetros (`#` y después).
-    - Elimina `/` al final.
-    - Convierte a minúsculas.
+    Envía solo los item_id del lote actual a `POST /registros/existentes`, que los resuelve con una
+    consulta indexada; así el costo de deduplicar depende del tamaño de la ejecución y no del tamaño
+    de la tabla.
+
+    Args:
+        item_ids (list[str]): IDs de Mercado Libre a verificar (ver `scraping.scraper.extraer_item_id`).
 
     Returns:
-        set: Conjunto de enlaces normalizados (str) correspondientes a artículos ya almacenados en la base de datos.
+        set: Conjunto de item_id (str) que ya están almacenados. Si la consulta falla se devuelve un
+             conjunto vacío y la carga masiva se encarga de omitir los duplicados.
+    """
+    if not item_ids:
+        return set()
+    try:
+        response = obtener_sesion_sync().post(API_URL_EXISTENTES, json={"item_ids": list(item_ids)}, timeout=30)
+        if response.status_code != 200:
+            print(f"Error al consultar registros existentes: {response.status_code}")
+            return set()
+        return set(response.json()["existentes"])
+    except Exception as e:
+        print(f"Excepción al consultar registros existentes: {e}")
+        return set()
+
+def leer_terminos(ruta, paginas=3, dominio=DOMINIO):
+    """
+    Lee el archivo de términos del modo por lotes.
+
+    Cada línea tiene el formato `termino[;paginas[;dominio]]`, por ejemplo `laptop hp;10;com.ar`.
+    Las columnas omitidas o vacías toman los valores por defecto; las líneas vacías y las que
+    empiezan con `#` se ignoran.
+
+    Args:
+        ruta (str): Ruta del archivo de términos (UTF-8).
+        paginas (int, optional): Máximo de páginas de los términos que no lo indican.
+        dominio (str, optional): Dominio de Mercado Libre de los términos que no lo indican.
+
+    Returns:
+        list[dict]: Términos con las claves 'articulo' (str), 'paginas' (int) y 'dominio' (str).
+
+    Raises:
+        ValueError: Si una línea tiene un número de páginas inválido.
+    """
+    terminos = []
+    with open(ruta, encoding="utf-8") as f:
+        for numero, linea in enumerate(f, start=1):
+            linea = linea.strip()
+            if not linea or linea.startswith("#"):
+                continue
+            columnas = [columna.strip() for columna in linea.split(";")]
+            try:
+                paginas_termino = int(columnas[1]) if len(columnas) > 1 and columnas[1] else paginas
+            except ValueError:
+                raise ValueError(f"Número de páginas inválido en la línea {numero} de {ruta}: {columnas[1]}")
+            terminos.append({
+                "articulo": columnas[0],
+                "paginas": paginas_termino,
+                "dominio": columnas[2].lstrip(".") if len(columnas) > 2 and columnas[2] else dominio,
+            })
+    return terminos
+
+
+def descartar_repetidos(elementos, vistos, conteo, clave=lambda elemento: elemento):
+    """
+    Descarta los artículos que ya aparecieron en esta ejecución (en otra página o en otro término).
+
+    Los artículos se identifican por su item_id o, si la URL no lo contiene, por la URL normalizada.
+
+    Args:
+        elementos (list): URLs o tarjetas de una página de resultados.
+        vistos (set): Claves de los artículos ya vistos en la ejecución; se actualiza.
+        conteo (dict): Contadores del pipeline; se incrementa la clave 'repetidos'.
+        clave (callable, optional): Función que obtiene la URL de cada elemento.
+
+    Returns:
+        list: Elementos que no se habían visto, en el mismo orden.
+    """
+    nuevos = []
+    for elemento in elementos:
+        url = clave(elemento)
+        identificador = extraer_item_id(url) or normalizar_enlace(url)
+        if identificador in vistos:
+            conteo["repetidos"] += 1
+            continue
+        vistos.add(identificador)
+        nuevos.append(elemento)
+    return nuevos
+
+
+async def filtrar_conocidos(urls, indice, refrescar_dias, conteo):
+    """
+    Descarta las URLs de artículos que ya están almacenados, antes de descargar sus páginas.
+
+    Los artículos se identifican por el item_id presente en la URL. Primero se consulta el índice
+    local; los IDs que no están en él se consultan a la API (`POST /registros/existentes`) y los que
+    ya existen se agregan al índice si todavía faltan (sin renovar la antigüedad de una entrada que otra
+    tarea haya registrado mientras tanto), que así se sincroniza con la base de datos sin descargarla
+    completa. Los artículos del índice vistos hace más de `refrescar_dias` días no se descartan, para
+    volver a descargarlos y actualizar sus datos. Las URLs sin ID (redirects de seguimiento
+    `click1...`) siempre se descargan: su ID solo se conoce con el enlace canónico de la página.
+
+    Args:
+        urls (list[str]): URLs de artículos encontradas en una página de resultados.
+        indice (IndiceArticulos): Índice local de artículos conocidos.
+        refrescar_dias (float or None): Antigüedad en días a partir de la cual se vuelve a descargar un artículo.
+        conteo (dict): Contadores del pipeline; se incrementa la clave 'omitidos'.
+
+    Returns:
+        list[str]: URLs de artículos nuevos o vencidos que sí deben descargarse.
+    """
+    item_ids = {url: extraer_item_id(url) for url in urls}
+    con_id = {item_id for item_id in item_ids.values() if item_id}
+    en_indice = indice.conocidos(con_id)
+    vigentes = indice.conocidos(en_indice, refrescar_dias)
+
+    desconocidos = [item_id for item_id in con_id if item_id not in en_indice]
+    existentes = await asyncio.to_thread(obtener_items_existentes, desconocidos)
+    indice.registrar_faltantes(existentes)
+
+    omitir = vigentes | existentes
+    conteo["omitidos"] += sum(1 for item_id in item_ids.values() if item_id in omitir)
+    return [url for url, item_id in item_ids.items() if item_id not in omitir]
+
+
+async def separar_tarjetas(tarjetas, args, conteo, indice=None):
+    """
+    Modo "listado": arma los registros a partir de las tarjetas de una página de resultados y
+    decide qué artículos necesitan de todas formas la descarga de su página.
+
+    Se descarga la página de un artículo solo si su tarjeta no trae alguno de los campos obligatorios
+    (ver `scraping.scraper.CAMPOS_TARJETA`), si su enlace no contiene el item_id (redirects de
+    seguimiento `click1...`) o, con `--detalle_nuevos`, si el artículo aún no está almacenado, para
+    obtener su descripción. Con `--solo_nuevos` los artículos ya conocidos se omiten igual que en el
+    modo completo.
+
+    Args:
+        tarjetas (list[dict]): Tarjetas de una página de resultados (ver `scraping.scraper.extraer_tarjetas`).
+        args (argparse.Namespace): Argumentos de la CLI (usa `detalle_nuevos` y `refrescar_dias`).
+        conteo (dict): Contadores del pipeline; se incrementa la clave 'omitidos'.
+        indice (IndiceArticulos, optional): Índice local de artículos conocidos (modo "solo nuevos").
+
+    Returns:
+        tuple:
+            list[dict]: Registros limpios armados desde las tarjetas.
+            list[str]: URLs de los artículos cuya página se debe descargar.
+    """
+    por_url = {tarjeta["enlace_articulo"]: tarjeta for tarjeta in tarjetas}
+    urls = list(por_url)
+    if indice is not None:
+        urls = await filtrar_conocidos(urls, indice, args.refrescar_dias, conteo)
+
+    existentes = set()
+    if args.detalle_nuevos:
+        item_ids = {extraer_item_id(url) for url in urls} - {None}
+        if indice is not None:
+            # Tras filtrar_conocidos, los que siguen en el índice son conocidos que se están refrescando
+            existentes = indice.conocidos(item_ids)
+        else:
+            existentes = await asyncio.to_thread(obtener_items_existentes, item_ids)
+
+    registros = []
+    urls_detalle = []
+    for url in urls:
+        tarjeta = por_url[url]
+        registro = limpiar_articulo(tarjeta) if tarjeta_completa(tarjeta) else None
+        if registro is None or (args.detalle_nuevos and registro["item_id"] not in existentes):
+            urls_detalle.append(url)
+        else:
+            registros.append(registro)
+    return registros, urls_detalle
+
+
+async def descubrir_urls(args, termino, session, semaphore, executor, conteo, indice=None, fallos=None, emitir=None, vistos=None, bitacora=None, origen=None):
+    """
+    Etapa inicial del pipeline: entrega las URLs de artículos a medida que se descargan las páginas de resultados.
+
+    Los artículos repetidos en la ejecución (por ejemplo, los que aparecen en varios términos del
+    modo por lotes) se descartan antes de descargarlos.
+
+    En el modo "listado" (`--modo listado`) los registros que se pueden armar con las tarjetas del
+    listado se entregan directamente a `emitir` y solo se devuelven las URLs de los artículos cuya
+    página hace falta descargar (ver `separar_tarjetas`).
+
+    Args:
+        args (argparse.Namespace): Argumentos de la CLI (usa `concurrencia`, `reintentos`, `refrescar_dias`, `modo` y `detalle_nuevos`).
+        termino (dict): Búsqueda a recorrer, con las claves 'articulo', 'paginas' y 'dominio' (ver `leer_terminos`).
+        session (aiohttp.ClientSession): Sesión HTTP compartida con el scraping de artículos.
+        semaphore (LimitadorAdaptativo): Limitador compartido con el scraping de artículos.
+        executor (concurrent.futures.Executor): Pool donde se analiza el HTML de los listados.
+        conteo (dict): Contadores del pipeline; se incrementan las claves 'encontrados', 'repetidos' y 'desde_listado'.
+        indice (IndiceArticulos, optional): Si se entrega (modo "solo nuevos"), se omiten los artículos ya conocidos.
+        fallos (dict, optional): Reporte de fallos de la ejecución, donde se cuentan las páginas de resultados perdidas.
+        emitir (callable, optional): Corrutina que recibe cada registro armado desde el listado y su término
+            (`emitir(registro, termino=...)`). Obligatoria en el modo "listado".
+        vistos (set, optional): Artículos ya vistos en la ejecución, compartido entre los términos.
+        bitacora (BitacoraEjecucion, optional): Bitácora donde se registran las URLs descubiertas.
+        origen (dict, optional): Se completa con el término de búsqueda de cada URL entregada ({url: termino}).
+
+    Yields:
+        str: URL de cada artículo a descargar.
     """
-    enlaces = set()
-    skip = 0
-    limit = 1000
+    modo_listado = args.modo == "listado"
+    if vistos is None:
+        vistos = set()
+    async for _, elementos in iterar_paginas_articulos_async(termino["articulo"], termino["paginas"], args.concurrencia, session, semaphore, executor, fallos, args.reintentos, modo_listado, termino["dominio"]):
+        conteo["encontrados"] += len(elementos)
+        if modo_listado:
+            elementos = descartar_repetidos(elementos, vistos, conteo, lambda tarjeta: tarjeta["enlace_articulo"])
+            registros, urls = await separar_tarjetas(elementos, args, conteo, indice)
+            conteo["desde_listado"] += len(registros)
+            for registro in registros:
+                await emitir(registro, termino=termino["articulo"])
+        else:
+            urls = descartar_repetidos(elementos, vistos, conteo)
+            if indice is not None:
+                urls = await filtrar_conocidos(urls, indice, args.refrescar_dias, conteo)
+        if bitacora is not None:
+            bitacora.registrar_urls(urls, termino["articulo"])
+        if origen is not None:
+            origen.update((url, termino["articulo"]) for url in urls)
+        for url in urls:
+            yield url
+
 
+async def iterar_lista(elementos):
+    """Entrega los elementos de una lista como un generador asíncrono (para combinarla con otros flujos del pipeline)."""
+    for elemento in elementos:
+        yield elemento
+
+
+async def reportar_limites(limitador, intervalo=INTERVALO_ESTADO):
+    """
+    Registra periódicamente en el log los límites actuales del limitador adaptativo.
+
+    Permite seguir cómo se ajusta la concurrencia y la tasa de cada host durante la ejecución.
+    Se ejecuta hasta que se cancela la tarea.
+
+    Args:
+        limitador (LimitadorAdaptativo): Limitador compartido por la paginación y el scraping.
+        intervalo (float, optional): Segundos entre cada registro.
+
+    Returns:
+        None
+    """
     while True:
-        try:
-            response = requests.get(API_URL, params={"skip": skip, "limit": limit})
-            if response.status_code != 200:
-                print(f"Error al obtener registros existentes: {response.status_code}")
-                break
+        await asyncio.sleep(intervalo)
+        log_mensaje(f"Límites: {limitador.estado()}")
 
-            registros = response.json()
-            if not registros:
-                break
 
-            enlaces.update(r["enlace_articulo"].split("#")[0].strip().rstrip("/").lower() for r in registros)
-            skip += limit
+def reportar_fallos(fallos):
+    """
+    Imprime el resumen de fallos de la ejecución y registra en el log las URLs descartadas.
+
+    Args:
+        fallos (dict): Reporte de fallos completado por el scraper (ver `scraping.reintentos.crear_reporte_fallos`).
 
-        except Exception as e:
-            print(f"Excepción al obtener registros existentes: {e}")
-            break
+    Returns:
+        None
+    """
+    por_tipo = " | ".join(f"{tipo}: {fallos[tipo]}" for tipo in TIPOS_FALLO if fallos[tipo])
+    print(f"{fallos['reintentos']} reintentos | {fallos['recuperados']} recuperados | Descartados: {por_tipo or 'ninguno'}")
+    log_mensaje(f"Fallos: {fallos['reintentos']} reintentos, {fallos['recuperados']} recuperados, descartados: {por_tipo or 'ninguno'}")
+    for url, tipo in fallos["urls_fallidas"]:
+        log_mensaje(f"URL descartada ({tipo}): {url}")
 
-    return enlaces
 
-def enviar_registro(registro, resumen):
+async def subir_registros(cola, resumen, tam_lote=TAM_LOTE, indice=None, bitacora=None):
     """
-    Envía un registro individual a la API REST y actualiza el resumen del proceso según el resultado.
+    Etapa final del pipeline: consume registros limpios desde una cola y los envía a la API por lotes.
 
-    Realiza una petición HTTP POST al endpoint configurado, maneja errores HTTP comunes
-    y captura excepciones generales. También registra en logs en caso de error o excepción.
+    Cada lote agrupa los registros que se acumularon en la cola mientras se enviaba el lote anterior
+    (hasta `tam_lote`), de modo que con scraping lento se envían lotes pequeños sin esperar y con
+    scraping rápido se aprovecha la carga masiva. Se envían también los artículos ya almacenados:
+    el backend compara su precio y calificaciones con los vigentes y solo guarda los cambios en el
+    historial de cada artículo. Las peticiones se ejecutan en un hilo aparte
+    (`asyncio.to_thread`) para no bloquear el event loop. La etapa termina al recibir None en la cola.
 
     Args:
-        registro (dict): Diccionario con los datos del artículo a enviar. 
-            Debe contener al menos 'nombre_articulo' y 'enlace_articulo'.
-        resumen (dict): Diccionario con contadores del proceso, con claves:
-            - 'enviados' (int)
-            - 'duplicados' (int)
-            - 'errores' (int)
+        cola (asyncio.Queue): Cola acotada con los registros limpios a enviar.
+        resumen (dict): Diccionario con contadores del proceso ('enviados', 'actualizados', 'duplicados', 'errores').
+        tam_lote (int, optional): Máximo de registros por petición a la API.
+        indice (IndiceArticulos, optional): Índice local donde se registran los artículos ya almacenados.
+        bitacora (BitacoraEjecucion, optional): Bitácora donde se marcan los registros ya cargados.
 
     Returns:
         None
     """
+    terminado = False
+    while not terminado:
+        lote = []
+        registro = await cola.get()
+        while True:
+            if registro is None:
+                terminado = True
+                break
+            lote.append(registro)
+            if len(lote) >= tam_lote or cola.empty():
+                break
+            registro = cola.get_nowait()
+
+        if not lote or not await asyncio.to_thread(enviar_lote, lote, resumen):
+            continue
+        almacenados = {r["item_id"] for r in lote}
+        if indice is not None:
+            indice.registrar(almacenados)
+        if bitacora is not None:
+            bitacora.marcar_subidos(almacenados)
+
+
+def enviar_lote(lote, resumen):
+    """
+    Envía un lote de registros a la API REST en una sola petición a POST /registros/bulk.
+
+    El backend inserta los registros nuevos con una única sentencia, actualiza los existentes cuyo
+    precio o calificaciones cambiaron y responde el estado de cada registro, con lo que se
+    actualizan los contadores del resumen y las métricas de carga (ver `scraping.metricas`). Si la
+    petición falla, todo el lote se cuenta como error y se registra en el log.
+
+    Args:
+        lote (list[dict]): Registros limpios a enviar.
+        resumen (dict): Diccionario con contadores del proceso ('enviados', 'actualizados', 'duplicados', 'errores').
+
+    Returns:
+        bool: True si el lote quedó almacenado (insertado, actualizado o sin cambios), False si hubo un error.
+    """
+    inicio = time.perf_counter()
     try:
-        response = requests.post(API_URL, json=registro)
-        if response.status_code == 201:
-            print(f"Enviado: {registro['nombre_articulo']}")
-            resumen["enviados"] += 1
-        elif response.status_code == 409:
-            print(f"Duplicado: {registro['nombre_articulo']}")
-            resumen["duplicados"] += 1
-        else:
-            print(f"Error HTTP {response.status_code}: {registro['nombre_articulo']}")
-            resumen["errores"] += 1
-            log_mensaje(f"Error HTTP {response.status_code} - {registro['enlace_articulo']}")
+        response = obtener_sesion_sync().post(API_URL_BULK, json=lote, timeout=60)
+        metricas.DURACION_LOTE.observe(time.perf_counter() - inicio)
+        if response.status_code == 200:
+            resultado = response.json()
+            resumen["enviados"] += resultado["insertados"]
+            resumen["actualizados"] += resultado.get("actualizados", 0)
+            resumen["duplicados"] += resultado["duplicados"]
+            metricas.SUBIDAS.labels("insertado").inc(resultado["insertados"])
+            metricas.SUBIDAS.labels("actualizado").inc(resultado.get("actualizados", 0))
+            metricas.SUBIDAS.labels("sin_cambios").inc(resultado["duplicados"])
+            print(f"Lote enviado: {resultado['insertados']} insertados, {resultado.get('actualizados', 0)} actualizados, {resultado['duplicados']} sin cambios")
+            return True
+        print(f"Error HTTP {response.status_code} al enviar un lote de {len(lote)} registros")
+        resumen["errores"] += len(lote)
+        metricas.SUBIDAS.labels("error").inc(len(lote))
+        log_mensaje(f"Error HTTP {response.status_code} - lote de {len(lote)} registros")
     except Exception as e:
-        print(f"Excepción al enviar {registro['nombre_articulo']}: {e}")
-        resumen["errores"] += 1
-        log_mensaje(f"Excepción: {e} - {registro['enlace_articulo']}")
+        print(f"Excepción al enviar un lote de {len(lote)} registros: {e}")
+        resumen["errores"] += len(lote)
+        metricas.SUBIDAS.labels("error").inc(len(lote))
+        log_mensaje(f"Excepción: {e} - lote de {len(lote)} registros")
+    return False
 
 
 def imprimir_saludo():
@@ -144,63 +446,214 @@ async def main(args):
     """
     Ejecuta el flujo completo de automatización: scraping, limpieza, backup y carga en API REST.
 
+    Las etapas se ejecutan como un pipeline en streaming conectado por colas acotadas, de modo que
+    el primer registro se envía a la API mientras aún se descargan otras páginas y el uso de memoria
+    no crece con el tamaño de la búsqueda.
+
+    En el modo por lotes (`--terminos`) todos los términos se recorren a la vez en el mismo event loop:
+    comparten el pool de conexiones y el límite de concurrencia, sus URLs se intercalan por turnos
+    para que ningún término acapare las descargas y los artículos repetidos entre términos se
+    descargan una sola vez.
+
+    Cada ejecución lleva una bitácora (ver `scraping.bitacora.BitacoraEjecucion`) con las URLs
+    descubiertas, las descargas terminadas, los registros y su carga en la API. Con `--reanudar <run_id>`
+    se continúa una ejecución interrumpida: se cargan los registros que quedaron sin subir, se
+    descargan las URLs pendientes y se vuelven a recorrer los listados omitiendo lo ya obtenido.
+
     Pasos:
-    1. Obtiene las URLs de artículos desde Mercado Libre en función del término y cantidad de páginas.
-    2. Realiza scraping asincrónico de cada URL con concurrencia controlada.
-    3. Limpia y estructura los datos obtenidos.
-    4. (Opcional) Guarda los datos limpios en un archivo CSV con timestamp.
-    5. Consulta los enlaces ya registrados en la base de datos para evitar duplicados.
-    6. Envía los nuevos registros a la API.
-    7. Imprime y registra un resumen final del proceso.
+    1. Obtiene las URLs de artículos desde Mercado Libre en función de cada término y su cantidad de páginas,
+       descargando las páginas de resultados en paralelo.
+    2. Realiza scraping asincrónico de cada URL con concurrencia controlada, a medida que se descubren.
+    3. Limpia y estructura cada artículo obtenido.
+    4. (Opcional) Escribe cada registro limpio en el destino de salida: un CSV con timestamp o un dataset
+       Parquet particionado por término y fecha (ver `scraping.salidas`).
+    5. Envía los registros a la API en lotes (POST /registros/bulk): los nuevos se insertan y los ya
+       registrados solo se actualizan, con una captura en su historial, si cambió su precio o sus calificaciones.
+    6. Imprime y registra un resumen final del proceso y, con `--metricas`, vuelca las métricas de cada
+       etapa (ver `scraping.metricas`) a un archivo de texto.
 
     Args:
         args (argparse.Namespace): Argumentos parseados desde la CLI, que incluyen:
-            - articulo (str): Término de búsqueda.
-            - paginas (int): Número máximo de páginas a scrapear.
-            - concurrencia (int): Límite de peticiones simultáneas.
-            - guardar_csv (bool): Si se activa, guarda un CSV de respaldo.
+            - articulo (str): Término de búsqueda (si no se usa `terminos`).
+            - terminos (str): Archivo de términos del modo por lotes (ver `leer_terminos`).
+            - paginas (int): Número máximo de páginas a scrapear (por término, si el archivo no lo indica).
+            - dominio (str): Dominio de Mercado Libre (por término, si el archivo no lo indica).
+            - reanudar (str): run_id de una ejecución interrumpida a continuar (en lugar de `articulo` o `terminos`).
+            - bitacora (str): Ruta de la bitácora de ejecuciones.
+            - concurrencia (int): Peticiones simultáneas con las que arranca el control adaptativo.
+            - concurrencia_max (int): Máximo de peticiones simultáneas del control adaptativo.
+            - reintentos (int): Reintentos por página ante fallos transitorios.
+            - latencia_objetivo (float): Latencia por encima de la cual no se aumenta la concurrencia.
+            - salida (str): Destino de los registros limpios ("csv" o "parquet"); None para no guardarlos.
+            - guardar_csv (bool): Equivale a `salida="csv"`.
+            - dir_salida (str): Carpeta del destino de salida.
+            - tam_cola (int): Tamaño máximo de las colas del pipeline.
+            - tam_lote (int): Registros por petición en la carga masiva a la API.
+            - solo_nuevos (bool): Si se activa, no se descargan los artículos ya almacenados.
+            - refrescar_dias (float): Antigüedad en días a partir de la cual se vuelve a descargar un artículo conocido.
+            - indice (str): Ruta del índice local de artículos conocidos.
+            - modo (str): "completo" descarga la página de cada artículo; "listado" arma los registros con las
+              tarjetas del listado y solo descarga las páginas necesarias.
+            - detalle_nuevos (bool): En el modo "listado", descarga también la página de los artículos nuevos.
+            - cache (bool): Si se activa, las páginas descargadas se guardan y reutilizan desde una caché en disco.
+            - cache_dir (str): Carpeta de la caché en disco.
+            - cache_ttl (float): Segundos durante los que una página guardada se usa sin consultar el servidor.
+            - replay (bool): Si se activa, las páginas se leen solo de la caché, sin usar la red.
+            - url_listado (str): Base de las URLs de las páginas de resultados (`{dominio}` se reemplaza por el dominio).
+            - ignorar_robots (bool): Si se activa, no se consulta el robots.txt antes de descargar.
+            - robots_cache (str): Archivo donde se guardan los robots.txt descargados.
+            - robots_ttl (float): Segundos durante los que un robots.txt guardado se usa sin volver a descargarlo.
+            - tipo_parseo (str): Tipo de pool para el parseo de HTML ("proceso" o "hilo").
+            - workers_parseo (int): Cantidad de workers de parseo.
+            - parser (str): Backend de parseo de HTML.
+            - metricas (str): Archivo donde se vuelcan las métricas al terminar (None para no volcarlas).
 
     Returns:
         None
     """
-    resumen = {"enviados": 0, "duplicados": 0, "errores": 0}
+    resumen = {"enviados": 0, "actualizados": 0, "duplicados": 0, "errores": 0}
+    conteo = {"encontrados": 0, "repetidos": 0, "reanudados": 0, "omitidos": 0, "desde_listado": 0, "scrapeados": 0, "limpiados": 0}
+    fallos = crear_reporte_fallos()
 
     imprimir_saludo()
 
-    log_mensaje(f"Inicio de proceso: artículo='{args.articulo}', páginas={args.paginas}")
-
-    print(f"\nBuscando '{args.articulo}' en Mercado Libre...")
-    urls = obtener_url_todos_los_articulos(args.articulo, args.paginas)
-    print(f"{len(urls)} enlaces encontrados.")
-
-    datos_scrapeados = await scrapear_lista_articulos_async(urls, args.concurrencia)
-    print(f"{len(datos_scrapeados)} artículos scrapeados.")
-
-    datos_limpios = limpiar_datos_articulos(datos_scrapeados)
-    print(f"{len(datos_limpios)} artículos limpiados.")
-
-    if args.guardar_csv:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"backups/dataset_{args.articulo.replace(' ', '_')}_{timestamp}.csv"
-        pd.DataFrame(datos_limpios).to_csv(filename, index=False)
-        print(f"CSV guardado en: {filename}")
-        log_mensaje(f"CSV guardado: {filename}")
-
-    # Obtener enlaces existentes desde la API antes de enviar
-    enlaces_existentes = obtener_enlaces_existentes()
-    print(f"{len(enlaces_existentes)} enlaces ya registrados en la base de datos.")
-
-    print(f"Enviando artículos a la API...")
-    for registro in datos_limpios:
-        if registro["enlace_articulo"] in enlaces_existentes:
-            print(f"Duplicado (omitido antes de enviar): {registro['nombre_articulo']}")
-            resumen["duplicados"] += 1
-            continue
-        enviar_registro(registro, resumen)
-
+    if args.reanudar:
+        bitacora = BitacoraEjecucion.abrir(args.bitacora, args.reanudar)
+        if bitacora.estado == "completada":
+            print(f"La ejecución {args.reanudar} ya está completada.")
+            bitacora.cerrar()
+            return
+        # Se conservan las búsquedas y el modo de la ejecución original
+        terminos = bitacora.terminos
+        args.modo = bitacora.parametros["modo"]
+        args.detalle_nuevos = bitacora.parametros["detalle_nuevos"]
+        nombre_busqueda = bitacora.run_id
+        log_mensaje(f"Reanudando la ejecución {bitacora.run_id}: {bitacora.resumen()}")
+    elif args.terminos:
+        terminos = leer_terminos(args.terminos, args.paginas, args.dominio)
+        nombre_busqueda = os.path.splitext(os.path.basename(args.terminos))[0]
+        log_mensaje(f"Inicio de proceso por lotes: {len(terminos)} términos de '{args.terminos}'")
+    else:
+        terminos = [{"articulo": args.articulo, "paginas": args.paginas, "dominio": args.dominio}]
+        nombre_busqueda = args.articulo
+        log_mensaje(f"Inicio de proceso: artículo='{args.articulo}', páginas={args.paginas}")
+    if not args.reanudar:
+        bitacora = BitacoraEjecucion.nueva(args.bitacora, terminos, {"modo": args.modo, "detalle_nuevos": args.detalle_nuevos})
+    print(f"Ejecución {bitacora.run_id} (para continuarla si se interrumpe: --reanudar {bitacora.run_id})")
+
+    # Todo lo que abre archivos o conexiones se crea dentro del try, para que el finally los cierre
+    # aunque la preparación falle (p. ej. --salida parquet sin pyarrow o una carpeta de caché inválida)
+    salida = indice = cache = tarea_subida = semaphore = tarea_limites = None
+    try:
+        # Destino local de los registros limpios, escritos a medida que se producen
+        formato_salida = args.salida or ("csv" if args.guardar_csv else None)
+        salida = crear_salida(formato_salida, args.dir_salida, nombre_busqueda) if formato_salida else None
+
+        # Modo "solo nuevos": índice local de artículos conocidos, consultado antes de descargar
+        indice = IndiceArticulos(args.indice) if args.solo_nuevos else None
+
+        # Caché en disco de las páginas descargadas; en modo replay se usa sin conexión
+        if args.cache or args.replay:
+            cache = CacheRespuestas(args.cache_dir, args.cache_ttl, replay=args.replay)
+            configurar_cache(cache)
+
+        configurar_url_listado(args.url_listado)
+
+        # robots.txt de cada sitio, descargado en la primera petición a él y guardado en disco
+        configurar_robots(None if args.ignorar_robots else PoliticaRobots(args.robots_cache, args.robots_ttl))
+
+        cola_subida = asyncio.Queue(maxsize=args.tam_cola)
+        tarea_subida = asyncio.create_task(subir_registros(cola_subida, resumen, args.tam_lote, indice, bitacora))
+
+        # Término de búsqueda de cada URL en curso, para particionar la salida
+        origen = {}
+
+        async def emitir(registro, url=None, termino=None):
+            # Destino común de los registros limpios, vengan de la página del artículo o del listado
+            conteo["limpiados"] += 1
+            bitacora.guardar_registro(registro, url)
+            if url is not None:
+                termino = origen.pop(url, termino)
+            if salida is not None:
+                salida.escribir(registro, termino or nombre_busqueda)
+            await cola_subida.put(registro)
+
+        # Al reanudar, lo ya obtenido no se vuelve a descargar: las URLs y los artículos de la bitácora
+        # se marcan como vistos y solo se descargan las URLs pendientes
+        vistos = set(bitacora.item_ids_guardados())
+        vistos.update(extraer_item_id(url) or normalizar_enlace(url) for url in bitacora.urls_registradas())
+        origen.update(bitacora.terminos_pendientes())
+        pendientes = list(origen)
+
+        print(f"\nBuscando {', '.join(repr(termino['articulo']) for termino in terminos)} en Mercado Libre y enviando artículos a la API...")
+
+        # La paginación y el scraping de artículos comparten el pool de conexiones (scraping/transporte.py)
+        # y el limitador de concurrencia, que se ajusta según las respuestas del servidor (scraping/limitador.py)
+        # El parseo de HTML se ejecuta en un pool aparte para no bloquear las descargas
+        semaphore = LimitadorAdaptativo(args.concurrencia, maximo=args.concurrencia_max, latencia_objetivo=args.latencia_objetivo)
+        tarea_limites = asyncio.create_task(reportar_limites(semaphore))
+        for registro in bitacora.registros_sin_subir():
+            conteo["reanudados"] += 1
+            await cola_subida.put(registro)
+        with crear_executor_parseo(args.tipo_parseo, args.workers_parseo, args.parser) as executor:
+            session = await obtener_sesion()
+            flujos = [descubrir_urls(args, termino, session, semaphore, executor, conteo, indice, fallos, emitir, vistos, bitacora, origen) for termino in terminos]
+            if pendientes:
+                flujos.insert(0, iterar_lista(pendientes))
+            urls = flujos[0] if len(flujos) == 1 else intercalar_flujos(flujos, args.tam_cola)
+            async for articulo in scrapear_articulos_stream(urls, args.concurrencia_max, session, semaphore, args.tam_cola, executor, fallos, args.reintentos):
+                conteo["scrapeados"] += 1
+                registro = limpiar_articulo(articulo)
+                if registro is None:
+                    bitacora.marcar_url(articulo["enlace_articulo"], DESCARTADA)
+                    origen.pop(articulo["enlace_articulo"], None)
+                    continue
+                await emitir(registro, articulo["enlace_articulo"])
+
+        await cola_subida.put(None)
+        await tarea_subida
+
+        # Las URLs descartadas por fallos permanentes (404, etc.) no se reintentan al reanudar
+        for url, tipo in fallos["urls_fallidas"]:
+            if tipo not in FALLOS_REINTENTABLES and tipo != "sin_cache":
+                bitacora.marcar_url(url, DESCARTADA)
+        estado_bitacora = bitacora.resumen()
+        if estado_bitacora["pendiente"] == 0 and estado_bitacora["subidos"] == estado_bitacora["registros"]:
+            bitacora.finalizar()
+        else:
+            print(f"Quedaron {estado_bitacora['pendiente']} URLs y {estado_bitacora['registros'] - estado_bitacora['subidos']} registros pendientes; se pueden reintentar con --reanudar {bitacora.run_id}")
+    finally:
+        if tarea_subida is not None:
+            tarea_subida.cancel()
+        bitacora.cerrar()
+        await cerrar_sesion()
+        if tarea_limites is not None:
+            tarea_limites.cancel()
+        if indice is not None:
+            indice.cerrar()
+        if cache is not None:
+            configurar_cache(None)
+            cache.cerrar()
+        if salida is not None:
+            ruta_salida = salida.cerrar()
+            print(f"Salida {formato_salida} guardada en: {ruta_salida}")
+            log_mensaje(f"Salida {formato_salida} guardada: {ruta_salida}")
+        # Se vuelcan también si la ejecución se interrumpe, para ver hasta dónde llegó cada etapa
+        if args.metricas:
+            metricas.escribir_snapshot(args.metricas)
+            log_mensaje(f"Métricas guardadas: {args.metricas}")
+
+    if semaphore is not None:
+        estado = semaphore.estado()
+        print(f"Concurrencia final: {estado['concurrencia']} (mín. {estado['concurrencia_minima']}, máx. {estado['concurrencia_maxima']}) | Tasas por host: {estado['tasas']} | Respuestas: {estado['respuestas']}")
+        log_mensaje(f"Límites finales: {estado}")
+    reportar_fallos(fallos)
+    if conteo["reanudados"] or pendientes:
+        print(f"Reanudación: {conteo['reanudados']} registros sin subir recuperados | {len(pendientes)} URLs pendientes")
+    print(f"{conteo['encontrados']} enlaces encontrados | {conteo['repetidos']} repetidos | {conteo['omitidos']} ya conocidos omitidos | {conteo['desde_listado']} armados desde el listado | {conteo['scrapeados']} artículos scrapeados | {conteo['limpiados']} artículos limpiados.")
     print("\nAutomatización completada.")
-    print(f"{resumen['enviados']} enviados | {resumen['duplicados']} duplicados | {resumen['errores']} errores")
-    log_mensaje(f"Resumen: {resumen['enviados']} enviados, {resumen['duplicados']} duplicados, {resumen['errores']} errores.\n")
+    print(f"{resumen['enviados']} enviados | {resumen['actualizados']} actualizados | {resumen['duplicados']} sin cambios | {resumen['errores']} errores")
+    log_mensaje(f"Resumen: {resumen['enviados']} enviados, {resumen['actualizados']} actualizados, {resumen['duplicados']} sin cambios, {resumen['errores']} errores.\n")
 
 
 
@@ -212,18 +665,81 @@ if __name__ == "__main__":
     # usando argparse, para controlar el scraping y la carga de datos.
     #
     # Argumentos:
-    # --articulo       (str): Término de búsqueda.
-    # --paginas        (int): Número máximo de páginas a scrapear (default=3).
-    # --concurrencia   (int): Número de peticiones simultáneas (default=10).
-    # --guardar_csv    (flag): Si se activa, guarda los resultados en un archivo CSV.
+    # --articulo       (str): Término de búsqueda (o bien --terminos).
+    # --terminos       (str): Archivo con un término por línea, "termino[;paginas[;dominio]]", para buscarlos todos
+    #                         en la misma ejecución compartiendo conexiones y concurrencia (o bien --articulo).
+    # --paginas        (int): Número máximo de páginas a scrapear por término (default=3).
+    # --dominio        (str): Dominio de Mercado Libre donde buscar, p. ej. com.co o com.ar (default=DOMINIO).
+    # --reanudar       (str): run_id de una ejecución interrumpida a continuar, sin volver a descargar lo ya obtenido
+    #                         (o bien --articulo / --terminos).
+    # --bitacora       (str): Ruta de la bitácora de ejecuciones (default=RUTA_BITACORA).
+    # --concurrencia   (int): Peticiones simultáneas iniciales; luego se ajustan según las respuestas (default=10).
+    # --concurrencia_max (int): Máximo de peticiones simultáneas del control adaptativo (default=CONCURRENCY_LIMIT).
+    # --latencia_objetivo (float): Segundos por respuesta por encima de los cuales no se aumenta la concurrencia (default=LATENCIA_OBJETIVO).
+    # --reintentos     (int): Reintentos por página ante timeouts, conexiones cortadas, 429, 5xx y respuestas vacías (default=MAX_REINTENTOS).
+    # --salida         (str): Guarda los registros limpios en "csv" (un archivo por ejecución) o "parquet"
+    #                         (dataset particionado por término y fecha, requiere pyarrow).
+    # --guardar_csv    (flag): Equivale a --salida csv.
+    # --dir_salida     (str): Carpeta de la salida (default=DIRECTORIO_SALIDA).
+    # --tam_cola       (int): Tamaño máximo de las colas del pipeline (default=TAM_COLA).
+    # --tipo_parseo    (str): Pool para parsear HTML: "proceso" o "hilo" (default=TIPO_EXECUTOR_PARSEO).
+    # --workers_parseo (int): Cantidad de workers de parseo (default=núcleos de la máquina).
+    # --parser         (str): Backend de parseo de HTML: bs4, bs4-lxml o selectolax (default=PARSER_HTML).
+    # --tam_lote       (int): Registros por petición en la carga masiva a la API (default=TAM_LOTE).
+    # --solo_nuevos    (flag): Si se activa, omite antes de descargar los artículos ya almacenados.
+    # --refrescar_dias (float): Con --solo_nuevos, vuelve a descargar artículos vistos hace más de N días.
+    # --indice         (str): Ruta del índice local de artículos conocidos (default=RUTA_INDICE).
+    # --modo           (str): "completo" descarga la página de cada artículo; "listado" arma los registros con las
+    #                         tarjetas del listado y solo descarga las páginas a las que les faltan campos (default=completo).
+    # --detalle_nuevos (flag): Con --modo listado, descarga también la página de los artículos aún no almacenados (descripción).
+    # --cache          (flag): Si se activa, guarda las páginas descargadas en una caché en disco y las reutiliza.
+    # --cache_dir      (str): Carpeta de la caché en disco (default=DIRECTORIO_CACHE).
+    # --cache_ttl      (float): Segundos durante los que una página guardada se usa sin revalidarla (default=TTL_CACHE).
+    # --replay         (flag): Lee las páginas solo de la caché, sin usar la red (implica --cache).
+    # --url_listado    (str): Base de las páginas de resultados, con {dominio} (default=URL_LISTADO); p. ej. http://127.0.0.1:8765
+    #                         para usar el servidor de scripts/servidor_simulado.py.
+    # --ignorar_robots (flag): No consulta el robots.txt de cada sitio antes de descargar (solo para pruebas contra servidores propios).
+    # --robots_cache   (str): Archivo donde se guardan los robots.txt descargados (default=RUTA_CACHE_ROBOTS).
+    # --robots_ttl     (float): Segundos durante los que un robots.txt guardado se usa sin volver a descargarlo (default=TTL_ROBOTS).
+    # --metricas       (str): Archivo donde se vuelcan al terminar las métricas de cada etapa, en formato de texto
+    #                         de Prometheus (p. ej. logs/scraper.prom, para el textfile collector de node_exporter).
     #
     # Ejecuta la función principal 'main(args)' en un entorno asincrónico.
     parser = argparse.ArgumentParser(description="Automatización de scraping y carga en API REST con backups y logs.")
 
-    parser.add_argument("--articulo", required=True, help="Artículo a buscar")
-    parser.add_argument("--paginas", type=int, default=3, help="Cantidad de páginas a scrapear")
-    parser.add_argument("--concurrencia", type=int, default=10, help="Número de peticiones simultáneas (concurrency limit)")
-    parser.add_argument("--guardar_csv", action="store_true", help="Guardar resultados en CSV")
+    busqueda = parser.add_mutually_exclusive_group(required=True)
+    busqueda.add_argument("--articulo", help="Artículo a buscar")
+    busqueda.add_argument("--terminos", help="Archivo de términos (termino[;paginas[;dominio]] por línea) para el modo por lotes")
+    busqueda.add_argument("--reanudar", metavar="RUN_ID", help="Continuar una ejecución interrumpida")
+    parser.add_argument("--paginas", type=int, default=3, help="Cantidad de páginas a scrapear por término")
+    parser.add_argument("--dominio", default=DOMINIO, help="Dominio de Mercado Libre (com.co, com.ar, ...)")
+    parser.add_argument("--bitacora", default=RUTA_BITACORA, help="Ruta de la bitácora de ejecuciones")
+    parser.add_argument("--concurrencia", type=int, default=10, help="Número inicial de peticiones simultáneas (se ajusta automáticamente)")
+    parser.add_argument("--concurrencia_max", type=int, default=CONCURRENCY_LIMIT, help="Máximo de peticiones simultáneas del control adaptativo")
+    parser.add_argument("--latencia_objetivo", type=float, default=LATENCIA_OBJETIVO, help="Latencia (s) por encima de la cual no se aumenta la concurrencia")
+    parser.add_argument("--reintentos", type=int, default=MAX_REINTENTOS, help="Reintentos por página ante fallos transitorios")
+    parser.add_argument("--salida", choices=list(SALIDAS), default=None, help="Guardar los registros limpios en CSV o en un dataset Parquet")
+    parser.add_argument("--guardar_csv", action="store_true", help="Guardar resultados en CSV (equivale a --salida csv)")
+    parser.add_argument("--dir_salida", default=DIRECTORIO_SALIDA, help="Carpeta donde se guarda la salida")
+    parser.add_argument("--tam_cola", type=int, default=TAM_COLA, help="Tamaño máximo de las colas del pipeline (backpressure)")
+    parser.add_argument("--tipo_parseo", choices=["proceso", "hilo"], default=TIPO_EXECUTOR_PARSEO, help="Tipo de pool donde se parsea el HTML")
+    parser.add_argument("--workers_parseo", type=int, default=WORKERS_PARSEO, help="Cantidad de workers de parseo (por defecto, núcleos de la máquina)")
+    parser.add_argument("--parser", choices=list(PARSERS), default=PARSER_HTML, help="Backend de parseo de HTML")
+    parser.add_argument("--tam_lote", type=int, default=TAM_LOTE, help="Registros por petición en la carga masiva a la API")
+    parser.add_argument("--solo_nuevos", action="store_true", help="Omitir antes de descargar los artículos ya almacenados")
+    parser.add_argument("--refrescar_dias", type=float, default=None, help="Con --solo_nuevos, volver a descargar artículos vistos hace más de N días")
+    parser.add_argument("--indice", default=RUTA_INDICE, help="Ruta del índice local de artículos conocidos")
+    parser.add_argument("--modo", choices=["completo", "listado"], default="completo", help="completo: descargar cada artículo; listado: usar las tarjetas del listado")
+    parser.add_argument("--detalle_nuevos", action="store_true", help="Con --modo listado, descargar también la página de los artículos nuevos")
+    parser.add_argument("--cache", action="store_true", help="Guardar y reutilizar las páginas descargadas en una caché en disco")
+    parser.add_argument("--cache_dir", default=DIRECTORIO_CACHE, help="Carpeta de la caché en disco")
+    parser.add_argument("--cache_ttl", type=float, default=TTL_CACHE, help="Segundos durante los que una página guardada se usa sin revalidarla")
+    parser.add_argument("--replay", action="store_true", help="Leer las páginas solo de la caché, sin usar la red (implica --cache)")
+    parser.add_argument("--url_listado", default=URL_LISTADO, help="Base de las páginas de resultados ({dominio} se reemplaza por el dominio)")
+    parser.add_argument("--ignorar_robots", action="store_true", help="No consultar el robots.txt antes de descargar")
+    parser.add_argument("--robots_cache", default=RUTA_CACHE_ROBOTS, help="Archivo donde se guardan los robots.txt descargados")
+    parser.add_argument("--robots_ttl", type=float, default=TTL_ROBOTS, help="Segundos durante los que un robots.txt guardado se usa sin volver a descargarlo")
+    parser.add_argument("--metricas", default=None, help="Archivo donde volcar las métricas de la ejecución (formato Prometheus)")
 
     args = parser.parse_args()
     asyncio.run(main(args))
\ No newline at end of file
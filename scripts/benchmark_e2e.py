@@ -0,0 +1,344 @@
+# BENCHMARK DE EXTREMO A EXTREMO DEL SCRAPER, SIN CONEXIÓN A MERCADO LIBRE
+#
+# Levanta dos procesos locales y recorre con ellos todas las etapas del scraper:
+#   - El servidor simulado de `servidor_simulado.py` (páginas armadas con scripts/fixtures, con
+#     latencia, errores 500 y 429 configurables y reproducibles con la semilla).
+#   - La API de `backend` sobre una base SQLite temporal (DATABASE_URL), vacía en cada corrida.
+# Etapas medidas:
+#   1. listado: `obtener_url_todos_los_articulos` (paginación sincrónica).
+#   2. articulos: `scrapear_lista_articulos_async` con el limitador adaptativo y el pool de parseo.
+#   3. limpieza: `limpiar_datos_articulos`.
+#   4. subida: `automation.enviar_lote` (POST /registros/bulk) en lotes de --tam_lote.
+# De cada etapa se guarda la duración, el rendimiento (elementos por segundo), la latencia p50/p95
+# de sus peticiones y el tiempo de CPU; además, la memoria máxima (RSS) y la CPU del scraper, del
+# servidor simulado y de la API. El resultado se escribe como JSON en --salida y, con --comparar,
+# se contrasta con el de una corrida anterior para detectar regresiones.
+#
+# Por defecto el token bucket por host está desactivado (--tasa_por_host 0): todas las páginas vienen
+# de 127.0.0.1, y con las tasas de TASAS_POR_HOST el benchmark mediría solo el límite de cortesía.
+# Uso:
+#     python scripts/benchmark_e2e.py --total 1000 --latencia 0.05 --tasa_429 0.02 --salida logs/bench_antes.json
+#     python scripts/benchmark_e2e.py --total 1000 --latencia 0.05 --tasa_429 0.02 --comparar logs/bench_antes.json
+import argparse
+import asyncio
+import json
+import math
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from scraping.config import CONCURRENCY_LIMIT, PARSER_HTML, RESULTADOS_POR_PAGINA, TASAS_POR_HOST, TIPO_EXECUTOR_PARSEO, WORKERS_PARSEO
+from scraping.limitador import LimitadorAdaptativo
+from scraping.parsers import PARSERS
+from scraping.robots import PoliticaRobots
+from scraping.transporte import cerrar_sesion, obtener_sesion_sync
+from scraping.scraper import (
+    configurar_robots,
+    configurar_url_listado,
+    crear_executor_parseo,
+    limpiar_datos_articulos,
+    obtener_url_todos_los_articulos,
+    scrapear_lista_articulos_async
+)
+
+DIRECTORIO_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_BACKEND = os.path.join(os.path.dirname(DIRECTORIO_SCRIPTS), "backend")
+ESPERA_INICIO = 30  # Segundos máximos de espera a que el servidor simulado y la API respondan
+
+# Métricas que se contrastan con --comparar (en todas, un valor mayor es peor)
+METRICAS_COMPARADAS = ("segundos", "cpu_segundos", "latencia_p95_ms")
+
+
+class LimitadorMedido(LimitadorAdaptativo):
+    """`LimitadorAdaptativo` que además guarda la latencia de cada descarga que se le informa."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencias = []
+
+    def registrar(self, url, estado, latencia):
+        self.latencias.append(latencia)
+        super().registrar(url, estado, latencia)
+
+
+def puerto_libre():
+    """Devuelve un puerto TCP libre de 127.0.0.1."""
+    with socket.socket() as conexion:
+        conexion.bind(("127.0.0.1", 0))
+        return conexion.getsockname()[1]
+
+
+def iniciar_proceso(comando, url_salud, ruta_log, cwd=None, env=None):
+    """
+    Inicia un proceso auxiliar y espera a que `url_salud` responda 200.
+
+    Args:
+        comando (list[str]): Comando a ejecutar.
+        url_salud (str): URL que responde 200 cuando el proceso está listo.
+        ruta_log (str): Archivo donde se guarda la salida del proceso.
+        cwd (str, optional): Carpeta de trabajo del proceso.
+        env (dict, optional): Variables de entorno del proceso.
+
+    Returns:
+        subprocess.Popen: Proceso en ejecución.
+
+    Raises:
+        RuntimeError: Si el proceso termina o no responde antes de ESPERA_INICIO segundos.
+    """
+    with open(ruta_log, "wb") as log:
+        proceso = subprocess.Popen(comando, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    limite = time.monotonic() + ESPERA_INICIO
+    while time.monotonic() < limite and proceso.poll() is None:
+        try:
+            if requests.get(url_salud, timeout=1).status_code == 200:
+                return proceso
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    proceso.kill()
+    proceso.wait()
+    with open(ruta_log, encoding="utf-8", errors="replace") as log:
+        raise RuntimeError(f"El proceso {' '.join(comando)} no respondió en {url_salud}:\n{log.read()[-2000:]}")
+
+
+def detener_proceso(proceso):
+    """
+    Detiene un proceso auxiliar y devuelve su consumo de CPU y memoria.
+
+    Args:
+        proceso (subprocess.Popen): Proceso iniciado con `iniciar_proceso`.
+
+    Returns:
+        dict: Segundos de CPU (usuario + sistema) y memoria máxima (RSS, en MB) del proceso.
+    """
+    proceso.terminate()
+    try:
+        # wait4 (en lugar de Popen.wait) devuelve también el uso de recursos del proceso terminado
+        _, estado, uso = os.wait4(proceso.pid, 0)
+        proceso.returncode = estado
+    except ChildProcessError:
+        return {}
+    return {"cpu_segundos": round(uso.ru_utime + uso.ru_stime, 3), "rss_max_mb": round(uso.ru_maxrss / 1024, 1)}
+
+
+def tiempo_cpu():
+    """Segundos de CPU consumidos por este proceso y sus hijos ya terminados (p. ej. los workers de parseo)."""
+    propio = resource.getrusage(resource.RUSAGE_SELF)
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return propio.ru_utime + propio.ru_stime + hijos.ru_utime + hijos.ru_stime
+
+
+def resumir_etapa(inicio, cpu_inicio, elementos, latencias=None):
+    """
+    Arma las métricas de una etapa a partir de sus marcas de inicio.
+
+    Args:
+        inicio (float): `time.perf_counter()` al comenzar la etapa.
+        cpu_inicio (float): `tiempo_cpu()` al comenzar la etapa.
+        elementos (int): Páginas, artículos o registros procesados en la etapa.
+        latencias (list[float], optional): Duración de cada petición de la etapa, en segundos.
+
+    Returns:
+        dict: Duración, elementos por segundo, CPU y, si hay latencias, cantidad de peticiones y latencia p50/p95 en ms.
+    """
+    segundos = time.perf_counter() - inicio
+    etapa = {
+        "segundos": round(segundos, 3),
+        "elementos": elementos,
+        "por_segundo": round(elementos / segundos, 1) if segundos else None,
+        "cpu_segundos": round(tiempo_cpu() - cpu_inicio, 3),
+    }
+    if latencias:
+        ordenadas = sorted(latencias)
+        etapa["peticiones"] = len(ordenadas)
+        etapa["latencia_p50_ms"] = round(statistics.median(ordenadas) * 1000, 2)
+        etapa["latencia_p95_ms"] = round(ordenadas[max(0, int(len(ordenadas) * 0.95) - 1)] * 1000, 2)
+    return etapa
+
+
+def etapa_listado(args):
+    """Recorre las páginas de resultados con la paginación sincrónica y mide la latencia de cada página."""
+    latencias = []
+
+    def medir_respuesta(respuesta, *_, **__):
+        if not respuesta.url.endswith("/robots.txt"):
+            latencias.append(respuesta.elapsed.total_seconds())
+
+    sesion = obtener_sesion_sync()
+    sesion.hooks["response"].append(medir_respuesta)
+    inicio, cpu_inicio = time.perf_counter(), tiempo_cpu()
+    try:
+        urls = obtener_url_todos_los_articulos(args.articulo, args.paginas)
+    finally:
+        sesion.hooks["response"].remove(medir_respuesta)
+    return urls, resumir_etapa(inicio, cpu_inicio, len(latencias), latencias)
+
+
+async def etapa_articulos(urls, args):
+    """Descarga y parsea los artículos con el limitador adaptativo, como el pipeline de `automation.py`."""
+    tasas = {tipo: args.tasa_por_host for tipo in TASAS_POR_HOST} if args.tasa_por_host > 0 else {}
+    limitador = LimitadorMedido(args.concurrencia, maximo=args.concurrencia_max, tasas=tasas)
+    inicio, cpu_inicio = time.perf_counter(), tiempo_cpu()
+    try:
+        with crear_executor_parseo(args.tipo_parseo, args.workers_parseo, args.parser) as executor:
+            articulos = await scrapear_lista_articulos_async(urls, args.concurrencia_max, semaphore=limitador, executor=executor)
+    finally:
+        await cerrar_sesion()
+    etapa = resumir_etapa(inicio, cpu_inicio, len(articulos), limitador.latencias)
+    etapa["respuestas"] = {str(estado): cantidad for estado, cantidad in limitador.respuestas.items()}
+    etapa["concurrencia_final"] = int(limitador.limite)
+    return articulos, etapa
+
+
+def etapa_subida(registros, args):
+    """Envía los registros a la API en lotes con `automation.enviar_lote` y mide la latencia de cada lote."""
+    # Se importa aquí porque automation lee API_URL al importarse, y la API del benchmark recién se conoce ahora
+    from automation import enviar_lote
+
+    resumen = {"enviados": 0, "actualizados": 0, "duplicados": 0, "errores": 0}
+    latencias = []
+    inicio, cpu_inicio = time.perf_counter(), tiempo_cpu()
+    for posicion in range(0, len(registros), args.tam_lote):
+        inicio_lote = time.perf_counter()
+        enviar_lote(registros[posicion:posicion + args.tam_lote], resumen)
+        latencias.append(time.perf_counter() - inicio_lote)
+    etapa = resumir_etapa(inicio, cpu_inicio, len(registros), latencias)
+    etapa["resumen"] = resumen
+    return etapa
+
+
+def comparar(actual, anterior):
+    """
+    Imprime la variación de cada métrica respecto de una corrida anterior.
+
+    Args:
+        actual (dict): Resultado de esta corrida.
+        anterior (dict): Resultado de la corrida con la que se compara (mismo formato).
+
+    Returns:
+        None
+    """
+    print(f"\nComparación con la corrida del {anterior.get('fecha', '?')} (positivo = peor):")
+    filas = [(f"{nombre}.{metrica}", etapa.get(metrica), anterior["etapas"].get(nombre, {}).get(metrica))
+             for nombre, etapa in actual["etapas"].items() for metrica in METRICAS_COMPARADAS]
+    filas.append(("scraper.rss_max_mb", actual["procesos"]["scraper"]["rss_max_mb"], anterior["procesos"]["scraper"]["rss_max_mb"]))
+    for nombre, valor, previo in filas:
+        if valor is None or not previo:
+            continue
+        print(f"  {nombre:<28} {previo:>10} -> {valor:>10}  ({(valor - previo) / previo:+.1%})")
+
+
+def main(args):
+    args.paginas = args.paginas or math.ceil(args.total / RESULTADOS_POR_PAGINA)
+    with tempfile.TemporaryDirectory(prefix="benchmark_e2e_") as temporal:
+        puerto_servidor, puerto_api = puerto_libre(), puerto_libre()
+        url_servidor = f"http://127.0.0.1:{puerto_servidor}"
+        url_api = f"http://127.0.0.1:{puerto_api}/registros/"
+        servidor = iniciar_proceso(
+            [sys.executable, os.path.join(DIRECTORIO_SCRIPTS, "servidor_simulado.py"), "--puerto", str(puerto_servidor),
+             "--total", str(args.total), "--latencia", str(args.latencia), "--jitter", str(args.jitter),
+             "--tasa_error", str(args.tasa_error), "--tasa_429", str(args.tasa_429), "--semilla", str(args.semilla)],
+            url_servidor + "/robots.txt", os.path.join(temporal, "servidor.log")
+        )
+        api = None
+        try:
+            entorno_api = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(temporal, 'benchmark.sqlite3')}")
+            api = iniciar_proceso(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(puerto_api), "--log-level", "warning"],
+                url_api + "?limit=1", os.path.join(temporal, "api.log"), cwd=DIRECTORIO_BACKEND, env=entorno_api
+            )
+            os.environ["API_URL"] = url_api
+            configurar_url_listado(url_servidor)
+            configurar_robots(PoliticaRobots(ruta=None))
+
+            inicio, cpu_inicio = time.perf_counter(), tiempo_cpu()
+            urls, listado = etapa_listado(args)
+            articulos, scraping = asyncio.run(etapa_articulos(urls, args))
+            inicio_limpieza, cpu_limpieza = time.perf_counter(), tiempo_cpu()
+            registros = limpiar_datos_articulos(articulos)
+            limpieza = resumir_etapa(inicio_limpieza, cpu_limpieza, len(registros))
+            subida = etapa_subida(registros, args)
+            total = resumir_etapa(inicio, cpu_inicio, len(registros))
+            peticiones_servidor = requests.get(url_servidor + "/estadisticas", timeout=5).json()
+        finally:
+            procesos = {"servidor": detener_proceso(servidor)}
+            if api is not None:
+                procesos["api"] = detener_proceso(api)
+
+    procesos["scraper"] = {
+        "cpu_segundos": round(tiempo_cpu(), 3),
+        "rss_max_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    resultado = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "parametros": vars(args),
+        "etapas": {"listado": listado, "articulos": scraping, "limpieza": limpieza, "subida": subida, "total": total},
+        "peticiones_servidor": peticiones_servidor,
+        "procesos": procesos,
+    }
+
+    carpeta = os.path.dirname(args.salida)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+
+    print(f"\n{len(urls)} URLs | {len(articulos)} artículos | {len(registros)} registros | {subida['resumen']['enviados']} insertados en la API")
+    for nombre, etapa in resultado["etapas"].items():
+        latencia = f" | p50={etapa['latencia_p50_ms']} ms p95={etapa['latencia_p95_ms']} ms" if "latencia_p50_ms" in etapa else ""
+        print(f"  {nombre:<10} {etapa['segundos']:8.3f} s | {etapa['por_segundo']} /s | CPU {etapa['cpu_segundos']} s{latencia}")
+    print("  " + " | ".join(f"{nombre}: RSS máx. {uso.get('rss_max_mb')} MB, CPU {uso.get('cpu_segundos')} s" for nombre, uso in procesos.items()))
+    print(f"Resultado guardado en: {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            comparar(resultado, json.load(archivo))
+
+
+if __name__ == "__main__":
+    # Argumentos:
+    # --articulo         (str): Término de búsqueda (default="microfono shure").
+    # --total            (int): Artículos que devuelve el servidor simulado (default=500).
+    # --paginas          (int): Páginas de resultados a recorrer (default=las necesarias para --total).
+    # --latencia         (float): Segundos que se demora cada respuesta del servidor simulado (default=0.05).
+    # --jitter           (float): Variación máxima (±) de esa latencia (default=0.02).
+    # --tasa_error       (float): Probabilidad de un 500 en cada página de producto (default=0).
+    # --tasa_429         (float): Probabilidad de un 429 en cada página de producto (default=0).
+    # --semilla          (int): Semilla de la latencia y de los errores inyectados (default=42).
+    # --concurrencia     (int): Concurrencia inicial del limitador adaptativo (default=10).
+    # --concurrencia_max (int): Máximo de peticiones simultáneas (default=CONCURRENCY_LIMIT).
+    # --tasa_por_host    (float): Peticiones por segundo por tipo de host; 0 desactiva el token bucket (default=0).
+    # --tipo_parseo      (str): Pool para parsear HTML: "proceso" o "hilo" (default=TIPO_EXECUTOR_PARSEO).
+    # --workers_parseo   (int): Cantidad de workers de parseo (default=núcleos de la máquina).
+    # --parser           (str): Backend de parseo de HTML (default=PARSER_HTML).
+    # --tam_lote         (int): Registros por petición en la carga a la API (default=500).
+    # --salida           (str): Archivo JSON con el resultado (default=logs/benchmark_e2e.json).
+    # --comparar         (str): Resultado JSON de una corrida anterior con el cual comparar.
+    parser = argparse.ArgumentParser(description="Benchmark de extremo a extremo del scraper contra un servidor simulado y una API local.")
+    parser.add_argument("--articulo", default="microfono shure", help="Término de búsqueda")
+    parser.add_argument("--total", type=int, default=500, help="Artículos que devuelve el servidor simulado")
+    parser.add_argument("--paginas", type=int, default=None, help="Páginas de resultados a recorrer")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Segundos que se demora cada respuesta del servidor simulado")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Variación máxima (±) de la latencia, en segundos")
+    parser.add_argument("--tasa_error", type=float, default=0.0, help="Probabilidad de un 500 en cada página de producto")
+    parser.add_argument("--tasa_429", type=float, default=0.0, help="Probabilidad de un 429 en cada página de producto")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de la latencia y de los errores inyectados")
+    parser.add_argument("--concurrencia", type=int, default=10, help="Concurrencia inicial del limitador adaptativo")
+    parser.add_argument("--concurrencia_max", type=int, default=CONCURRENCY_LIMIT, help="Máximo de peticiones simultáneas")
+    parser.add_argument("--tasa_por_host", type=float, default=0.0, help="Peticiones por segundo por tipo de host (0: sin token bucket)")
+    parser.add_argument("--tipo_parseo", choices=["proceso", "hilo"], default=TIPO_EXECUTOR_PARSEO, help="Tipo de pool donde se parsea el HTML")
+    parser.add_argument("--workers_parseo", type=int, default=WORKERS_PARSEO, help="Cantidad de workers de parseo")
+    parser.add_argument("--parser", choices=list(PARSERS), default=PARSER_HTML, help="Backend de parseo de HTML")
+    parser.add_argument("--tam_lote", type=int, default=500, help="Registros por petición en la carga a la API")
+    parser.add_argument("--salida", default=os.path.join("logs", "benchmark_e2e.json"), help="Archivo JSON con el resultado")
+    parser.add_argument("--comparar", default=None, help="Resultado JSON de una corrida anterior con el cual comparar")
+    main(parser.parse_args())
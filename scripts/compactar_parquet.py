@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraping.config import DIRECTORIO_SALIDA, TAM_GRUPO_PARQUET
+
+# Archivos de trabajo de la compactación dentro de cada partición (no terminan en .parquet, así que
+# no forman parte del dataset): el archivo compactado en escritura y el manifiesto con los archivos
+# que reemplaza, que se escribe antes de reemplazar el archivo compactado y se borra al terminar
+COMPACTADO = "compactado.parquet"
+TEMPORAL = ".compactado.tmp"
+MANIFIESTO = ".compactado.json"
+
+
+def buscar_particiones(directorio):
+    """Devuelve cada carpeta del dataset que contiene archivos .parquet, con la lista ordenada de esos archivos.
+
+    Args:
+        directorio (str): Carpeta raíz del dataset (ver `scraping.salidas.SalidaParquet`).
+
+    Returns:
+        dict: {carpeta: [rutas de los archivos .parquet]}.
+    """
+    particiones = {}
+    for carpeta, _, archivos in os.walk(directorio):
+        partes = sorted(nombre for nombre in archivos if nombre.endswith(".parquet"))
+        if partes:
+            particiones[carpeta] = [os.path.join(carpeta, nombre) for nombre in partes]
+    return particiones
+
+
+def _escribir_manifiesto(carpeta, archivos):
+    """Guarda en la partición, de forma atómica y en disco, los archivos que reemplaza la compactación en curso."""
+    ruta = os.path.join(carpeta, MANIFIESTO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+        json.dump({"temporal": TEMPORAL, "archivos": [os.path.basename(original) for original in archivos]}, archivo)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(ruta + ".tmp", ruta)
+
+
+def terminar_compactacion(carpeta):
+    """
+    Completa o descarta una compactación interrumpida de la partición, según su manifiesto.
+
+    - Si el archivo temporal sigue en la carpeta, la compactación no llegó a reemplazar el archivo
+      compactado: los originales siguen siendo los datos y se borra el temporal.
+    - Si no, el archivo compactado ya contiene las filas de los originales: se borran los que queden,
+      sin volver a leerlos (compactarlos de nuevo duplicaría sus filas).
+
+    Args:
+        carpeta (str): Carpeta de la partición.
+
+    Returns:
+        bool: True si había una compactación interrumpida.
+    """
+    ruta = os.path.join(carpeta, MANIFIESTO)
+    temporal = os.path.join(carpeta, TEMPORAL)
+    if not os.path.exists(ruta):
+        if os.path.exists(temporal):
+            os.remove(temporal)  # Interrumpida antes de escribir el manifiesto
+        return False
+    with open(ruta, encoding="utf-8") as archivo:
+        manifiesto = json.load(archivo)
+    temporal = os.path.join(carpeta, manifiesto["temporal"])
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    else:
+        for nombre in manifiesto["archivos"]:
+            if os.path.exists(os.path.join(carpeta, nombre)):
+                os.remove(os.path.join(carpeta, nombre))
+    os.remove(ruta)
+    return True
+
+
+def compactar_particion(carpeta, archivos, tam_grupo=TAM_GRUPO_PARQUET):
+    """
+    Une los archivos Parquet de una partición en uno solo.
+
+    Los archivos se leen por lotes y se escriben en un archivo temporal, de modo que la memoria
+    usada no depende del tamaño de la partición. Antes de reemplazar el archivo compactado se guarda
+    un manifiesto con los originales, que se borran después; si la compactación se interrumpe,
+    `terminar_compactacion` la completa o la descarta sin perder ni duplicar filas.
+
+    Args:
+        carpeta (str): Carpeta de la partición.
+        archivos (list[str]): Archivos .parquet de la partición.
+        tam_grupo (int, optional): Filas por grupo de filas del archivo compactado.
+
+    Returns:
+        tuple: (ruta del archivo compactado, cantidad de filas).
+    """
+    import pyarrow.parquet as pq
+
+    esquema = pq.read_schema(archivos[0])
+    destino = os.path.join(carpeta, COMPACTADO)
+    temporal = os.path.join(carpeta, TEMPORAL)
+    filas = 0
+    with pq.ParquetWriter(temporal, esquema, compression="zstd") as escritor:
+        for ruta in archivos:
+            for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tam_grupo):
+                escritor.write_batch(lote, row_group_size=tam_grupo)
+                filas += lote.num_rows
+    with open(temporal, "rb") as archivo:
+        os.fsync(archivo.fileno())
+    _escribir_manifiesto(carpeta, [ruta for ruta in archivos if ruta != destino])
+    os.replace(temporal, destino)
+    terminar_compactacion(carpeta)
+    return destino, filas
+
+
+def compactar_dataset(directorio, min_archivos=2):
+    """
+    Compacta todas las particiones del dataset que tengan al menos `min_archivos` archivos.
+
+    Primero completa las compactaciones que una ejecución anterior dejó interrumpidas.
+
+    Args:
+        directorio (str): Carpeta raíz del dataset.
+        min_archivos (int, optional): Cantidad mínima de archivos para compactar una partición.
+
+    Returns:
+        int: Cantidad de particiones compactadas.
+    """
+    for carpeta, _, archivos in os.walk(directorio):
+        if (MANIFIESTO in archivos or TEMPORAL in archivos) and terminar_compactacion(carpeta):
+            print(f"Compactación interrumpida retomada en {carpeta}")
+    compactadas = 0
+    for carpeta, archivos in buscar_particiones(directorio).items():
+        if len(archivos) < min_archivos:
+            continue
+        destino, filas = compactar_particion(carpeta, archivos)
+        compactadas += 1
+        print(f"{len(archivos)} archivos -> {destino} ({filas} filas)")
+    return compactadas
+
+
+if __name__ == "__main__":
+    # Une los archivos pequeños del dataset Parquet (--salida parquet) en un archivo por partición.
+    # No debe ejecutarse mientras una ejecución del scraper escribe en la misma carpeta.
+    #
+    # Argumentos:
+    # --directorio     (str): Carpeta raíz del dataset (default=DIRECTORIO_SALIDA).
+    # --min_archivos   (int): Solo se compactan las particiones con al menos N archivos (default=2).
+    parser = argparse.ArgumentParser(description="Compactación de los archivos del dataset Parquet por partición.")
+    parser.add_argument("--directorio", default=DIRECTORIO_SALIDA, help="Carpeta raíz del dataset Parquet")
+    parser.add_argument("--min_archivos", type=int, default=2, help="Compactar solo las particiones con al menos N archivos")
+    args = parser.parse_args()
+
+    print(f"{compactar_dataset(args.directorio, args.min_archivos)} particiones compactadas.")
@@ -0,0 +1,162 @@
+# SERVIDOR LOCAL QUE SIMULA MERCADO LIBRE PARA PRUEBAS Y BENCHMARKS SIN CONEXIÓN
+#
+# Sirve páginas de resultados y de producto armadas a partir de las páginas guardadas en
+# scripts/fixtures (tarjetas `poly-card` y páginas `ui-pdp-*`), con la misma paginación `_Desde_`
+# que el sitio real, de modo que el scraper las procesa sin cambios:
+#   - GET /{termino}_Desde_{offset}_NoIndex_True: página de resultados con hasta RESULTADOS_POR_PAGINA
+#     tarjetas, que enlazan a /p/MCO...; pasado el total de resultados, una página sin tarjetas.
+#   - GET /p/{item_id}: página del producto, con su item_id en el enlace canónico.
+#   - GET /robots.txt: permite todo.
+#   - GET /estadisticas: peticiones atendidas por tipo de página y respuestas de error inyectadas.
+#
+# Cada respuesta se demora `latencia` ± `jitter` segundos. Las páginas de producto responden además
+# 429 o 500 con las probabilidades indicadas; la decisión depende solo de la semilla, la ruta y el
+# número de intento, así que dos corridas con los mismos parámetros reciben los mismos errores aunque
+# el orden de las peticiones cambie. Las páginas de resultados no fallan, para que la cantidad de
+# artículos descubiertos sea la misma en cada corrida (la paginación sincrónica no reintenta).
+#
+# Uso (el scraper se apunta al servidor con --url_listado):
+#     python scripts/servidor_simulado.py --puerto 8765 --total 500 --latencia 0.05 --tasa_429 0.02
+#     python scripts/automation.py --articulo "microfono shure" --paginas 10 --url_listado http://127.0.0.1:8765
+import argparse
+import asyncio
+import collections
+import os
+import random
+import re
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from scraping.config import RESULTADOS_POR_PAGINA
+
+# Páginas guardadas a partir de las que se arman las respuestas
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_LISTADO = "listado_microfono_shure.html"
+FIXTURE_ARTICULO = "articulo_microfono_shure_sm58.html"
+# Número a partir del que se generan los item_id de los artículos simulados (MCO900000001, ...)
+BASE_ITEM_ID = 900000000
+
+PATRON_LISTADO = re.compile(r"_Desde_(\d+)_NoIndex_True$")
+
+
+def leer_plantillas(directorio=DIRECTORIO_FIXTURES):
+    """
+    Prepara las plantillas de las páginas a partir de los fixtures.
+
+    Args:
+        directorio (str): Carpeta con los fixtures de listado y de artículo.
+
+    Returns:
+        dict: Encabezado y pie de la página de resultados ("inicio", "fin"), tarjeta con `{enlace}`
+              en lugar del enlace al producto ("tarjeta"), página de producto ("articulo") y el
+              item_id que aparece en ella ("item_id"), que se reemplaza por el del artículo pedido.
+    """
+    with open(os.path.join(directorio, FIXTURE_LISTADO), encoding="utf-8") as archivo:
+        listado = archivo.read()
+    with open(os.path.join(directorio, FIXTURE_ARTICULO), encoding="utf-8") as archivo:
+        articulo = archivo.read()
+
+    # La primera tarjeta del fixture es una tarjeta completa (título, precio y calificaciones)
+    inicio, tarjetas, fin = re.search(r"(.*<ol[^>]*>)(.*?)(</ol>.*)", listado, re.DOTALL).groups()
+    tarjeta = re.search(r'<li class="ui-search-layout__item">.*?</li>', tarjetas, re.DOTALL).group(0)
+    tarjeta = re.sub(r'href="https://www\.mercadolibre[^"]*"', 'href="{enlace}"', tarjeta.replace("{", "{{").replace("}", "}}"))
+    item_id = re.search(r'rel="canonical" href="[^"]*?(MCO\d+)"', articulo).group(1)
+    return {"inicio": inicio, "fin": fin, "tarjeta": tarjeta, "articulo": articulo, "item_id": item_id}
+
+
+def crear_aplicacion(total=500, latencia=0.05, jitter=0.0, tasa_error=0.0, tasa_429=0.0, semilla=42, directorio=DIRECTORIO_FIXTURES):
+    """
+    Crea la aplicación aiohttp del servidor simulado.
+
+    Args:
+        total (int): Cantidad de artículos que devuelve cualquier búsqueda.
+        latencia (float): Segundos que se demora cada respuesta.
+        jitter (float): Variación máxima (±) de la latencia, en segundos.
+        tasa_error (float): Probabilidad de que una página de producto responda 500.
+        tasa_429 (float): Probabilidad de que una página de producto responda 429.
+        semilla (int): Semilla de la latencia y de los errores inyectados.
+        directorio (str): Carpeta con los fixtures.
+
+    Returns:
+        aiohttp.web.Application: Aplicación lista para ejecutarse con `web.run_app` o un `AppRunner`.
+    """
+    plantillas = leer_plantillas(directorio)
+    contadores = collections.Counter()
+    intentos = collections.Counter()
+
+    def azar(ruta):
+        # Generador propio de cada intento a cada ruta: el resultado no depende del orden de llegada
+        intentos[ruta] += 1
+        return random.Random(f"{semilla}:{ruta}:{intentos[ruta]}")
+
+    async def demorar(generador):
+        await asyncio.sleep(max(0.0, latencia + (generador.random() * 2 - 1) * jitter))
+
+    async def robots(request):
+        return web.Response(text="User-agent: *\nAllow: /\n", content_type="text/plain")
+
+    async def estadisticas(request):
+        return web.json_response(dict(contadores))
+
+    async def listado(request):
+        coincidencia = PATRON_LISTADO.search(request.match_info["consulta"])
+        if not coincidencia:
+            raise web.HTTPNotFound()
+        await demorar(azar(request.path))
+        contadores["listado"] += 1
+        offset = int(coincidencia.group(1))
+        base = f"{request.scheme}://{request.host}"
+        tarjetas = "".join(
+            plantillas["tarjeta"].format(enlace=f"{base}/p/MCO{BASE_ITEM_ID + posicion}")
+            for posicion in range(offset, min(offset + RESULTADOS_POR_PAGINA, total + 1))
+        )
+        inicio = re.sub(r"[\d.]+ resultados", f"{total:,} resultados".replace(",", "."), plantillas["inicio"], count=1)
+        return web.Response(text=inicio + tarjetas + plantillas["fin"], content_type="text/html")
+
+    async def articulo(request):
+        item_id = request.match_info["item_id"]
+        generador = azar(request.path)
+        await demorar(generador)
+        sorteo = generador.random()
+        if sorteo < tasa_429:
+            contadores["http_429"] += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if sorteo < tasa_429 + tasa_error:
+            contadores["http_500"] += 1
+            return web.Response(status=500)
+        contadores["articulo"] += 1
+        return web.Response(text=plantillas["articulo"].replace(plantillas["item_id"], item_id), content_type="text/html")
+
+    aplicacion = web.Application()
+    aplicacion.router.add_get("/robots.txt", robots)
+    aplicacion.router.add_get("/estadisticas", estadisticas)
+    aplicacion.router.add_get("/p/{item_id}", articulo)
+    aplicacion.router.add_get("/{consulta}", listado)
+    return aplicacion
+
+
+if __name__ == "__main__":
+    # Argumentos:
+    # --puerto     (int): Puerto donde escucha el servidor (default=8765).
+    # --total      (int): Artículos que devuelve cualquier búsqueda (default=500).
+    # --latencia   (float): Segundos que se demora cada respuesta (default=0.05).
+    # --jitter     (float): Variación máxima (±) de la latencia, en segundos (default=0).
+    # --tasa_error (float): Probabilidad de que una página de producto responda 500 (default=0).
+    # --tasa_429   (float): Probabilidad de que una página de producto responda 429 (default=0).
+    # --semilla    (int): Semilla de la latencia y de los errores inyectados (default=42).
+    # --fixtures   (str): Carpeta con las páginas guardadas (default=scripts/fixtures).
+    parser = argparse.ArgumentParser(description="Servidor local que simula las páginas de Mercado Libre.")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto donde escucha el servidor")
+    parser.add_argument("--total", type=int, default=500, help="Artículos que devuelve cualquier búsqueda")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Segundos que se demora cada respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variación máxima (±) de la latencia, en segundos")
+    parser.add_argument("--tasa_error", type=float, default=0.0, help="Probabilidad de que una página de producto responda 500")
+    parser.add_argument("--tasa_429", type=float, default=0.0, help="Probabilidad de que una página de producto responda 429")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de la latencia y de los errores inyectados")
+    parser.add_argument("--fixtures", default=DIRECTORIO_FIXTURES, help="Carpeta con las páginas guardadas")
+    args = parser.parse_args()
+
+    aplicacion = crear_aplicacion(args.total, args.latencia, args.jitter, args.tasa_error, args.tasa_429, args.semilla, args.fixtures)
+    web.run_app(aplicacion, host="127.0.0.1", port=args.puerto, print=lambda _: print(f"Servidor simulado en http://127.0.0.1:{args.puerto}"))
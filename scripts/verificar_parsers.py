@@ -0,0 +1,86 @@
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraping.parsers import PARSERS
+
+# Páginas guardadas de Mercado Libre usadas para comparar los backends de parseo
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+URL_FIXTURE = "https://www.mercadolibre.com.co/fixture"
+
+
+def parsear_fixture(parser, nombre_archivo, html):
+    """Aplica el método de parseo que corresponde al tipo de página (listado_* o articulo_*).
+
+    Args:
+        parser: Backend de parseo (ver `scraping.parsers.PARSERS`).
+        nombre_archivo (str): Nombre del fixture, cuyo prefijo indica el tipo de página.
+        html (bytes): Contenido del fixture.
+
+    Returns:
+        dict or tuple or None: Resultado del backend para esa página.
+    """
+    if nombre_archivo.startswith("listado_"):
+        return parser.parsear_listado(html), parser.parsear_tarjetas(html)
+    return parser.parsear_articulo(html, URL_FIXTURE)
+
+
+def verificar_paridad(directorio, repeticiones):
+    """
+    Compara todos los backends de parseo contra el backend "bs4" sobre las páginas guardadas.
+
+    Para cada fixture verifica que cada backend produzca exactamente el mismo resultado que "bs4"
+    y mide el tiempo promedio de parseo. Los backends cuya dependencia no está instalada se omiten.
+
+    Args:
+        directorio (str): Carpeta con los archivos listado_*.html y articulo_*.html.
+        repeticiones (int): Cantidad de veces que se parsea cada página para medir el tiempo.
+
+    Returns:
+        bool: True si todos los backends disponibles coinciden en todas las páginas.
+    """
+    fixtures = sorted(f for f in os.listdir(directorio) if f.endswith(".html"))
+    referencia = PARSERS["bs4"]
+    todo_ok = True
+
+    for nombre_archivo in fixtures:
+        with open(os.path.join(directorio, nombre_archivo), "rb") as f:
+            html = f.read()
+        esperado = parsear_fixture(referencia, nombre_archivo, html)
+        print(f"\n{nombre_archivo}")
+
+        for nombre, parser in PARSERS.items():
+            try:
+                resultado = parsear_fixture(parser, nombre_archivo, html)
+            except ImportError as e:
+                print(f"  {nombre:<12} omitido (dependencia no disponible: {e})")
+                continue
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                parsear_fixture(parser, nombre_archivo, html)
+            milisegundos = (time.perf_counter() - inicio) * 1000 / repeticiones
+
+            coincide = resultado == esperado
+            todo_ok = todo_ok and coincide
+            print(f"  {nombre:<12} {'OK' if coincide else 'DIFERENTE':<10} {milisegundos:8.3f} ms/página")
+            if not coincide:
+                print(f"    esperado: {esperado}\n    obtenido: {resultado}")
+
+    return todo_ok
+
+
+if __name__ == "__main__":
+    # Verifica que todos los backends de parseo entreguen los mismos datos y compara su velocidad.
+    #
+    # Argumentos:
+    # --fixtures       (str): Carpeta con las páginas guardadas (default=scripts/fixtures).
+    # --repeticiones   (int): Repeticiones por página para medir el tiempo (default=50).
+    parser = argparse.ArgumentParser(description="Verificación de paridad y velocidad de los backends de parseo HTML.")
+    parser.add_argument("--fixtures", default=DIRECTORIO_FIXTURES, help="Carpeta con los archivos listado_*.html y articulo_*.html")
+    parser.add_argument("--repeticiones", type=int, default=50, help="Repeticiones por página para medir el tiempo")
+    args = parser.parse_args()
+
+    sys.exit(0 if verificar_paridad(args.fixtures, args.repeticiones) else 1)
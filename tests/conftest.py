@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Las pruebas importan `scraping` desde la raíz del repositorio, igual que los scripts, y `app` desde `backend`
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "backend"))
+
+# La API se prueba sobre una base SQLite temporal; DATABASE_URL debe fijarse antes de importar `app`
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="pruebas_api_"), "registros.sqlite3")
+
+
+@pytest.fixture
+def db():
+    """Sesión sobre la base SQLite de pruebas; al terminar vacía las tablas e invalida la caché de lecturas."""
+    import app.main  # noqa: F401  (crea las tablas en SQLite)
+    from app import cache, models
+    from app.db.connection import SessionLocal
+
+    with SessionLocal() as sesion:
+        yield sesion
+        sesion.rollback()
+        sesion.query(models.SnapshotML).delete()
+        sesion.query(models.RegistroML).delete()
+        sesion.commit()
+    cache.invalidar_lecturas()
+
+
+@pytest.fixture
+def cliente(db):
+    """Cliente HTTP de la API (`app.main.app`) sobre la misma base que `db`."""
+    from fastapi.testclient import TestClient
+    import app.main
+
+    with TestClient(app.main.app) as cliente:
+        yield cliente
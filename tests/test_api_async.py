@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+# DB_ASYNC se lee al importar `app`, así que la API asincrónica se prueba en un proceso aparte
+PRUEBA = textwrap.dedent("""
+    import json
+    from fastapi.testclient import TestClient
+    from app.db import connection
+    import app.main
+
+    def articulo(item_id, precio=479900):
+        return {"item_id": item_id, "nombre_articulo": "Micrófono " + item_id, "precio": precio,
+                "descripcion": "Dinámico", "enlace_articulo": "https://www.mercadolibre.com.co/p/" + item_id}
+
+    with TestClient(app.main.app) as cliente:
+        resultados = {"motor": connection.async_engine.dialect.driver}
+        resultados["crear"] = cliente.post("/registros/", json=articulo("MCO5001")).status_code
+        resultados["repetido"] = cliente.post("/registros/", json=articulo("MCO5001")).status_code
+        resultados["bulk"] = cliente.post("/registros/bulk", json=[articulo("MCO5001", 1), articulo("MCO5002")]).json()
+        primera = cliente.get("/registros/", params={"orden": "precio"})
+        resultados["registros"] = [r["item_id"] for r in primera.json()]
+        resultados["revalidada"] = cliente.get("/registros/", params={"orden": "precio"},
+                                               headers={"If-None-Match": primera.headers["etag"]}).status_code
+        resultados["q"] = [r["item_id"] for r in cliente.get("/registros/", params={"q": "mco5002"}).json()]
+        resultados["fields"] = cliente.get("/registros/", params={"fields": "precio"}).json()
+        registro_id = primera.json()[0]["id"]
+        resultados["historial"] = [s["precio"] for s in cliente.get(f"/registros/{registro_id}/historial").json()]
+        resultados["existentes"] = cliente.post("/registros/existentes", json={"item_ids": ["MCO5002", "MCO9"]}).json()
+        resultados["exportar"] = cliente.get("/registros/exportar").text.count("\\n")
+    print(json.dumps(resultados))
+""")
+
+
+def test_api_asincronica_sobre_sqlite(tmp_path):
+    entorno = {
+        **os.environ,
+        "DB_ASYNC": "1",
+        "DATABASE_URL": "sqlite:///" + str(tmp_path / "registros.sqlite3"),
+    }
+    proceso = subprocess.run([sys.executable, "-c", PRUEBA], cwd=BACKEND, env=entorno, capture_output=True, text=True, timeout=60)
+    assert proceso.returncode == 0, proceso.stderr
+    resultados = json.loads(proceso.stdout.strip().splitlines()[-1])
+    assert resultados["motor"] == "aiosqlite"
+    assert (resultados["crear"], resultados["repetido"]) == (201, 409)
+    assert (resultados["bulk"]["insertados"], resultados["bulk"]["actualizados"]) == (1, 1)
+    assert resultados["registros"] == ["MCO5001", "MCO5002"]
+    assert resultados["revalidada"] == 304
+    assert resultados["q"] == ["MCO5002"]
+    assert resultados["fields"] == [{"precio": 1}, {"precio": 479900}]
+    assert resultados["historial"] == [479900, 1]
+    assert resultados["existentes"] == {"existentes": ["MCO5002"]}
+    assert resultados["exportar"] == 2
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+from urllib.parse import urlsplit
+
+import pytest
+from aiohttp import web
+
+from scraping.bitacora import COMPLETADA, DESCARTADA, PENDIENTE, BitacoraEjecucion
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import automation  # noqa: E402
+from servidor_simulado import crear_aplicacion  # noqa: E402
+
+TERMINOS = [{"articulo": "microfono shure", "paginas": 1, "dominio": "com.co"}]
+TOTAL = 30
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "bitacora.sqlite3")
+
+
+def test_estados_de_urls_y_registros(ruta):
+    bitacora = BitacoraEjecucion.nueva(ruta, TERMINOS, {"modo": "completo", "detalle_nuevos": False})
+    bitacora.registrar_urls(["u1", "u2", "u3"], "microfono shure")
+    bitacora.guardar_registro({"item_id": "MCO1", "precio": 1}, "u1")
+    bitacora.marcar_url("u2", DESCARTADA)
+    bitacora.registrar_urls(["u1", "u4"])  # Las ya registradas conservan su estado
+    assert bitacora.terminos_pendientes() == {"u3": "microfono shure", "u4": None}
+    assert bitacora.resumen() == {PENDIENTE: 2, COMPLETADA: 1, DESCARTADA: 1, "registros": 1, "subidos": 0}
+
+    bitacora.marcar_subidos(["MCO1"])
+    assert bitacora.registros_sin_subir() == []
+    bitacora.cerrar()
+
+
+def test_abrir_una_ejecucion(ruta):
+    bitacora = BitacoraEjecucion.nueva(ruta, TERMINOS, {"modo": "listado", "detalle_nuevos": True})
+    bitacora.registrar_urls(["u1"])
+    bitacora.guardar_registro({"item_id": "MCO1", "precio": 1})
+    segunda = BitacoraEjecucion.nueva(ruta, TERMINOS, {"modo": "completo", "detalle_nuevos": False})
+    assert segunda.run_id != bitacora.run_id
+    bitacora.cerrar()
+    segunda.cerrar()
+
+    reabierta = BitacoraEjecucion.abrir(ruta, bitacora.run_id)
+    assert (reabierta.terminos, reabierta.parametros, reabierta.estado) == (TERMINOS, {"modo": "listado", "detalle_nuevos": True}, "en_curso")
+    assert reabierta.urls_pendientes() == ["u1"]
+    assert reabierta.registros_sin_subir() == [{"item_id": "MCO1", "precio": 1}]
+    reabierta.finalizar()
+    reabierta.cerrar()
+    assert BitacoraEjecucion.abrir(ruta, bitacora.run_id).estado == "completada"
+    with pytest.raises(ValueError):
+        BitacoraEjecucion.abrir(ruta, "no-existe")
+
+
+def argumentos(tmp_path, base, **cambios):
+    valores = dict(
+        articulo=TERMINOS[0]["articulo"], paginas=1, dominio="com.co", terminos=None, reanudar=None,
+        bitacora=str(tmp_path / "bitacora.sqlite3"), concurrencia=2, concurrencia_max=2, latencia_objetivo=2.0,
+        reintentos=1, salida=None, guardar_csv=False, dir_salida=str(tmp_path / "salida"), tam_cola=5, tam_lote=5,
+        solo_nuevos=False, refrescar_dias=None, indice=str(tmp_path / "indice.sqlite3"), modo="completo",
+        detalle_nuevos=False, cache=False, cache_dir=str(tmp_path / "cache"), cache_ttl=3600, replay=False,
+        url_listado=base, ignorar_robots=True, robots_cache=str(tmp_path / "robots.json"), robots_ttl=3600,
+        tipo_parseo="hilo", workers_parseo=1, parser="selectolax", metricas=None,
+    )
+    valores.update(cambios)
+    return argparse.Namespace(**valores)
+
+
+def contar_urls(ruta, estado):
+    with sqlite3.connect(ruta) as conexion:
+        return conexion.execute("SELECT COUNT(*) FROM urls WHERE estado = ?", (estado,)).fetchone()[0]
+
+
+def test_reanudar_no_vuelve_a_descargar_lo_completado(tmp_path, monkeypatch):
+    subidos = []
+
+    def enviar_lote(lote, resumen):
+        subidos.extend(registro["item_id"] for registro in lote)
+        resumen["enviados"] += len(lote)
+        return True
+
+    monkeypatch.setattr(automation, "enviar_lote", enviar_lote)
+    monkeypatch.setattr(automation, "LOG_FILE", str(tmp_path / "automation_log.txt"))
+    monkeypatch.setattr(automation, "imprimir_saludo", lambda: None)
+
+    articulos_pedidos = []
+
+    @web.middleware
+    async def registrar_peticion(request, handler):
+        if request.path.startswith("/p/"):
+            articulos_pedidos.append(request.path)
+        return await handler(request)
+
+    async def probar():
+        aplicacion = crear_aplicacion(total=TOTAL, latencia=0.02)
+        aplicacion.middlewares.append(registrar_peticion)
+        runner = web.AppRunner(aplicacion)
+        await runner.setup()
+        sitio = web.TCPSite(runner, "127.0.0.1", 0)
+        await sitio.start()
+        base = f"http://127.0.0.1:{sitio._server.sockets[0].getsockname()[1]}"
+        try:
+            # Primera ejecución, interrumpida tras completar algunas descargas
+            args = argumentos(tmp_path, base)
+            tarea = asyncio.create_task(automation.main(args))
+            await asyncio.sleep(0.05)
+            while contar_urls(args.bitacora, COMPLETADA) < 8 and not tarea.done():
+                await asyncio.sleep(0.01)
+            tarea.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await tarea
+            with sqlite3.connect(args.bitacora) as conexion:
+                (run_id,) = conexion.execute("SELECT run_id FROM ejecuciones").fetchone()
+                completadas = {url for (url,) in conexion.execute("SELECT url FROM urls WHERE estado = ?", (COMPLETADA,))}
+            pedidos_antes = len(articulos_pedidos)
+
+            await automation.main(argumentos(tmp_path, base, reanudar=run_id, articulo=None))
+            return run_id, completadas, articulos_pedidos[pedidos_antes:], args.bitacora
+        finally:
+            await runner.cleanup()
+
+    run_id, completadas, pedidos_al_reanudar, ruta_bitacora = asyncio.run(probar())
+
+    assert 8 <= len(completadas) < TOTAL
+    # Al reanudar solo se piden las páginas de artículos que no se habían completado
+    assert not {urlsplit(url).path for url in completadas} & set(pedidos_al_reanudar)
+    assert len(pedidos_al_reanudar) == TOTAL - len(completadas)
+
+    bitacora = BitacoraEjecucion.abrir(ruta_bitacora, run_id)
+    assert bitacora.estado == "completada"
+    assert bitacora.resumen() == {PENDIENTE: 0, COMPLETADA: TOTAL, DESCARTADA: 0, "registros": TOTAL, "subidos": TOTAL}
+    bitacora.cerrar()
+    assert len(set(subidos)) == TOTAL
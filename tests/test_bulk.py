@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+from app import crud, models, schemas
+
+
+def registro(item_id, **cambios):
+    datos = {
+        "item_id": item_id,
+        "nombre_articulo": "Micrófono Shure SM58",
+        "precio": 479900,
+        "calificacion_promedio": 4.9,
+        "cantidad_calificaciones": 1532,
+        "descripcion": "Dinámico",
+        "enlace_articulo": f"https://www.mercadolibre.com.co/p/{item_id}",
+    }
+    datos.update(cambios)
+    return schemas.RegistroCreate(**datos)
+
+
+def estados(resultados):
+    return [resultado["estado"] for resultado in resultados]
+
+
+def contar(db, modelo):
+    return db.query(modelo).count()
+
+
+def test_lote_nuevo_inserta_registros_y_capturas(db):
+    resultados = crud.crear_registros_bulk(db, [registro("MCO3001"), registro("MCO3002")])
+    assert resultados == [{"item_id": "MCO3001", "estado": "insertado"}, {"item_id": "MCO3002", "estado": "insertado"}]
+    assert contar(db, models.RegistroML) == 2
+    assert contar(db, models.SnapshotML) == 2
+
+
+def test_mismo_lote_dos_veces_no_escribe_nada(db):
+    lote = [registro("MCO3001"), registro("MCO3002")]
+    crud.crear_registros_bulk(db, lote)
+    assert estados(crud.crear_registros_bulk(db, lote)) == ["duplicado", "duplicado"]
+    assert contar(db, models.RegistroML) == 2
+    assert contar(db, models.SnapshotML) == 2
+
+
+def test_cambio_de_precio_actualiza_y_agrega_una_captura(db):
+    crud.crear_registros_bulk(db, [registro("MCO3001"), registro("MCO3002")])
+    resultados = crud.crear_registros_bulk(db, [registro("MCO3001", precio=459900), registro("MCO3002")])
+    assert estados(resultados) == ["actualizado", "duplicado"]
+    assert contar(db, models.SnapshotML) == 3
+    actualizado = db.query(models.RegistroML).filter_by(item_id="MCO3001").one()
+    assert actualizado.precio == 459900
+    assert [s.precio for s in crud.obtener_historial(db, actualizado.id)] == [479900, 459900]
+
+
+def test_cambio_fuera_del_historial_no_actualiza(db):
+    # Solo el precio y las calificaciones forman parte del historial
+    crud.crear_registros_bulk(db, [registro("MCO3001")])
+    assert estados(crud.crear_registros_bulk(db, [registro("MCO3001", descripcion="Otra")])) == ["duplicado"]
+    assert contar(db, models.SnapshotML) == 1
+
+
+def test_item_ids_repetidos_en_el_lote(db):
+    # Se procesa la primera aparición de cada item_id; las siguientes cuentan como duplicadas
+    lote = [registro("MCO3001"), registro("MCO3001", precio=1), registro("MCO3002"), registro("MCO3001")]
+    assert estados(crud.crear_registros_bulk(db, lote)) == ["insertado", "duplicado", "insertado", "duplicado"]
+    assert db.query(models.RegistroML).filter_by(item_id="MCO3001").one().precio == 479900
+    assert contar(db, models.SnapshotML) == 2
+
+
+def test_lote_mixto(db):
+    crud.crear_registros_bulk(db, [registro("MCO3001"), registro("MCO3002")])
+    lote = [registro("MCO3001", calificacion_promedio=4.8), registro("MCO3002"), registro("MCO3003"), registro("MCO3003")]
+    assert estados(crud.crear_registros_bulk(db, lote)) == ["actualizado", "duplicado", "insertado", "duplicado"]
+    assert contar(db, models.RegistroML) == 3
+    assert contar(db, models.SnapshotML) == 4
+
+
+def test_lote_vacio(db):
+    assert crud.crear_registros_bulk(db, []) == []
+
+
+def test_totales_del_endpoint(cliente):
+    lote = [registro("MCO3001").dict(), registro("MCO3002").dict()]
+    for articulo in lote:
+        articulo["enlace_articulo"] = str(articulo["enlace_articulo"])
+    assert cliente.post("/registros/bulk", json=lote).json()["insertados"] == 2
+
+    lote[0]["precio"] = 1
+    respuesta = cliente.post("/registros/bulk", json=lote + [lote[1]]).json()
+    assert (respuesta["insertados"], respuesta["actualizados"], respuesta["duplicados"]) == (0, 1, 2)
+
+
+def test_cambios_lote():
+    filas = {
+        "MCO1": {"precio": 10, "calificacion_promedio": None, "cantidad_calificaciones": None},
+        "MCO2": {"precio": 20, "calificacion_promedio": 4.5, "cantidad_calificaciones": 3},
+        "MCO3": {"precio": 30, "calificacion_promedio": 4.0, "cantidad_calificaciones": 1},
+    }
+    vigentes = {
+        "MCO2": SimpleNamespace(id=2, _mapping={"precio": 20, "calificacion_promedio": 4.5, "cantidad_calificaciones": 3}),
+        "MCO3": SimpleNamespace(id=3, _mapping={"precio": 30, "calificacion_promedio": 4.0, "cantidad_calificaciones": 2}),
+    }
+    resultado = {}
+    cambios, snapshots = crud._cambios_lote(filas, vigentes, [(1, "MCO1")], resultado)
+    assert resultado == {"MCO1": "insertado", "MCO3": "actualizado"}
+    assert cambios == [{"id": 3, "precio": 30, "calificacion_promedio": 4.0, "cantidad_calificaciones": 1}]
+    assert [snapshot["registro_id"] for snapshot in snapshots] == [1, 3]
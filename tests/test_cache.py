@@ -0,0 +1,147 @@
+import pytest
+from starlette.requests import Request
+
+from app import cache
+
+
+def articulo(item_id, **cambios):
+    datos = {
+        "item_id": item_id,
+        "nombre_articulo": "Micrófono Shure SM58",
+        "precio": 479900,
+        "calificacion_promedio": 4.9,
+        "cantidad_calificaciones": 1532,
+        "descripcion": "Dinámico",
+        "enlace_articulo": f"https://www.mercadolibre.com.co/p/{item_id}",
+    }
+    datos.update(cambios)
+    return datos
+
+
+def peticion(if_none_match=None):
+    encabezados = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": encabezados})
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj controlado de `time.monotonic` y `time.time` en `app.cache`."""
+    ahora = {"t": 1000.0}
+    monkeypatch.setattr(cache.time, "monotonic", lambda: ahora["t"])
+    monkeypatch.setattr(cache.time, "time", lambda: ahora["t"])
+    return ahora
+
+
+def test_memoria_desaloja_la_entrada_menos_usada():
+    memoria = cache.CacheMemoria(ttl=60, max_entradas=2)
+    memoria.guardar("a", b"1")
+    memoria.guardar("b", b"2")
+    assert memoria.obtener("a") == b"1"  # "a" pasa a ser la más reciente
+    memoria.guardar("c", b"3")
+    assert memoria.obtener("b") is None
+    assert memoria.obtener("a") == b"1"
+    assert memoria.obtener("c") == b"3"
+
+
+def test_memoria_vence_por_ttl(reloj):
+    memoria = cache.CacheMemoria(ttl=10, max_entradas=10)
+    memoria.guardar("a", b"1")
+    reloj["t"] += 9
+    assert memoria.obtener("a") == b"1"
+    reloj["t"] += 2
+    assert memoria.obtener("a") is None
+
+
+def test_memoria_invalidar_cambia_la_version():
+    memoria = cache.CacheMemoria()
+    antes = memoria.version()
+    memoria.invalidar()
+    assert memoria.version() != antes
+    assert cache.CacheMemoria().version() != cache.CacheMemoria().version()  # Cada proceso tiene su prefijo
+
+
+def test_clave_lectura_normaliza_los_parametros(monkeypatch, reloj):
+    monkeypatch.setattr(cache, "cache_lecturas", cache.CacheMemoria(ttl=60))
+    clave = cache.clave_lectura("registros", {"skip": 0, "limit": 10, "q": None})
+    assert clave == cache.clave_lectura("registros", {"limit": 10, "q": None, "skip": 0})
+    assert clave.endswith("?limit=10&skip=0")
+    assert clave != cache.clave_lectura("historial", {"skip": 0, "limit": 10})
+    assert clave != cache.clave_lectura("registros", {"skip": 10, "limit": 10})
+
+
+def test_clave_lectura_cambia_con_la_version_y_el_periodo(monkeypatch, reloj):
+    monkeypatch.setattr(cache, "cache_lecturas", cache.CacheMemoria(ttl=60))
+    clave = cache.clave_lectura("registros", {"limit": 10})
+    reloj["t"] += 10
+    assert cache.clave_lectura("registros", {"limit": 10}) == clave
+    reloj["t"] += 60
+    siguiente_periodo = cache.clave_lectura("registros", {"limit": 10})
+    assert siguiente_periodo != clave
+    cache.invalidar_lecturas()
+    assert cache.clave_lectura("registros", {"limit": 10}) != siguiente_periodo
+
+
+def test_clave_lectura_sin_cache(monkeypatch):
+    monkeypatch.setattr(cache, "cache_lecturas", None)
+    assert cache.clave_lectura("registros", {"limit": 10}) is None
+
+
+@pytest.mark.parametrize("encabezado, esperado", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", W/"abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+])
+def test_no_modificado(encabezado, esperado):
+    assert cache.no_modificado(peticion(encabezado), '"abc"') is esperado
+
+
+def test_get_repetido_con_if_none_match_responde_304(cliente):
+    cliente.post("/registros/bulk", json=[articulo("MCO2001"), articulo("MCO2002")])
+    primera = cliente.get("/registros/", params={"limit": 10})
+    etiqueta = primera.headers["etag"]
+    assert primera.status_code == 200 and len(primera.json()) == 2
+
+    repetida = cliente.get("/registros/", params={"limit": 10})
+    assert repetida.content == primera.content and repetida.headers["etag"] == etiqueta
+
+    revalidada = cliente.get("/registros/", params={"limit": 10}, headers={"If-None-Match": etiqueta})
+    assert revalidada.status_code == 304 and revalidada.content == b""
+    assert revalidada.headers["etag"] == etiqueta
+
+
+def test_post_invalida_las_lecturas(cliente):
+    cliente.post("/registros/", json=articulo("MCO2003"))
+    etiqueta = cliente.get("/registros/").headers["etag"]
+
+    assert cliente.post("/registros/", json=articulo("MCO2004")).status_code == 201
+    nueva = cliente.get("/registros/", headers={"If-None-Match": etiqueta})
+    assert nueva.status_code == 200 and nueva.headers["etag"] != etiqueta
+    assert [r["item_id"] for r in nueva.json()] == ["MCO2003", "MCO2004"]
+
+
+def test_bulk_invalida_solo_con_cambios(cliente):
+    cliente.post("/registros/bulk", json=[articulo("MCO2005")])
+    etiqueta = cliente.get("/registros/").headers["etag"]
+
+    # Un lote sin cambios no escribe nada y conserva el ETag
+    assert cliente.post("/registros/bulk", json=[articulo("MCO2005")]).json()["duplicados"] == 1
+    assert cliente.get("/registros/", headers={"If-None-Match": etiqueta}).status_code == 304
+
+    assert cliente.post("/registros/bulk", json=[articulo("MCO2005", precio=459900)]).json()["actualizados"] == 1
+    nueva = cliente.get("/registros/", headers={"If-None-Match": etiqueta})
+    assert nueva.status_code == 200 and nueva.json()[0]["precio"] == 459900
+
+
+def test_historial_cacheado_se_invalida(cliente):
+    cliente.post("/registros/bulk", json=[articulo("MCO2006")])
+    registro_id = cliente.get("/registros/").json()[0]["id"]
+    ruta = f"/registros/{registro_id}/historial"
+    etiqueta = cliente.get(ruta).headers["etag"]
+    assert cliente.get(ruta, headers={"If-None-Match": etiqueta}).status_code == 304
+
+    cliente.post("/registros/bulk", json=[articulo("MCO2006", precio=1)])
+    nueva = cliente.get(ruta, headers={"If-None-Match": etiqueta})
+    assert nueva.status_code == 200 and [s["precio"] for s in nueva.json()] == [479900, 1]
@@ -0,0 +1,156 @@
+import asyncio
+import collections
+import contextlib
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from scraping import cache, scraper
+from scraping.cache import CacheRespuestas
+
+URL = "https://www.mercadolibre.com.co/p/MCO{}"
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj controlado de `time.time` en `scraping.cache`; cada lectura avanza un milisegundo."""
+    ahora = {"t": 1000.0}
+
+    def tiempo():
+        ahora["t"] += 0.001
+        return ahora["t"]
+
+    monkeypatch.setattr(cache.time, "time", tiempo)
+    return ahora
+
+
+@pytest.fixture
+def respuestas(tmp_path, reloj):
+    cache_http = CacheRespuestas(str(tmp_path / "cache"), ttl=60, tam_max=10 * 1024 * 1024)
+    yield cache_http
+    cache_http.cerrar()
+
+
+def test_acierto_y_fallo(respuestas):
+    assert respuestas.obtener(URL.format(1)) is None
+    respuestas.guardar(URL.format(1), b"<html>1</html>", etag='"v1"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+    entrada = respuestas.obtener(URL.format(1))
+    assert entrada["cuerpo"] == b"<html>1</html>" and entrada["vigente"]
+    assert CacheRespuestas.encabezados_revalidacion(entrada) == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"
+    }
+
+
+def test_vencimiento_y_renovacion(respuestas, reloj):
+    respuestas.guardar(URL.format(1), b"<html>1</html>", etag='"v1"')
+    reloj["t"] += 61
+    assert not respuestas.obtener(URL.format(1))["vigente"]
+    respuestas.renovar(URL.format(1))
+    assert respuestas.obtener(URL.format(1))["vigente"]
+
+
+def test_cuerpos_identicos_se_guardan_una_vez(respuestas):
+    respuestas.guardar(URL.format(1), b"<html>igual</html>")
+    respuestas.guardar(URL.format(2), b"<html>igual</html>")
+    tamano = respuestas.tamano_total
+    respuestas.guardar(URL.format(1), b"<html>distinto</html>")
+    assert respuestas.obtener(URL.format(2))["cuerpo"] == b"<html>igual</html>"
+    assert respuestas.tamano_total > tamano
+    respuestas.guardar(URL.format(2), b"<html>distinto</html>")  # El cuerpo anterior queda huérfano y se borra
+    assert respuestas.tamano_total == respuestas._calcular_tamano_total()
+
+
+def test_desalojo_lru(tmp_path, reloj):
+    cuerpos = {n: os.urandom(1000) for n in range(4)}  # Incompresibles: ~1 KB cada uno en disco
+    respuestas = CacheRespuestas(str(tmp_path / "cache"), ttl=60, tam_max=3500)
+    for n in range(3):
+        respuestas.guardar(URL.format(n), cuerpos[n])
+    respuestas.obtener(URL.format(0))  # La entrada 1 pasa a ser la usada hace más tiempo
+    respuestas.guardar(URL.format(3), cuerpos[3])
+
+    assert respuestas.obtener(URL.format(1)) is None
+    assert [respuestas.obtener(URL.format(n))["cuerpo"] for n in (0, 2, 3)] == [cuerpos[0], cuerpos[2], cuerpos[3]]
+    assert respuestas.tamano_total <= 3500 * cache.FRACCION_DESALOJO
+    respuestas.cerrar()
+
+    # El tamaño se recalcula al reabrir la caché
+    reabierta = CacheRespuestas(str(tmp_path / "cache"), ttl=60, tam_max=3500)
+    assert reabierta.tamano_total == respuestas.tamano_total
+    reabierta.cerrar()
+
+
+def test_archivo_perdido_es_un_fallo(respuestas):
+    respuestas.guardar(URL.format(1), b"<html>1</html>")
+    archivo = respuestas.conexion.execute("SELECT archivo FROM respuestas").fetchone()[0]
+    os.remove(respuestas._ruta(archivo))
+    assert respuestas.obtener(URL.format(1)) is None
+
+
+def crear_servidor(peticiones):
+    """Servidor de una página con ETag, que responde 304 a una petición condicional vigente."""
+    async def pagina(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            peticiones[304] += 1
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        peticiones[200] += 1
+        return web.Response(text=f"<html>{request.path}</html>", content_type="text/html", headers={"ETag": '"v1"'})
+
+    aplicacion = web.Application()
+    aplicacion.router.add_get("/{pagina}", pagina)
+    return aplicacion
+
+
+@contextlib.asynccontextmanager
+async def servidor(aplicacion):
+    """Ejecuta la aplicación en un puerto libre y entrega su URL base."""
+    runner = web.AppRunner(aplicacion)
+    await runner.setup()
+    sitio = web.TCPSite(runner, "127.0.0.1", 0)
+    await sitio.start()
+    try:
+        yield f"http://127.0.0.1:{sitio._server.sockets[0].getsockname()[1]}"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def con_cache(respuestas, monkeypatch):
+    monkeypatch.setattr(scraper, "politica_robots", None)
+    monkeypatch.setattr(scraper, "cache_http", respuestas)
+    return respuestas
+
+
+def test_descargas_con_cache_y_revalidacion(con_cache, reloj):
+    peticiones = collections.Counter()
+
+    async def probar():
+        async with servidor(crear_servidor(peticiones)) as base, aiohttp.ClientSession() as sesion:
+            url = f"{base}/a"
+            primeras = [await scraper.descargar_html(sesion, url, asyncio.Semaphore(1)) for _ in range(2)]
+            contadas = dict(peticiones)
+            reloj["t"] += 61
+            revalidada = await scraper.descargar_html(sesion, url, asyncio.Semaphore(1))
+            return url, primeras, contadas, revalidada
+
+    url, primeras, contadas, revalidada = asyncio.run(probar())
+    assert primeras == [(b"<html>/a</html>", 200)] * 2
+    assert contadas == {200: 1}  # La segunda vez se entrega desde la caché, sin usar la red
+    # Vencida, se revalida con If-None-Match: el 304 entrega el cuerpo guardado y renueva la entrada
+    assert revalidada == (b"<html>/a</html>", 304)
+    assert peticiones == {200: 1, 304: 1}
+    assert con_cache.obtener(url)["vigente"]
+
+
+def test_replay_sin_red(con_cache, reloj):
+    con_cache.replay = True
+    # El puerto 9 no atiende: cualquier intento de usar la red terminaría en "conexion"
+    con_cache.guardar("http://127.0.0.1:9/a", b"<html>guardada</html>")
+    reloj["t"] += 3600  # En modo replay se usa aunque esté vencida
+
+    async def probar():
+        async with aiohttp.ClientSession() as sesion:
+            return [await scraper.descargar_html(sesion, f"http://127.0.0.1:9/{ruta}", asyncio.Semaphore(1)) for ruta in "ab"]
+
+    assert asyncio.run(probar()) == [(b"<html>guardada</html>", 200), (None, "sin_cache")]
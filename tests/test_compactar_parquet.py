@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import compactar_parquet  # noqa: E402
+
+
+class Interrupcion(Exception):
+    pass
+
+
+@pytest.fixture
+def particion(tmp_path):
+    carpeta = tmp_path / "termino=microfono" / "fecha=2025-01-01"
+    carpeta.mkdir(parents=True)
+    for parte in range(3):
+        tabla = pa.table({"item_id": [f"MCO{parte}{i}" for i in range(5)], "precio": list(range(5))})
+        pq.write_table(tabla, carpeta / f"parte-{parte}.parquet")
+    return carpeta
+
+
+def contenido(carpeta):
+    return sorted(os.listdir(carpeta))
+
+
+def filas(carpeta):
+    return pq.read_table(carpeta / compactar_parquet.COMPACTADO).num_rows
+
+
+def test_compacta_la_particion(tmp_path, particion):
+    assert compactar_parquet.compactar_dataset(str(tmp_path)) == 1
+    assert contenido(particion) == [compactar_parquet.COMPACTADO]
+    assert filas(particion) == 15
+
+    # Una nueva parte se une al archivo compactado anterior
+    pq.write_table(pa.table({"item_id": ["MCO9"], "precio": [1]}), particion / "parte-9.parquet")
+    assert compactar_parquet.compactar_dataset(str(tmp_path)) == 1
+    assert contenido(particion) == [compactar_parquet.COMPACTADO]
+    assert filas(particion) == 16
+
+
+def test_interrumpida_antes_de_reemplazar(tmp_path, particion, monkeypatch):
+    escribir = compactar_parquet._escribir_manifiesto
+
+    def escribir_e_interrumpir(carpeta, archivos):
+        escribir(carpeta, archivos)
+        raise Interrupcion()
+
+    monkeypatch.setattr(compactar_parquet, "_escribir_manifiesto", escribir_e_interrumpir)
+    with pytest.raises(Interrupcion):
+        compactar_parquet.compactar_dataset(str(tmp_path))
+    assert compactar_parquet.TEMPORAL in contenido(particion)
+    monkeypatch.undo()
+
+    # El temporal se descarta y los originales, intactos, se compactan de nuevo
+    assert compactar_parquet.compactar_dataset(str(tmp_path)) == 1
+    assert contenido(particion) == [compactar_parquet.COMPACTADO]
+    assert filas(particion) == 15
+
+
+def test_interrumpida_antes_de_borrar_los_originales(tmp_path, particion, monkeypatch):
+    def interrumpir(carpeta):
+        raise Interrupcion()
+
+    monkeypatch.setattr(compactar_parquet, "terminar_compactacion", interrumpir)
+    with pytest.raises(Interrupcion):
+        compactar_parquet.compactar_dataset(str(tmp_path))
+    assert compactar_parquet.MANIFIESTO in contenido(particion) and "parte-0.parquet" in contenido(particion)
+    monkeypatch.undo()
+
+    # Solo se borran los originales, que ya están en el archivo compactado: sus filas no se duplican
+    assert compactar_parquet.compactar_dataset(str(tmp_path)) == 0
+    assert contenido(particion) == [compactar_parquet.COMPACTADO]
+    assert filas(particion) == 15
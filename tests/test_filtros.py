@@ -0,0 +1,81 @@
+import pytest
+
+from app import crud, models, schemas
+
+
+def articulo(item_id, nombre, precio, calificacion=None, calificaciones=None, descripcion=None):
+    return schemas.RegistroCreate(
+        item_id=item_id,
+        nombre_articulo=nombre,
+        precio=precio,
+        calificacion_promedio=calificacion,
+        cantidad_calificaciones=calificaciones,
+        descripcion=descripcion,
+        enlace_articulo=f"https://www.mercadolibre.com.co/p/{item_id}",
+    )
+
+
+@pytest.fixture
+def catalogo(db):
+    crud.crear_registros_bulk(db, [
+        articulo("MCO4001", "Micrófono Shure SM58", 479900, 4.9, 1532, "Dinámico cardioide para voces"),
+        articulo("MCO4002", "Micrófono condensador Behringer", 189900, 4.5, 210, "Condensador de estudio"),
+        articulo("MCO4003", "Audífonos Sony", 259900, 4.7, 98, "Inalámbricos con cancelación de ruido"),
+        articulo("MCO4004", "Base para micrófono", 59900),
+    ])
+    return db
+
+
+def item_ids(db, **filtros):
+    return [registro.item_id for registro in crud.obtener_registros(db, filtros=schemas.FiltrosRegistros(**filtros))]
+
+
+def test_rango_de_precio(catalogo):
+    assert item_ids(catalogo, precio_min=189900, precio_max=479900) == ["MCO4001", "MCO4002", "MCO4003"]
+    assert item_ids(catalogo, precio_min=189900, precio_max=189900) == ["MCO4002"]
+    assert item_ids(catalogo, precio_max=100000) == ["MCO4004"]
+    assert item_ids(catalogo, precio_min=500000) == []
+
+
+def test_calificaciones(catalogo):
+    # Los artículos sin calificar quedan fuera de los filtros por calificación
+    assert item_ids(catalogo, calificacion_min=4.7) == ["MCO4001", "MCO4003"]
+    assert item_ids(catalogo, calificaciones_min=200) == ["MCO4001", "MCO4002"]
+    assert item_ids(catalogo, calificacion_min=4.6, calificaciones_min=200) == ["MCO4001"]
+
+
+def test_orden(catalogo):
+    assert item_ids(catalogo, orden="precio") == ["MCO4004", "MCO4002", "MCO4003", "MCO4001"]
+    assert item_ids(catalogo, orden="-precio", precio_min=100000) == ["MCO4001", "MCO4003", "MCO4002"]
+
+
+def test_busqueda_de_texto_fts5(catalogo):
+    # Todas las palabras deben aparecer, en el nombre o en la descripción, sin distinguir tildes ni mayúsculas
+    assert item_ids(catalogo, q="microfono") == ["MCO4001", "MCO4002", "MCO4004"]
+    assert item_ids(catalogo, q="MICRÓFONO condensador") == ["MCO4002"]
+    assert item_ids(catalogo, q="cancelación") == ["MCO4003"]
+    assert item_ids(catalogo, q="micrófono ruido") == []
+    assert item_ids(catalogo, q='shure "sm58') == ["MCO4001"]  # Las comillas se buscan como texto
+    assert item_ids(catalogo, q="micrófono", precio_max=200000, orden="-precio") == ["MCO4002", "MCO4004"]
+
+
+def test_indice_fts5_sigue_las_actualizaciones(catalogo):
+    registro = catalogo.query(models.RegistroML).filter_by(item_id="MCO4003").one()
+    registro.nombre_articulo = "Diadema Sony"
+    registro.descripcion = "Bluetooth"
+    catalogo.commit()
+    assert item_ids(catalogo, q="audífonos") == []
+    assert item_ids(catalogo, q="cancelación") == []
+    assert item_ids(catalogo, q="diadema bluetooth") == ["MCO4003"]
+
+    catalogo.delete(registro)
+    catalogo.commit()
+    assert item_ids(catalogo, q="diadema") == []
+
+
+def test_filtros_por_la_api(cliente, catalogo):
+    respuesta = cliente.get("/registros/", params={"q": "micrófono", "precio_min": 100000, "orden": "-precio"})
+    assert [r["item_id"] for r in respuesta.json()] == ["MCO4001", "MCO4002"]
+    assert cliente.get("/registros/", params={"precio_min": -1}).status_code == 422
+    assert cliente.get("/registros/", params={"orden": "nombre_articulo"}).status_code == 422
+    assert cliente.get("/registros/", params={"after_id": 1, "orden": "precio"}).status_code == 400
@@ -0,0 +1,62 @@
+import asyncio
+import collections
+import os
+import sys
+import time
+
+import pytest
+
+from scraping.indice import IndiceArticulos
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import automation  # noqa: E402
+
+DIA = 86400
+URL = "https://www.mercadolibre.com.co/producto/p/{}"
+
+
+@pytest.fixture
+def indice(tmp_path):
+    indice = IndiceArticulos(str(tmp_path / "indice.sqlite3"))
+    yield indice
+    indice.cerrar()
+
+
+def test_registrar_renueva_y_registrar_faltantes_no(indice):
+    indice.registrar(["MCO1"], visto_en=100.0)
+    indice.registrar_faltantes(["MCO1", "MCO2"], visto_en=200.0)
+    assert indice.vistos_en(["MCO1", "MCO2", "MCO3"]) == {"MCO1": 100.0, "MCO2": 200.0}
+    indice.registrar(["MCO1"], visto_en=300.0)
+    assert indice.vistos_en(["MCO1"]) == {"MCO1": 300.0}
+
+
+def test_conocidos_con_antiguedad(indice):
+    ahora = time.time()
+    indice.registrar(["MCO1"], visto_en=ahora - 10 * DIA)
+    indice.registrar(["MCO2"], visto_en=ahora - DIA)
+    assert indice.conocidos(["MCO1", "MCO2", "MCO3"]) == {"MCO1", "MCO2"}
+    assert indice.conocidos(["MCO1", "MCO2", "MCO3"], max_edad_dias=7) == {"MCO2"}
+
+
+def test_filtrar_conocidos_no_renueva_la_antiguedad(indice, monkeypatch):
+    antiguo = time.time() - 30 * DIA
+    indice.registrar(["MCO1"], visto_en=antiguo)
+
+    def obtener_items_existentes(item_ids):
+        # Mientras se consulta la API, otro proceso registra MCO2 con su propia antigüedad
+        otro = IndiceArticulos(indice.ruta)
+        otro.registrar(["MCO2"], visto_en=antiguo)
+        otro.cerrar()
+        return {"MCO2", "MCO3"} & set(item_ids)
+
+    monkeypatch.setattr(automation, "obtener_items_existentes", obtener_items_existentes)
+    conteo = collections.Counter()
+    urls = [URL.format(item_id) for item_id in ("MCO1", "MCO2", "MCO3", "MCO4")]
+    pendientes = asyncio.run(automation.filtrar_conocidos(urls, indice, 7, conteo))
+
+    # MCO1 está vencido en el índice; MCO2 y MCO3 existen en la API; MCO4 es nuevo
+    assert pendientes == [URL.format("MCO1"), URL.format("MCO4")]
+    assert conteo["omitidos"] == 2
+    vistos = indice.vistos_en(["MCO1", "MCO2", "MCO3"])
+    assert vistos["MCO1"] == antiguo and vistos["MCO2"] == antiguo
+    assert vistos["MCO3"] > antiguo
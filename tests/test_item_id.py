@@ -0,0 +1,21 @@
+import pytest
+
+from scraping.scraper import extraer_item_id
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("https://www.mercadolibre.com.co/microfono-shure-sm58/p/MCO6003845#polycard_client=search-nordic", "MCO6003845"),
+    ("https://articulo.mercadolibre.com.co/MCO-1465318423-microfono-shure-sv100-_JM", "MCO1465318423"),
+    ("https://articulo.mercadolibre.com.ar/MLA-123456789-funda-_JM", "MLA123456789"),
+    ("https://www.mercadolibre.com.co/producto/p/mco900000002", "MCO900000002"),
+    ("meli://item?id=MCO1465318422", "MCO1465318422"),
+    # Slugs que parecen un ID (letra "m" + dos letras + dígitos) no deben tomarse como tal
+    ("https://www.mercadolibre.com.co/audifonos-max-1000/p/MCO123456", "MCO123456"),
+    ("https://www.mercadolibre.com.co/mod-2024-xx/p/MCO99999", "MCO99999"),
+    ("https://articulo.mercadolibre.com.co/MCO-2008929949-microfono-mla-1234-_JM", "MCO2008929949"),
+    ("https://www.mercadolibre.com.co/audifonos-max-1000", None),
+    ("https://click1.mercadolibre.com.co/mclics/clicks/external/MCO/count?a=ESIhXOquBY", None),
+    (None, None),
+])
+def test_extraer_item_id(texto, esperado):
+    assert extraer_item_id(texto) == esperado
@@ -0,0 +1,168 @@
+import asyncio
+import contextlib
+import os
+import sys
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from scraping import limitador, scraper
+from scraping.limitador import CuboTokens, LimitadorAdaptativo, clasificar_host
+
+# El servidor simulado (scripts/servidor_simulado.py) responde las páginas de producto con 429 o 500 a pedido
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from servidor_simulado import crear_aplicacion  # noqa: E402
+
+TASAS = {"listado": 5.0, "articulo": 20.0, "click1": 20.0}
+URL_LISTADO = "https://listado.mercadolibre.com.co/microfono"
+URL_ARTICULO = "https://www.mercadolibre.com.co/p/MCO1"
+
+
+def crear_limitador(**opciones):
+    valores = {"inicial": 8, "minimo": 1, "maximo": 20, "latencia_objetivo": 1.0, "tasas": TASAS, "rafaga": 5}
+    valores.update(opciones)
+    return LimitadorAdaptativo(**valores)
+
+
+@contextlib.asynccontextmanager
+async def servidor(**opciones):
+    """Ejecuta el servidor simulado en un puerto libre y entrega su URL base."""
+    runner = web.AppRunner(crear_aplicacion(latencia=0, **opciones))
+    await runner.setup()
+    sitio = web.TCPSite(runner, "127.0.0.1", 0)
+    await sitio.start()
+    puerto = sitio._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{puerto}"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def sin_robots_ni_cache(monkeypatch):
+    monkeypatch.setattr(scraper, "politica_robots", None)
+    monkeypatch.setattr(scraper, "cache_http", None)
+
+
+def test_clasificar_host():
+    assert clasificar_host(URL_LISTADO) == "listado"
+    assert clasificar_host("https://click1.mercadolibre.com.co/mclics/clicks") == "click1"
+    assert clasificar_host(URL_ARTICULO) == "articulo"
+
+
+def test_cubo_permite_la_rafaga_y_luego_la_tasa():
+    async def consumir(cubo, cantidad):
+        inicio = time.monotonic()
+        for _ in range(cantidad):
+            await cubo.consumir()
+        return time.monotonic() - inicio
+
+    async def probar():
+        cubo = CuboTokens(tasa=20, capacidad=5)
+        rafaga = await consumir(cubo, 5)
+        resto = await consumir(cubo, 10)  # 10 tokens a 20 por segundo
+        return rafaga, resto
+
+    rafaga, resto = asyncio.run(probar())
+    assert rafaga < 0.05
+    assert 0.4 <= resto < 1.0
+
+
+def test_cubo_reducir_y_recuperar():
+    cubo = CuboTokens(tasa=10, capacidad=5)
+    cubo.reducir()
+    assert cubo.tasa == 5
+    for _ in range(10):
+        cubo.reducir()
+    assert cubo.tasa == pytest.approx(10 * limitador.TASA_MINIMA_RELATIVA)
+    cubo.recuperar()
+    assert cubo.tasa == pytest.approx(1.1)
+    for _ in range(200):
+        cubo.recuperar()
+    assert cubo.tasa == 10
+
+
+def test_aumento_aditivo_con_respuestas_rapidas():
+    limite = crear_limitador()
+    limite.registrar(URL_ARTICULO, 200, 0.1)
+    assert limite.limite == pytest.approx(8 + 1 / 8)
+    for _ in range(100):
+        limite.registrar(URL_ARTICULO, 200, 0.1)
+    # Aproximadamente +1 por cada ventana de `limite` respuestas: limite² crece 2 por respuesta
+    assert limite.limite == pytest.approx((8 ** 2 + 2 * 101) ** 0.5, abs=0.5)
+    for _ in range(1000):
+        limite.registrar(URL_ARTICULO, 200, 0.1)
+    assert limite.limite == 20
+
+
+def test_sin_cambios_con_respuestas_lentas_o_4xx():
+    limite = crear_limitador()
+    limite.registrar(URL_ARTICULO, 200, 5.0)
+    limite.registrar(URL_ARTICULO, 404, 0.1)
+    assert limite.limite == 8
+
+
+@pytest.mark.parametrize("estado", [429, 500, 503, "timeout", "conexion"])
+def test_reduccion_multiplicativa_ante_sobrecarga(estado):
+    limite = crear_limitador()
+    limite.registrar(URL_ARTICULO, estado, 0.1)
+    assert limite.limite == 4
+    # Una ráfaga de errores dentro de la misma latencia objetivo reduce una sola vez
+    limite.registrar(URL_ARTICULO, estado, 0.1)
+    assert limite.limite == 4
+
+
+def test_reduccion_no_baja_del_minimo(monkeypatch):
+    reloj = {"t": 1000.0}
+    monkeypatch.setattr(limitador.time, "monotonic", lambda: reloj["t"])
+    limite = crear_limitador(minimo=2)
+    for _ in range(10):
+        reloj["t"] += 2
+        limite.registrar(URL_ARTICULO, 503, 0.1)
+    assert limite.limite == 2
+
+
+def test_429_reduce_solo_la_tasa_de_su_host():
+    limite = crear_limitador()
+    limite.registrar(URL_ARTICULO, 429, 0.1)
+    assert limite.estado()["tasas"] == {"listado": 5.0, "articulo": 10.0, "click1": 20.0}
+    limite.registrar(URL_LISTADO, 503, 0.1)  # Un 5xx reduce la concurrencia pero no la tasa del host
+    assert limite.estado()["tasas"]["listado"] == 5.0
+    limite.registrar(URL_ARTICULO, 200, 0.1)
+    assert limite.estado()["tasas"]["articulo"] == pytest.approx(10.2)
+
+
+def test_cubos_independientes_por_host():
+    async def probar():
+        limite = crear_limitador(tasas={"listado": 1.0, "articulo": 1000.0}, rafaga=1)
+        await limite.esperar_turno(URL_LISTADO)  # Agota el cubo de listados
+        inicio = time.monotonic()
+        for _ in range(20):
+            await limite.esperar_turno(URL_ARTICULO)
+        return time.monotonic() - inicio
+
+    assert asyncio.run(probar()) < 0.5
+
+
+def test_descargas_contra_el_servidor_simulado():
+    async def probar(tasa_429, tasa_error):
+        # Sin esperas del token bucket, todas las respuestas caen en la misma ventana de latencia objetivo
+        limite = crear_limitador(latencia_objetivo=10.0, rafaga=20)
+        async with servidor(tasa_429=tasa_429, tasa_error=tasa_error) as base, aiohttp.ClientSession() as sesion:
+            estados = [(await scraper.descargar_html(sesion, f"{base}/p/MCO{i}", limite))[1] for i in range(10)]
+        return limite, estados
+
+    limite, estados = asyncio.run(probar(0.0, 0.0))
+    assert estados == [200] * 10
+    assert limite.limite > 9 and limite.estado()["respuestas"] == {200: 10}
+
+    limite, estados = asyncio.run(probar(1.0, 0.0))
+    assert estados == [429] * 10
+    assert limite.limite == 4  # Una reducción por ventana de latencia objetivo
+    assert limite.estado()["tasas"]["articulo"] == pytest.approx(20 * limitador.TASA_MINIMA_RELATIVA)
+
+    limite, estados = asyncio.run(probar(0.0, 1.0))
+    assert estados == [500] * 10
+    assert limite.limite == 4 and limite.estado()["tasas"]["articulo"] == 20.0
@@ -0,0 +1,35 @@
+import glob
+import os
+
+import pytest
+
+from scraping.parsers import PARSERS
+
+# Páginas guardadas de Mercado Libre (las mismas que usa scripts/verificar_parsers.py)
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "fixtures")
+FIXTURES = sorted(glob.glob(os.path.join(DIRECTORIO_FIXTURES, "*.html")))
+URL_FIXTURE = "https://www.mercadolibre.com.co/fixture"
+
+
+def parsear(parser, ruta):
+    """Aplica a un fixture el método de parseo de su tipo de página (listado_* o articulo_*)."""
+    with open(ruta, "rb") as archivo:
+        html = archivo.read()
+    if os.path.basename(ruta).startswith("listado_"):
+        return parser.parsear_listado(html), parser.parsear_tarjetas(html)
+    return parser.parsear_articulo(html, URL_FIXTURE)
+
+
+def test_hay_fixtures():
+    assert any(os.path.basename(ruta).startswith("listado_") for ruta in FIXTURES)
+    assert any(os.path.basename(ruta).startswith("articulo_") for ruta in FIXTURES)
+
+
+@pytest.mark.parametrize("ruta", FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize("nombre", [nombre for nombre in PARSERS if nombre != "bs4"])
+def test_paridad_con_bs4(nombre, ruta):
+    try:
+        resultado = parsear(PARSERS[nombre], ruta)
+    except ImportError as e:
+        pytest.skip(f"dependencia de {nombre} no disponible: {e}")
+    assert resultado == parsear(PARSERS["bs4"], ruta)
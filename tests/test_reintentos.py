@@ -0,0 +1,26 @@
+import pytest
+
+from scraping.reintentos import FALLOS_REINTENTABLES, TIPOS_FALLO, clasificar_fallo
+
+
+@pytest.mark.parametrize("estado, esperado", [
+    ("timeout", "timeout"),
+    ("robots", "robots"),
+    (429, "http_429"),
+    (404, "http_404"),
+    (403, "http_4xx"),
+    (503, "http_5xx"),
+    # Respuestas sin error pero sin contenido: no son un 4xx
+    (200, "vacia"),
+    (304, "vacia"),
+    ("desconocido", "error"),
+    (None, "error"),
+])
+def test_clasificar_fallo(estado, esperado):
+    assert clasificar_fallo(estado) == esperado
+    assert esperado in TIPOS_FALLO
+
+
+def test_respuesta_vacia_se_reintenta():
+    assert "vacia" in FALLOS_REINTENTABLES
+    assert "http_4xx" not in FALLOS_REINTENTABLES
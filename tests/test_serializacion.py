@@ -0,0 +1,89 @@
+from typing import List
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app import crud, models, schemas, serializacion
+from app.db.connection import get_db
+
+
+def registro(item_id, **cambios):
+    datos = {
+        "item_id": item_id,
+        "nombre_articulo": "Micrófono Shure SM58 \"vocal\" ñ",
+        "precio": 479900,
+        "calificacion_promedio": 4.9,
+        "cantidad_calificaciones": 1532,
+        "descripcion": "Es dinámico. | Cardioide",
+        "enlace_articulo": f"https://www.mercadolibre.com.co/microfono/p/{item_id.lower()}",
+    }
+    datos.update(cambios)
+    return schemas.RegistroCreate(**datos)
+
+
+def con_response_model():
+    """Cliente de una API mínima que devuelve los objetos del ORM con `response_model`, como antes de la caché."""
+    api = FastAPI()
+
+    @api.get("/registros/", response_model=List[schemas.Registro])
+    def listar(sesion=Depends(get_db)):
+        return crud.obtener_registros(sesion)
+
+    @api.get("/registros/{registro_id}/historial", response_model=List[schemas.Snapshot])
+    def historial(registro_id: int, sesion=Depends(get_db)):
+        return crud.obtener_historial(sesion, registro_id)
+
+    return TestClient(api, raise_server_exceptions=False)
+
+
+def test_rutas_identicas_a_response_model(db, cliente):
+    crud.crear_registros_bulk(db, [
+        registro("MCO1001"),
+        registro("MCO1002", calificacion_promedio=None, cantidad_calificaciones=None, descripcion=None),
+        # pydantic normaliza estos enlaces (host en minúsculas, "/" final) antes de guardarlos
+        registro("MCO1003", enlace_articulo="https://WWW.MercadoLibre.com.co"),
+    ])
+    esperado = con_response_model().get("/registros/").content
+    filas = crud.obtener_filas_registros(db, serializacion.CAMPOS_REGISTRO)
+    assert serializacion.serializar(crud.obtener_registros(db), schemas.Registro) == esperado
+    assert serializacion.serializar_filas(filas, serializacion.CAMPOS_REGISTRO) == esperado
+    assert cliente.get("/registros/").content == esperado
+
+
+def test_filas_escritas_con_el_orm_identicas_a_response_model(db, cliente):
+    # Filas escritas fuera de la API: sin item_id, con campos opcionales en NULL y enlaces sin normalizar
+    db.add_all([
+        models.RegistroML(item_id=None, nombre_articulo="Antiguo", precio=1, enlace_articulo="https://x.com"),
+        models.RegistroML(item_id="MCO1005", nombre_articulo="Sin datos", precio=2, calificacion_promedio=None,
+                          cantidad_calificaciones=None, descripcion=None, enlace_articulo="HTTPS://WWW.X.COM/a b"),
+        models.RegistroML(item_id="MCO1006", nombre_articulo="Precio real", precio=350000.0, calificacion_promedio=4,
+                          cantidad_calificaciones=3, descripcion="", enlace_articulo="https://x.com/p/MCO1006"),
+    ])
+    db.commit()
+    esperado = con_response_model().get("/registros/").content
+    assert b'"enlace_articulo":"https://x.com/"' in esperado
+    assert serializacion.serializar(crud.obtener_registros(db), schemas.Registro) == esperado
+    assert cliente.get("/registros/").content == esperado
+
+
+def test_fila_invalida_falla_como_response_model(db, cliente):
+    # Un precio con decimales no cumple `schemas.Registro`: FastAPI responde 500 con ambas rutas
+    db.add(models.RegistroML(item_id="MCO1007", nombre_articulo="Decimal", precio=10.5, enlace_articulo="https://x.com"))
+    db.commit()
+    with pytest.raises(ValidationError):
+        serializacion.serializar(crud.obtener_registros(db), schemas.Registro)
+    assert con_response_model().get("/registros/").status_code == 500
+    assert TestClient(cliente.app, raise_server_exceptions=False).get("/registros/").status_code == 500
+
+
+def test_historial_identico_a_response_model(db, cliente):
+    crud.crear_registros_bulk(db, [registro("MCO1008")])
+    crud.crear_registros_bulk(db, [registro("MCO1008", precio=469900, calificacion_promedio=None)])
+    registro_id = crud.obtener_registros(db)[0].id
+    esperado = con_response_model().get(f"/registros/{registro_id}/historial").content
+    historial = crud.obtener_historial(db, registro_id)
+    assert len(historial) == 2
+    assert serializacion.serializar(historial, schemas.Snapshot) == esperado
+    assert cliente.get(f"/registros/{registro_id}/historial").content == esperado